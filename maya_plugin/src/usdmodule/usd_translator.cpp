@@ -19,6 +19,7 @@
 #include <Amino/Core/Any.h>
 
 #include <BifrostGraph/Executor/Utility.h>
+#include <BifrostUsd/Stage.h>
 #include <BifrostUsd/StageCache.h>
 
 #include <maya/MDagModifier.h>
@@ -27,16 +28,42 @@
 #include <maya/MFnPlugin.h>
 #include <maya/MFnTransform.h>
 #include <maya/MGlobal.h>
+#include <maya/MObjectHandle.h>
+#include <maya/MPlug.h>
+#include <maya/MPlugArray.h>
 #include <maya/MPxNode.h>
 #include <maya/MSelectionList.h>
 #include <maya/MUuid.h>
 
 #include <BifrostGraph/Maya/HostData.h>
+#include <pxr/base/tf/envSetting.h>
 #include <pxr/usd/usdUtils/stageCache.h>
 
+#include <algorithm>
+#include <string>
+#include <unordered_set>
+#include <utility>
+#include <vector>
+
+PXR_NAMESPACE_OPEN_SCOPE
+TF_DEFINE_ENV_SETTING(BIFROST_USD_STAGE_CACHE_MAX_MB,
+                      0,
+                      "Maximum estimated memory, in megabytes, used by the "
+                      "stages output by Bifrost graphs to the USD stage cache "
+                      "before the oldest ones are evicted. 0 means no limit.");
+PXR_NAMESPACE_CLOSE_SCOPE
+
+namespace {
+/// Whether the plug of a port is known and its node still exists.
+bool isPlugValid(std::shared_ptr<MPlug> const& plug) {
+    return plug && !plug->isNull() && MObjectHandle(plug->node()).isValid();
+}
+} // namespace
+
 UsdTranslation::UsdTranslation() noexcept
     : BifrostGraph::Executor::TypeTranslation("USD Translation Table"),
-      m_portData() {}
+      m_portData(),
+      m_evictionReported(false) {}
 
 UsdTranslation::~UsdTranslation() noexcept {}
 
@@ -46,7 +73,7 @@ int64_t UsdTranslation::AddStageToCache(
     const Amino::Ptr<BifrostUsd::Stage>& stage, const Amino::String& name) {
     int64_t cacheId = -1;
     if (BifrostUsd::StageCache::addStageToCache(stage, cacheId)) {
-        (void)addStageForPort(name, cacheId);
+        (void)addStageForPort(name.c_str(), cacheId, false, nullptr);
     }
 
     return cacheId;
@@ -81,6 +108,11 @@ bool UsdTranslation::convertValueToHost(
 
     auto stage = Amino::any_cast<Amino::Ptr<BifrostUsd::Stage>>(amAny);
 
+    std::string portName =
+        MFnDependencyNode(plug.node()).uuid().asString().asChar();
+    portName += '.';
+    portName += plug.partialName().asChar();
+
     int64_t cacheId = -1;
     bool    success;
     if (!stage) {
@@ -88,18 +120,15 @@ bool UsdTranslation::convertValueToHost(
         // (probably because the graph had a compilation error)
         // Add an empty object to keep the behaviour of this function
         // consistent with the case when the output port is disconnected.
-        success = BifrostUsd::StageCache::addEmptyStageToCache(cacheId);
+        success = findEmptyStageId(portName, cacheId) ||
+                  BifrostUsd::StageCache::addEmptyStageToCache(cacheId);
     } else {
         success = BifrostUsd::StageCache::addStageToCache(stage, cacheId);
     }
 
     if (success) {
         (const_cast<UsdTranslation*>(this))
-            ->addStageForPort(
-                (MFnDependencyNode(plug.node()).uuid().asString() + "." +
-                 plug.partialName())
-                    .asChar(),
-                cacheId);
+            ->addStageForPort(portName, cacheId, !stage, &plug);
     }
 
     dataHandle.set(cacheId);
@@ -169,20 +198,18 @@ bool UsdTranslation::portAdded(Amino::String const&                  name,
                 status = selList.getDependNode(0, oldObj);
                 CHECK_MSTATUS_AND_RETURN(status, false)
 
-                // get the port data
-                auto it = (const_cast<UsdTranslation*>(this))
-                              ->getPortData(
-                                  (MString(mayaHostdata->m_conversionData
-                                               .m_convertFromNodeUUID.c_str()) +
-                                   "." + name.c_str())
-                                      .asChar());
-                if (it == m_portData.end()) {
+                // update the port data name to the new node
+                if (!(const_cast<UsdTranslation*>(this))
+                         ->renamePortData(
+                             (MString(mayaHostdata->m_conversionData
+                                          .m_convertFromNodeUUID.c_str()) +
+                              "." + name.c_str())
+                                 .asChar(),
+                             (fnDep.uuid().asString() + "." + name.c_str())
+                                 .asChar())) {
                     // Should never get here
                     return false;
                 }
-                // update the name to the new node
-                it->m_portName =
-                    (fnDep.uuid().asString() + "." + name.c_str()).asChar();
 
                 // Find connected proxyShape
                 auto oldAttr =
@@ -238,9 +265,10 @@ bool UsdTranslation::portAdded(Amino::String const&                  name,
                 CHECK_MSTATUS_AND_RETURN(status, false)
 
                 (const_cast<UsdTranslation*>(this))
-                    ->m_portData.push_back(UsdPortData(
-                        (fnDep.uuid().asString() + "." + name.c_str()).asChar(),
-                        -1, proxyNode.name().asChar()));
+                    ->m_portData[(fnDep.uuid().asString() + "." +
+                                  name.c_str())
+                                     .asChar()]
+                    .m_mayaProxyShape = proxyNode.name().asChar();
             }
 
             if (!proxyObj.isNull()) {
@@ -294,7 +322,7 @@ bool UsdTranslation::portAdded(Amino::String const&                  name,
 
 bool UsdTranslation::portRemoved(
     Amino::String const& name, Amino::String const& graphName) const noexcept {
-    auto const fullName = graphName + "." + name;
+    auto const fullName = std::string(graphName.c_str()) + "." + name.c_str();
     (const_cast<UsdTranslation*>(this))->removeStageForPort(fullName);
     (const_cast<UsdTranslation*>(this))->removePortData(fullName);
     return true;
@@ -304,68 +332,153 @@ bool UsdTranslation::portRenamed(
     Amino::String const& prevName,
     Amino::String const& name,
     Amino::String const& graphName) const noexcept {
-    auto const prevFullName = graphName + "." + prevName;
-    auto const fullName     = graphName + "." + name;
+    auto const graphPrefix = std::string(graphName.c_str()) + ".";
+    return (const_cast<UsdTranslation*>(this))
+        ->renamePortData(graphPrefix + prevName.c_str(),
+                         graphPrefix + name.c_str());
+}
 
-    auto item = (const_cast<UsdTranslation*>(this))->getPortData(name);
-    if (item != m_portData.end()) {
-        item->m_portName = fullName;
-        return true;
+void UsdTranslation::addStageForPort(std::string const& portName,
+                                     int64_t            id,
+                                     bool               isEmptyStage,
+                                     MPlug const*       plug) {
+    auto& portData = m_portData[portName];
+    if (plug && !portData.m_plug) {
+        portData.m_plug = std::make_shared<MPlug>(*plug);
+    }
+    bool const isNewId = id >= 0 && m_cacheIdRefCounts.count(id) == 0;
+    // Remove the old stage of the port from the cache if no other port
+    // outputs it
+    (void)setPortCacheId(portData, id);
+    portData.m_isEmptyStage = isEmptyStage;
+    if (isNewId) {
+        enforceStageCacheBudget(id);
     }
-
-    return false;
 }
 
-void UsdTranslation::addStageForPort(Amino::String const& portName,
-                                     int64_t              id) {
-    auto it = getPortData(portName);
-    if (it != m_portData.end()) {
-        // Remove the old stage from the cache
-        if (it->m_cacheId >= 0 && it->m_cacheId != id) {
-            (void)removeStageForPort(portName);
-        }
-        it->m_cacheId = id;
-    } else {
-        m_portData.push_back(UsdPortData(portName, id, ""));
+bool UsdTranslation::findEmptyStageId(std::string const& portName,
+                                      int64_t&           outId) const {
+    auto it = m_portData.find(portName);
+    if (it == m_portData.end()) return false;
+
+    auto const& portData = it->second;
+    if (portData.m_cacheId < 0 || !portData.m_isEmptyStage) return false;
+
+    // The stage may have been removed from the cache by someone else.
+    // On windows we need to cast to long int, otherwise its a warning as error
+    if (!PXR_NS::UsdUtilsStageCache::Get().Contains(
+            PXR_NS::UsdStageCache::Id::FromLongInt(
+                static_cast<long int>(portData.m_cacheId)))) {
+        return false;
     }
+    outId = portData.m_cacheId;
+    return true;
 }
 
-bool UsdTranslation::removeStageForPort(Amino::String const& portName) {
-    auto it = getPortData(portName);
-    if (it != m_portData.end()) {
-        // We need to check that there's no other port is pointing to this stage
-        bool idStillInUse = false;
-        for (auto const& item : m_portData) {
-            if (it->m_portName == item.m_portName) continue; // skip yourself
-            if (it->m_cacheId == item.m_cacheId) {
-                idStillInUse = true;
-                break;
-            }
+bool UsdTranslation::setPortCacheId(UsdPortData& portData, int64_t id) {
+    auto const prevId = portData.m_cacheId;
+    if (prevId == id) return false;
+
+    portData.m_cacheId = id;
+    if (id >= 0) ++m_cacheIdRefCounts[id];
+    if (prevId < 0) return false;
+
+    // The previous stage may already have been evicted from the cache
+    auto it = m_cacheIdRefCounts.find(prevId);
+    if (it == m_cacheIdRefCounts.end()) return false;
+    if (--it->second > 0) return false;
+
+    m_cacheIdRefCounts.erase(it);
+    return BifrostUsd::StageCache::removeStageFromCache(prevId);
+}
+
+void UsdTranslation::enforceStageCacheBudget(int64_t currentId) {
+    auto const maxMegaBytes =
+        PXR_NS::TfGetEnvSetting(PXR_NS::BIFROST_USD_STAGE_CACHE_MAX_MB);
+    if (maxMegaBytes <= 0) return;
+
+    // Only the stages output by the other ports and not shown by a Maya USD
+    // proxy shape can be evicted: the plugs of the proxy shapes would keep
+    // the id of an evicted stage. Stages added to the cache by someone else
+    // are neither accounted for nor removed.
+    std::unordered_set<int64_t> shownIds{currentId};
+    for (auto const& item : m_portData) {
+        if (item.second.m_cacheId < 0) continue;
+        // Keep the stages of the ports without a plug, their ids may be used
+        auto const& plug = item.second.m_plug;
+        if (!isPlugValid(plug)) {
+            shownIds.insert(item.second.m_cacheId);
+            continue;
         }
-        if (!idStillInUse) {
-            return BifrostUsd::StageCache::removeStageFromCache(
-                it->m_cacheId);
+        MPlugArray destinations;
+        plug->destinations(destinations);
+        if (destinations.length() > 0) {
+            shownIds.insert(item.second.m_cacheId);
         }
     }
-    return false;
-}
+    std::vector<int64_t> candidateIds;
+    for (auto const& item : m_cacheIdRefCounts) {
+        if (shownIds.count(item.first) == 0) {
+            candidateIds.push_back(item.first);
+        }
+    }
+    if (candidateIds.empty()) return;
 
-typename Amino::Array<UsdTranslation::UsdPortData>::iterator
-UsdTranslation::getPortData(Amino::String const& portName) {
-    for (auto it = m_portData.begin(); it != m_portData.end(); ++it) {
-        if (it->m_portName == portName) {
-            return it;
+    auto const removedIds = BifrostUsd::StageCache::evictStages(
+        static_cast<uint64_t>(maxMegaBytes) * 1024 * 1024, candidateIds);
+    if (removedIds.empty()) return;
+
+    for (auto const removedId : removedIds) {
+        m_cacheIdRefCounts.erase(removedId);
+    }
+    for (auto& item : m_portData) {
+        if (std::find(removedIds.begin(), removedIds.end(),
+                      item.second.m_cacheId) == removedIds.end()) {
+            continue;
         }
+        item.second.m_cacheId = -1;
+        // Dirty the plug so that it outputs its stage again if it gets
+        // connected to a proxy shape.
+        auto const& plug = item.second.m_plug;
+        if (isPlugValid(plug)) {
+            MGlobal::executeCommandOnIdle(MString("dgdirty \"") +
+                                          plug->name() + "\";");
+        }
+    }
+    if (!m_evictionReported) {
+        m_evictionReported = true;
+        MGlobal::displayWarning(
+            "Bifrost USD: stages that are not shown by a Maya USD proxy shape "
+            "are evicted from the USD stage cache to stay within "
+            "BIFROST_USD_STAGE_CACHE_MAX_MB.");
     }
+}
 
-    return m_portData.end();
+bool UsdTranslation::removeStageForPort(std::string const& portName) {
+    auto* portData = getPortData(portName);
+    return portData && setPortCacheId(*portData, -1);
 }
 
-void UsdTranslation::removePortData(Amino::String const& portName) {
-    auto it = getPortData(portName);
-    if (it != m_portData.end()) {
-        m_portData.erase(it);
-    }
+UsdTranslation::UsdPortData* UsdTranslation::getPortData(
+    std::string const& portName) {
+    auto it = m_portData.find(portName);
+    return it != m_portData.end() ? &it->second : nullptr;
+}
+
+bool UsdTranslation::renamePortData(std::string const& prevPortName,
+                                    std::string const& portName) {
+    auto node = m_portData.extract(prevPortName);
+    if (node.empty()) return false;
+
+    node.key() = portName;
+    // The plug is found again when the renamed port outputs a stage
+    node.mapped().m_plug = nullptr;
+    m_portData.insert(std::move(node));
+    return true;
+}
+
+void UsdTranslation::removePortData(std::string const& portName) {
+    m_portData.erase(portName);
 }
 
 extern "C" {
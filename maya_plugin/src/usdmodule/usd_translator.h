@@ -18,10 +18,17 @@
 #include <BifrostGraph/Executor/TypeTranslation.h>
 
 #include <Amino/Core/Array.h>
+#include <Amino/Core/Ptr.h>
+
+#include <cstdint>
+#include <memory>
+#include <string>
+#include <unordered_map>
 
 namespace BifrostUsd{
 class Stage;
 }
+class MPlug;
 
 class UsdTranslation : public BifrostGraph::Executor::TypeTranslation {
 public:
@@ -62,26 +69,49 @@ public:
 
 private:
     struct UsdPortData {
-        Amino::String m_portName;
         int64_t       m_cacheId;
         Amino::String m_mayaProxyShape;
-
-        UsdPortData() : m_portName(""), m_cacheId(-1), m_mayaProxyShape("") {}
-
-        UsdPortData(Amino::String portName,
-                    int64_t       cacheId,
-                    Amino::String mayaProxyShape)
-            : m_portName(portName),
-              m_cacheId(cacheId),
-              m_mayaProxyShape(mayaProxyShape) {}
+        /// Whether m_cacheId is the id of the empty stage output when the
+        /// graph has no stage to output.
+        bool m_isEmptyStage;
+        /// The plug of the port, null until the port outputs a stage.
+        std::shared_ptr<MPlug> m_plug;
+
+        UsdPortData()
+            : m_cacheId(-1),
+              m_mayaProxyShape(""),
+              m_isEmptyStage(false),
+              m_plug() {}
     };
-    Amino::Array<UsdPortData> m_portData;
-
-    void addStageForPort(Amino::String const& portName, int64_t id);
-    bool removeStageForPort(Amino::String const& portName);
-    typename Amino::Array<UsdTranslation::UsdPortData>::iterator getPortData(
-        Amino::String const& portName);
-    void removePortData(Amino::String const& portName);
+    /// The data of the ports, keyed by "<node UUID>.<port name>".
+    std::unordered_map<std::string, UsdPortData> m_portData;
+    /// The number of ports outputting each stage of the stage cache.
+    std::unordered_map<int64_t, size_t> m_cacheIdRefCounts;
+    /// Whether the user was warned that stages were evicted from the cache.
+    bool m_evictionReported;
+
+    void addStageForPort(std::string const& portName,
+                         int64_t            id,
+                         bool               isEmptyStage,
+                         MPlug const*       plug);
+    /// Get the id of the empty stage previously output by the port, if it is
+    /// still in the stage cache. Reusing it avoids adding a new empty stage
+    /// to the cache, and reloading the Maya USD proxy shape, each time the
+    /// graph has no stage to output.
+    bool findEmptyStageId(std::string const& portName, int64_t& outId) const;
+    bool removeStageForPort(std::string const& portName);
+    /// Set the stage cache id output by a port. The previous stage of the
+    /// port is removed from the stage cache when no other port outputs it.
+    bool setPortCacheId(UsdPortData& portData, int64_t id);
+    /// Evict the stages of the other ports that are not shown by a Maya USD
+    /// proxy shape when they exceed the memory budget set with the
+    /// BIFROST_USD_STAGE_CACHE_MAX_MB environment variable. Only called when
+    /// a port outputs a stage that no port was outputting.
+    void enforceStageCacheBudget(int64_t currentId);
+    UsdPortData* getPortData(std::string const& portName);
+    bool renamePortData(std::string const& prevPortName,
+                        std::string const& portName);
+    void removePortData(std::string const& portName);
 };
 
 extern "C" {
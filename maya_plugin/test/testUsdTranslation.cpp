@@ -61,3 +61,57 @@ TEST(UsdTranslationTests, portRemoved) {
 
     delete translator;
 }
+
+TEST(UsdTranslationTests, portRenamed) {
+    auto translator =
+        dynamic_cast<UsdTranslation*>(createBifrostTypeTranslation());
+
+    ASSERT_TRUE(translator != nullptr);
+
+    auto stage = Amino::newClassPtr<BifrostUsd::Stage>();
+
+    auto cacheId = translator->AddStageToCache(stage, "someproxy.somestage");
+    ASSERT_TRUE(translator->portRenamed("somestage", "renamed", "someproxy"));
+
+    // The previous stage of the renamed port is evicted when a new one is
+    // output
+    auto newStage   = Amino::newClassPtr<BifrostUsd::Stage>();
+    auto newCacheId = translator->AddStageToCache(newStage, "someproxy.renamed");
+    ASSERT_NE(cacheId, newCacheId);
+
+    // On windows we need to cast to long int, otheriwse its a warning as error
+    ASSERT_FALSE(PXR_NS::UsdUtilsStageCache::Get().Find(
+        PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<long int>(cacheId))));
+
+    translator->portRemoved("renamed", "someproxy");
+    ASSERT_FALSE(PXR_NS::UsdUtilsStageCache::Get().Find(
+        PXR_NS::UsdStageCache::Id::FromLongInt(
+            static_cast<long int>(newCacheId))));
+
+    delete translator;
+}
+
+TEST(UsdTranslationTests, portRemovedSharedStage) {
+    auto translator =
+        dynamic_cast<UsdTranslation*>(createBifrostTypeTranslation());
+
+    ASSERT_TRUE(translator != nullptr);
+
+    auto stage = Amino::newClassPtr<BifrostUsd::Stage>();
+
+    auto cacheId = translator->AddStageToCache(stage, "someproxy.somestage");
+    ASSERT_EQ(cacheId,
+              translator->AddStageToCache(stage, "otherproxy.somestage"));
+
+    // The stage is still output by the other port
+    translator->portRemoved("somestage", "someproxy");
+    // On windows we need to cast to long int, otheriwse its a warning as error
+    ASSERT_TRUE(PXR_NS::UsdUtilsStageCache::Get().Find(
+        PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<long int>(cacheId))));
+
+    translator->portRemoved("somestage", "otherproxy");
+    ASSERT_FALSE(PXR_NS::UsdUtilsStageCache::Get().Find(
+        PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<long int>(cacheId))));
+
+    delete translator;
+}
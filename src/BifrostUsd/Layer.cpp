@@ -16,6 +16,8 @@
 
 #include <BifrostUsd/Layer.h>
 
+#include "LayerExportRegistry.h"
+
 #include <Bifrost/FileUtils/FileUtils.h>
 
 #include <Amino/Cpp/ClassDefine.h>
@@ -29,7 +31,11 @@ BIFUSD_WARNING_DISABLE_MSC(4244)
 BIFUSD_WARNING_DISABLE_MSC(4305)
 BIFUSD_WARNING_DISABLE_MSC(4800)
 
+#include <pxr/base/arch/fileSystem.h>
+#include <pxr/base/tf/envSetting.h>
+#include <pxr/base/tf/hash.h>
 #include <pxr/base/tf/pathUtils.h> // TfNormPath
+#include <pxr/base/work/loops.h>
 #include <pxr/usd/sdf/copyUtils.h>
 #include <pxr/usd/sdf/fileFormat.h>
 #include <pxr/usd/usd/attribute.h>
@@ -40,7 +46,18 @@ BIFUSD_WARNING_POP
 
 #include <Amino/Cpp/ClassDefine.h>
 
+#include <fstream>
+#include <mutex>
 #include <string>
+#include <vector>
+
+PXR_NAMESPACE_OPEN_SCOPE
+TF_DEFINE_ENV_SETTING(BIFROST_USD_BINARY_INTERMEDIATE_LAYERS,
+                      false,
+                      "Use the binary usdc format instead of the usd format "
+                      "for the layers and file paths without a valid USD file "
+                      "extension.");
+PXR_NAMESPACE_CLOSE_SCOPE
 
 namespace {
 
@@ -49,6 +66,14 @@ const std::string dotUsdExtension(".usd");
 const std::string dotUsdaExtension(".usda");
 const std::string dotUsdcExtension(".usdc");
 
+const std::string& defaultExtension() {
+    static const std::string extension =
+        PXR_NS::TfGetEnvSetting(PXR_NS::BIFROST_USD_BINARY_INTERMEDIATE_LAYERS)
+            ? dotUsdcExtension
+            : dotUsdExtension;
+    return extension;
+}
+
 Amino::String getFilenameWithValidUsdFileFormat(const Amino::String& filename = "") {
     size_t nameSize = filename.size();
     size_t extSize = 0;
@@ -77,7 +102,7 @@ Amino::String getFilenameWithValidUsdFileFormat(const Amino::String& filename =
     if (nameSize == 0) {
         // No filename is provided. Use default stem + default extension
         name = Amino::String(defaultStem.data(), defaultStem.size());
-        name.append(dotUsdExtension.data(), dotUsdExtension.size());
+        name.append(defaultExtension().data(), defaultExtension().size());
     } else if (matchExtension()) {
         // A valid extension is already present
         if (nameSize == extSize) {
@@ -90,13 +115,48 @@ Amino::String getFilenameWithValidUsdFileFormat(const Amino::String& filename =
     } else {
         // No valid extension. Append default extension
         name = filename;
-        name.append(dotUsdExtension.data(), dotUsdExtension.size());
+        name.append(defaultExtension().data(), defaultExtension().size());
     }
     return name;
 }
 
 BifrostUsd::Layer const s_invalidLayer{BifrostUsd::Layer::Invalid{}};
 
+/// The temporary files that could not be removed yet. On Windows, a file
+/// can't be removed while it is memory-mapped, for instance by a usdc layer
+/// that is still open. These files are removed by a later call to
+/// removeTmpFile, or when the library is unloaded.
+class PendingTmpFiles {
+public:
+    ~PendingTmpFiles() {
+        for (const auto& filePath : m_filePaths) {
+            PXR_NS::ArchUnlinkFile(filePath.c_str());
+        }
+    }
+
+    void remove(const std::string& filePath) {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        auto it = m_filePaths.begin();
+        while (it != m_filePaths.end()) {
+            it = PXR_NS::ArchUnlinkFile(it->c_str()) == 0
+                     ? m_filePaths.erase(it)
+                     : it + 1;
+        }
+        if (PXR_NS::ArchUnlinkFile(filePath.c_str()) != 0) {
+            m_filePaths.push_back(filePath);
+        }
+    }
+
+private:
+    std::mutex               m_mutex;
+    std::vector<std::string> m_filePaths;
+};
+
+void removeTmpFile(const std::string& filePath) {
+    static PendingTmpFiles pendingTmpFiles;
+    pendingTmpFiles.remove(filePath);
+}
+
 struct Sublayer {
     PXR_NS::SdfLayerRefPtr sublayer;
     Amino::String       sublayerPath;
@@ -151,8 +211,12 @@ Layer::Layer(const Amino::String& filePath,
     }
 
     // Temporary Stage that will help in loading relative files and give us
-    // access to the sublayers
-    auto stage = PXR_NS::UsdStage::Open(m_originalFilePath.c_str());
+    // access to the sublayers. Only its layer stack is needed, so it is
+    // opened with an empty population mask and without payloads to avoid
+    // composing the prims.
+    auto stage = PXR_NS::UsdStage::OpenMasked(
+        m_originalFilePath.c_str(), PXR_NS::UsdStagePopulationMask(),
+        PXR_NS::UsdStage::LoadNone);
     if (stage) {
         if (isEditable) {
             m_layer = PXR_NS::SdfLayer::CreateAnonymous(m_tag.c_str());
@@ -372,8 +436,9 @@ Layer const& Layer::getSubLayer(int index) const {
     return m_subLayers[index];
 }
 
-bool Layer::exportToFile(const Amino::String& filePath,
-                         bool                 relativePath) const {
+bool Layer::exportToFile(const Amino::String&         filePath,
+                         bool                         relativePath,
+                         Amino::Array<Amino::String>* writtenFilePaths) const {
     std::string outFilePath =
         filePath.empty() ? m_filePath.c_str() :
             getPathWithValidUsdFileFormat(filePath).c_str();
@@ -383,23 +448,15 @@ bool Layer::exportToFile(const Amino::String& filePath,
 
     auto fileFormat = PXR_NS::SdfFileFormat::FindByExtension(
         m_fileFormat.empty() ? outFilePath : m_fileFormat.c_str());
-
-    // Create a new SdfLayer that is not yet saved to the disk.
-    // Note: We do not use SdfLayer::CreateNew() because it immediately saves
-    //       the file to disk, and then it can randomly fail when running unit
-    //       tests in parallel on Windows (as if there could still be an open
-    //       handle to such file when the call to Save() is executed below,
-    //       producing an intermittent access denied error).
-    auto outLayer   = PXR_NS::SdfLayer::New(fileFormat, outFilePath);
-    if (!outLayer) {
+    if (!fileFormat) {
         return false;
     }
-    // Update new SdfLayer's content from this Layer's content:
-    outLayer->TransferContent(m_layer);
 
-    // Replace anonymous sublayer identifier by real layer file path
-    for (int i = 0; i < static_cast<int>(m_subLayers.size()); ++i) {
-        const auto& layer = m_subLayers[i];
+    // Compute the sublayer identifiers to write in the exported layer,
+    // replacing anonymous sublayer identifiers by real layer file paths.
+    std::vector<std::string> sublayerIdentifiers;
+    sublayerIdentifiers.reserve(m_subLayers.size());
+    for (const auto& layer : m_subLayers) {
         Amino::String sdfLayerIdentifier = layer.m_filePath.empty() ?
             layer.m_originalFilePath : layer.m_filePath;
         if (relativePath) {
@@ -412,17 +469,111 @@ bool Layer::exportToFile(const Amino::String& filePath,
         if (sdfLayerIdentifier.empty()) {
             return false;
         }
+        sublayerIdentifiers.emplace_back(sdfLayerIdentifier.c_str());
+    }
+
+    // Sublayers are written to their own files and do not depend on each
+    // other, so they can be exported concurrently.
+    std::vector<Amino::Array<Amino::String>> writtenSubLayerFilePaths(
+        writtenFilePaths ? m_subLayers.size() : 0);
+    // Not a std::vector<bool>, so that the flags can be set concurrently.
+    std::vector<char> subLayerSuccess(m_subLayers.size(), 1);
+    PXR_NS::WorkParallelForN(
+        m_subLayers.size(),
+        [this, relativePath, writtenFilePaths, &writtenSubLayerFilePaths,
+         &subLayerSuccess](size_t begin, size_t end) {
+            for (size_t i = begin; i < end; ++i) {
+                const auto& layer = m_subLayers[i];
+                // Sublayers without a file path or that are not editable are
+                // read from disk and are not meant to be written.
+                if (layer.m_filePath.empty() || !layer.m_layer ||
+                    !layer.m_layer->PermissionToEdit()) {
+                    continue;
+                }
+                subLayerSuccess[i] = layer.exportToFile(
+                    layer.m_filePath, relativePath,
+                    writtenFilePaths ? &writtenSubLayerFilePaths[i]
+                                     : nullptr);
+            }
+        });
+
+    bool written = false;
+    auto writeLayer = [&]() {
+        auto& registry = ExportRegistry::instance();
+
+        // The layer change generation is queried before reading the layer
+        // content, so that any modification done after this point changes it.
+        ExportState state{
+            PXR_NS::get_pointer(m_layer),
+            PXR_NS::TfHash::Combine(
+                LayerChangeTracker::instance().generation(m_layer),
+                fileFormat->GetFormatId(), sublayerIdentifiers)};
+        if (registry.isUpToDate(outFilePath, state)) {
+            return true;
+        }
+
+        // When the sublayer paths of this layer are the ones to write and the
+        // file format is the one deduced from the file extension, write
+        // directly from this layer, without copying its content into a new
+        // SdfLayer first.
+        const std::vector<std::string> layerSublayerPaths =
+            m_layer->GetSubLayerPaths();
+        if (layerSublayerPaths == sublayerIdentifiers &&
+            fileFormat == PXR_NS::SdfFileFormat::FindByExtension(outFilePath)) {
+            if (!m_layer->Export(outFilePath)) {
+                return false;
+            }
+            written = true;
+            registry.update(outFilePath, state);
+            return true;
+        }
+
+        // Create a new SdfLayer that is not yet saved to the disk.
+        // Note: We do not use SdfLayer::CreateNew() because it immediately
+        //       saves the file to disk, and then it can randomly fail when
+        //       running unit tests in parallel on Windows (as if there could
+        //       still be an open handle to such file when the call to Save()
+        //       is executed below, producing an intermittent access denied
+        //       error).
+        auto outLayer = PXR_NS::SdfLayer::New(fileFormat, outFilePath);
+        if (!outLayer) {
+            return false;
+        }
+        // Update new SdfLayer's content from this Layer's content:
+        outLayer->TransferContent(m_layer);
 
-        layer.exportToFile(layer.m_filePath, relativePath);
+        for (int i = 0; i < static_cast<int>(sublayerIdentifiers.size()); ++i) {
+            outLayer->RemoveSubLayerPath(i);
+            outLayer->InsertSubLayerPath(sublayerIdentifiers[i], i);
+        }
 
-        outLayer->RemoveSubLayerPath(i);
-        outLayer->InsertSubLayerPath(sdfLayerIdentifier.c_str(), i);
+        if (!outLayer->Save()) {
+            return false;
+        }
+        written = true;
+        registry.update(outFilePath, state);
+        return true;
+    };
+    bool success = writeLayer();
+    for (auto subLayerSucceeded : subLayerSuccess) {
+        success = success && subLayerSucceeded;
     }
 
-    return outLayer->Save();
+    if (writtenFilePaths) {
+        if (written) {
+            writtenFilePaths->push_back(outFilePath.c_str());
+        }
+        for (const auto& subLayerFilePaths : writtenSubLayerFilePaths) {
+            for (const auto& subLayerFilePath : subLayerFilePaths) {
+                writtenFilePaths->push_back(subLayerFilePath);
+            }
+        }
+    }
+    return success;
 }
 
-Amino::String Layer::exportToString(bool exportSubLayers) const {
+PXR_NS::SdfLayerRefPtr Layer::exportToAnonymousLayer(
+    bool exportSubLayers) const {
     auto outLayer = PXR_NS::SdfLayer::CreateAnonymous(
         getTagWithValidUsdFileFormat().c_str());
     outLayer->TransferContent(m_layer);
@@ -437,11 +588,91 @@ Amino::String Layer::exportToString(bool exportSubLayers) const {
         }
     }
 
+    return outLayer;
+}
+
+Amino::String Layer::exportToString(bool exportSubLayers) const {
     std::string result;
-    outLayer->ExportToString(&result);
+    exportToAnonymousLayer(exportSubLayers)->ExportToString(&result);
     return result.c_str();
 }
 
+Amino::Array<Amino::uchar_t> Layer::exportToBinary(bool exportSubLayers) const {
+    return toBinary(exportToAnonymousLayer(exportSubLayers));
+}
+
+Amino::Array<Amino::uchar_t> Layer::toBinary(
+    const PXR_NS::SdfLayerHandle& layer) {
+    Amino::Array<Amino::uchar_t> bytes;
+    auto format = PXR_NS::SdfFileFormat::FindById(PXR_NS::TfToken("usdc"));
+    if (!layer || !format) {
+        return bytes;
+    }
+
+    // The usdc file format can't be written to a string, so write it to a
+    // temporary file.
+    const auto filePath =
+        PXR_NS::ArchMakeTmpFileName(defaultStem + "_", dotUsdcExtension);
+    if (format->WriteToFile(*layer, filePath)) {
+        std::ifstream file(filePath, std::ios::binary | std::ios::ate);
+        if (file) {
+            const auto size = static_cast<size_t>(file.tellg());
+            bytes.resize(size);
+            file.seekg(0);
+            file.read(reinterpret_cast<char*>(bytes.data()),
+                      static_cast<std::streamsize>(size));
+            if (!file) {
+                bytes.clear();
+            }
+        }
+    }
+    removeTmpFile(filePath);
+    return bytes;
+}
+
+Layer Layer::fromBinary(const Amino::Array<Amino::uchar_t>& bytes,
+                        const Amino::String&                tag) {
+    if (bytes.empty()) {
+        return Layer(Invalid{});
+    }
+
+    // The usdc file format can't be read from a string, so read it from a
+    // temporary file.
+    const auto filePath =
+        PXR_NS::ArchMakeTmpFileName(defaultStem + "_", dotUsdcExtension);
+    bool written = false;
+    {
+        std::ofstream file(filePath, std::ios::binary);
+        file.write(reinterpret_cast<const char*>(bytes.data()),
+                   static_cast<std::streamsize>(bytes.size()));
+        file.close();
+        written = !file.fail();
+    }
+
+    Layer layer(Invalid{});
+    if (written) {
+        auto fileLayer = PXR_NS::SdfLayer::FindOrOpen(filePath);
+        if (fileLayer) {
+            // The content is transferred to a new anonymous layer, so the
+            // temporary file is not needed by the layer.
+            layer = Layer(tag);
+            layer.m_layer->TransferContent(fileLayer);
+            auto sublayers = getSublayers(fileLayer);
+            // Clear the sublayerPaths
+            layer.m_layer->SetSubLayerPaths(std::vector<std::string>());
+            // Re-create and add the subLayers and subLayerPaths:
+            for (size_t i = 0; i < sublayers.size(); ++i) {
+                layer.m_subLayers.push_back(Layer(sublayers[i].sublayer, true,
+                                                  sublayers[i].sublayerPath));
+                layer.m_layer->InsertSubLayerPath(
+                    layer.m_subLayers[i]->GetIdentifier(), static_cast<int>(i));
+            }
+        }
+    }
+    removeTmpFile(filePath);
+    return layer;
+}
+
 Amino::String Layer::getTagWithValidUsdFileFormat(const Amino::String& tag) {
     // Extract the filename (if any) from given tag.
     // If tag has no filename, or filename is the current or parent directory
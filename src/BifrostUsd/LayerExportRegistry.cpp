@@ -0,0 +1,140 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include "LayerExportRegistry.h"
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+
+BIFUSD_WARNING_DISABLE_MSC(4003)
+BIFUSD_WARNING_DISABLE_MSC(4244)
+BIFUSD_WARNING_DISABLE_MSC(4305)
+BIFUSD_WARNING_DISABLE_MSC(4800)
+
+#include <pxr/base/arch/fileSystem.h>
+#include <pxr/base/tf/notice.h>
+
+BIFUSD_WARNING_POP
+
+#include <algorithm>
+
+namespace BifrostUsd {
+
+//------------------------------------------------------------------------------
+//
+LayerChangeTracker& LayerChangeTracker::instance() {
+    static LayerChangeTracker s_tracker;
+    return s_tracker;
+}
+
+LayerChangeTracker::LayerChangeTracker() {
+    PXR_NS::TfNotice::Register(PXR_NS::TfCreateWeakPtr(this),
+                               &LayerChangeTracker::onLayersDidChange);
+}
+
+uint64_t LayerChangeTracker::generation(const PXR_NS::SdfLayerHandle& layer) {
+    if (!layer) {
+        return 0;
+    }
+    std::lock_guard<std::mutex> lock(m_mutex);
+    auto& entry = m_entries[PXR_NS::get_pointer(layer)];
+    if (entry.generation == 0 || entry.layer.IsExpired() ||
+        entry.layer != layer) {
+        // First query for this layer, or a new layer was allocated at the
+        // address of a destroyed one.
+        entry.layer      = layer;
+        entry.generation = ++m_lastGeneration;
+    }
+    return entry.generation;
+}
+
+void LayerChangeTracker::onLayersDidChange(
+    const PXR_NS::SdfNotice::LayersDidChange& notice) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    for (const auto& change : notice.GetChangeListVec()) {
+        const auto& layer = change.first;
+        if (!layer) {
+            continue;
+        }
+        auto& entry      = m_entries[PXR_NS::get_pointer(layer)];
+        entry.layer      = layer;
+        entry.generation = ++m_lastGeneration;
+    }
+    if (m_entries.size() > m_pruneThreshold) {
+        pruneExpiredLayers();
+    }
+}
+
+void LayerChangeTracker::pruneExpiredLayers() {
+    for (auto it = m_entries.begin(); it != m_entries.end();) {
+        if (it->second.layer.IsExpired()) {
+            it = m_entries.erase(it);
+        } else {
+            ++it;
+        }
+    }
+    m_pruneThreshold = std::max<size_t>(64, 2 * m_entries.size());
+}
+
+//------------------------------------------------------------------------------
+//
+ExportRegistry& ExportRegistry::instance() {
+    static ExportRegistry s_registry;
+    return s_registry;
+}
+
+const ExportRegistry::Entry* ExportRegistry::findUnmodifiedEntry(
+    const std::string& filePath) const {
+    auto it = m_entries.find(filePath);
+    if (it == m_entries.end()) {
+        return nullptr;
+    }
+    double modificationTime = 0.0;
+    if (!PXR_NS::ArchGetModificationTime(filePath.c_str(), &modificationTime) ||
+        modificationTime != it->second.modificationTime ||
+        PXR_NS::ArchGetFileLength(filePath.c_str()) != it->second.fileLength) {
+        return nullptr;
+    }
+    return &it->second;
+}
+
+bool ExportRegistry::isUpToDate(const std::string& filePath,
+                                const ExportState& state) const {
+    if (!state.isValid()) {
+        return false;
+    }
+    std::lock_guard<std::mutex> lock(m_mutex);
+    auto const* entry = findUnmodifiedEntry(filePath);
+    return entry && entry->state == state;
+}
+
+void ExportRegistry::update(const std::string& filePath,
+                            const ExportState& state) {
+    Entry entry{state, PXR_NS::ArchGetFileLength(filePath.c_str()), 0.0};
+    bool hasFileInfo = entry.fileLength >= 0 &&
+                       PXR_NS::ArchGetModificationTime(filePath.c_str(),
+                                                       &entry.modificationTime);
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (hasFileInfo && state.isValid()) {
+        m_entries[filePath] = entry;
+    } else {
+        m_entries.erase(filePath);
+    }
+}
+
+} // namespace BifrostUsd
@@ -0,0 +1,143 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file LayerExportRegistry.h
+///
+/// \brief Private helpers used to avoid rewriting unchanged layers to disk.
+///
+
+#ifndef BIFROST_USD_LAYER_EXPORT_REGISTRY_H
+#define BIFROST_USD_LAYER_EXPORT_REGISTRY_H
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+
+BIFUSD_WARNING_DISABLE_MSC(4003)
+BIFUSD_WARNING_DISABLE_MSC(4244)
+BIFUSD_WARNING_DISABLE_MSC(4305)
+BIFUSD_WARNING_DISABLE_MSC(4800)
+
+#include <pxr/base/tf/weakBase.h>
+#include <pxr/usd/sdf/layer.h>
+#include <pxr/usd/sdf/notice.h>
+
+BIFUSD_WARNING_POP
+
+#include <cstdint>
+#include <mutex>
+#include <string>
+#include <unordered_map>
+
+namespace BifrostUsd {
+
+/// \class LayerChangeTracker
+/// \brief Listens to the SdfNotice::LayersDidChange notices and maintains a
+/// change generation for every modified SdfLayer.
+///
+/// Generations are unique across all layers: a layer gets a new generation
+/// each time it is modified, or the first time its generation is queried.
+/// Two queries returning the same generation for the same layer guarantee
+/// that the layer was not modified in between.
+class LayerChangeTracker : public PXR_NS::TfWeakBase {
+public:
+    static LayerChangeTracker& instance();
+
+    LayerChangeTracker(const LayerChangeTracker&)            = delete;
+    LayerChangeTracker& operator=(const LayerChangeTracker&) = delete;
+
+    /// \brief Returns the current change generation of the given layer.
+    /// \param [in] layer The layer to query.
+    /// \returns The change generation of the layer, or 0 if the layer is
+    ///     invalid.
+    uint64_t generation(const PXR_NS::SdfLayerHandle& layer);
+
+private:
+    LayerChangeTracker();
+
+    void onLayersDidChange(const PXR_NS::SdfNotice::LayersDidChange& notice);
+
+    /// \brief Removes the entries of the destroyed layers.
+    /// \note Must be called with m_mutex locked.
+    void pruneExpiredLayers();
+
+    struct Entry {
+        PXR_NS::SdfLayerHandle layer;
+        uint64_t               generation = 0;
+    };
+
+    std::mutex                                          m_mutex;
+    std::unordered_map<const PXR_NS::SdfLayer*, Entry> m_entries;
+    uint64_t                                            m_lastGeneration = 0;
+    size_t                                              m_pruneThreshold = 64;
+};
+
+/// \brief Identifies the state of the source of an exported file: the
+/// source object (an SdfLayer or a UsdStage) and a fingerprint of everything
+/// that affects the written content (change generations, sublayer paths,
+/// file format...).
+struct ExportState {
+    const void* source      = nullptr;
+    size_t      fingerprint = 0;
+
+    bool isValid() const { return source != nullptr; }
+    bool operator==(const ExportState& other) const {
+        return source == other.source && fingerprint == other.fingerprint;
+    }
+};
+
+/// \class ExportRegistry
+/// \brief Keeps track of what was last written to each file path, so that
+/// a file whose source did not change since it was written is not written
+/// again.
+///
+/// The file length and modification time recorded after writing are used to
+/// detect files that were modified or removed by someone else, in which case
+/// they are never considered up to date.
+class ExportRegistry {
+public:
+    static ExportRegistry& instance();
+
+    ExportRegistry(const ExportRegistry&)            = delete;
+    ExportRegistry& operator=(const ExportRegistry&) = delete;
+
+    /// \brief Returns true if the file was last written from the given
+    /// source state and was not modified since.
+    bool isUpToDate(const std::string& filePath, const ExportState& state) const;
+
+    /// \brief Records what was written to the given file. Must be called
+    /// right after the file is written.
+    void update(const std::string& filePath, const ExportState& state);
+
+private:
+    ExportRegistry() = default;
+
+    struct Entry {
+        ExportState state;
+        int64_t     fileLength       = -1;
+        double      modificationTime = 0.0;
+    };
+
+    /// \note Must be called with m_mutex locked.
+    const Entry* findUnmodifiedEntry(const std::string& filePath) const;
+
+    mutable std::mutex                     m_mutex;
+    std::unordered_map<std::string, Entry> m_entries;
+};
+
+} // namespace BifrostUsd
+
+#endif // BIFROST_USD_LAYER_EXPORT_REGISTRY_H
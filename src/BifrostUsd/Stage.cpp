@@ -16,6 +16,9 @@
 
 #include <BifrostUsd/Layer.h>
 #include <BifrostUsd/Stage.h>
+#include <BifrostUsd/VariantContext.h>
+
+#include "LayerExportRegistry.h"
 
 #include <Amino/Core/String.h>
 #include <Amino/Cpp/ClassDefine.h>
@@ -29,6 +32,7 @@ BIFUSD_WARNING_DISABLE_MSC(4244)
 BIFUSD_WARNING_DISABLE_MSC(4305)
 BIFUSD_WARNING_DISABLE_MSC(4800)
 
+#include <pxr/base/tf/hash.h>
 #include <pxr/usd/usd/attribute.h>
 #include <pxr/usd/usd/editContext.h>
 #include <pxr/usd/usd/prim.h>
@@ -39,6 +43,7 @@ BIFUSD_WARNING_DISABLE_MSC(4800)
 
 BIFUSD_WARNING_POP
 
+#include <memory>
 
 namespace {
 
@@ -49,6 +54,26 @@ PXR_NS::UsdStage::InitialLoadSet GetPxrInitialLoadSet(
                : PXR_NS::UsdStage::InitialLoadSet::LoadNone;
 }
 
+/// Open a new UsdStage on the given root layer, with the same population mask
+/// and load rules as the given stage.
+PXR_NS::UsdStageRefPtr OpenLike(const PXR_NS::SdfLayerHandle& rootLayer,
+                                const PXR_NS::UsdStageRefPtr& other) {
+    if (!other) {
+        return PXR_NS::UsdStage::Open(rootLayer);
+    }
+    const auto& loadRules = other->GetLoadRules();
+    if (loadRules == PXR_NS::UsdStageLoadRules::LoadAll()) {
+        return PXR_NS::UsdStage::OpenMasked(rootLayer, other->GetPopulationMask(),
+                                            PXR_NS::UsdStage::LoadAll);
+    }
+    auto stage = PXR_NS::UsdStage::OpenMasked(
+        rootLayer, other->GetPopulationMask(), PXR_NS::UsdStage::LoadNone);
+    if (stage && loadRules != PXR_NS::UsdStageLoadRules::LoadNone()) {
+        stage->SetLoadRules(loadRules);
+    }
+    return stage;
+}
+
 } // namespace
 
 namespace BifrostUsd {
@@ -87,7 +112,9 @@ Stage::Stage(const Amino::String&               filePath,
       m_stage(PXR_NS::UsdStage::OpenMasked(
           m_rootLayer->m_layer, mask, GetPxrInitialLoadSet(load))) {}
 
-Stage::Stage(const Stage& other) : Stage(*other.m_rootLayer) {
+Stage::Stage(const Stage& other)
+    : m_rootLayer(Amino::newClassPtr<Layer>(*other.m_rootLayer)),
+      m_stage(OpenLike(m_rootLayer->m_layer, other.m_stage)) {
     // The newly created UsdStage has the root layer as its default EditTarget.
     // We can't just copy the m_editLayerIndex, but must set the desired
     // layer as the EditTarget:
@@ -99,7 +126,7 @@ Stage::Stage(const Stage& other) : Stage(*other.m_rootLayer) {
 
 Stage& Stage::operator=(const Stage& other) {
     m_rootLayer = Amino::newClassPtr<Layer>(*other.m_rootLayer);
-    m_stage     = PXR_NS::UsdStage::Open(m_rootLayer->m_layer);
+    m_stage     = OpenLike(m_rootLayer->m_layer, other.m_stage);
 
     // The newly created UsdStage has the root layer as its default EditTarget.
     // We can't just copy the m_editLayerIndex, but must set the desired
@@ -108,6 +135,9 @@ Stage& Stage::operator=(const Stage& other) {
 
     last_modified_prim             = other.last_modified_prim;
     m_variantSelection = other.m_variantSelection;
+    // The cached variant EditTarget and data refer to the previous UsdStage.
+    m_variantEditTarget = VariantEditTargetCache{};
+    m_dataCache         = nullptr;
 
     return *this;
 }
@@ -141,8 +171,93 @@ bool Stage::setEditLayerIndex(const int layerIndex,
     return false;
 }
 
-bool Stage::save(const Amino::String& filePath) const {
-    return m_rootLayer->exportToFile(filePath.c_str());
+bool Stage::save(const Amino::String&         filePath,
+                 Amino::Array<Amino::String>* writtenFilePaths) const {
+    return m_rootLayer->exportToFile(filePath.c_str(), false, writtenFilePaths);
+}
+
+bool Stage::exportToFile(const Amino::String&         filePath,
+                         Amino::Array<Amino::String>* writtenFilePaths) const {
+    if (!m_stage || filePath.empty()) {
+        return false;
+    }
+    std::string outFilePath = filePath.c_str();
+
+    ExportState state{PXR_NS::get_pointer(m_stage), contentFingerprint()};
+
+    auto& registry = ExportRegistry::instance();
+    if (!registry.isUpToDate(outFilePath, state)) {
+        if (!m_stage->Export(outFilePath)) {
+            return false;
+        }
+        registry.update(outFilePath, state);
+        if (writtenFilePaths) {
+            writtenFilePaths->push_back(filePath);
+        }
+    }
+    return true;
+}
+
+size_t Stage::contentFingerprint() const {
+    if (!m_stage) {
+        return 0;
+    }
+    // The composed content depends on all the layers used by the stage, and
+    // on the population mask and load rules.
+    auto&  tracker     = LayerChangeTracker::instance();
+    size_t fingerprint = PXR_NS::TfHash::Combine(
+        m_stage->GetPopulationMask().GetPaths(),
+        m_stage->GetLoadRules().GetRules());
+    for (const auto& layer : m_stage->GetUsedLayers()) {
+        fingerprint = PXR_NS::TfHash::Combine(
+            fingerprint, layer->GetIdentifier(), tracker.generation(layer));
+    }
+    return fingerprint;
+}
+
+StageDataCache& Stage::dataCache() const {
+    // Stages flowing in the graph are read by concurrent node evaluations,
+    // so the cache is created atomically.
+    auto cache = std::atomic_load(&m_dataCache);
+    if (!cache) {
+        auto created = std::make_shared<StageDataCache>(m_stage);
+        if (std::atomic_compare_exchange_strong(&m_dataCache, &cache,
+                                                created)) {
+            cache = std::move(created);
+        }
+    }
+    return *cache;
+}
+
+PXR_NS::UsdEditTarget Stage::variantEditTarget() {
+    const auto& stack = m_variantSelection.stack();
+    if (!m_stage || stack.empty() || m_variantSelection.primPath().empty()) {
+        return PXR_NS::UsdEditTarget();
+    }
+
+    auto& cache = m_variantEditTarget;
+    if (!(cache.selection == m_variantSelection)) {
+        cache = VariantEditTargetCache{};
+    }
+    const auto& stageEditTarget = m_stage->GetEditTarget();
+    // An expired prim means that it was recomposed, in which case the
+    // variant selections may have to be authored again.
+    if (!cache.prim || !cache.editTarget.IsValid() ||
+        cache.stageEditTarget != stageEditTarget) {
+        PXR_NS::SdfPath primPath(m_variantSelection.primPath().c_str());
+        auto            prim = m_stage->GetPrimAtPath(primPath);
+        if (!prim) {
+            return PXR_NS::UsdEditTarget();
+        }
+        cache.selection       = m_variantSelection;
+        cache.stageEditTarget = stageEditTarget;
+        cache.editTarget      = SetVariantSelection(
+            prim, make_span_n(stack.data(), stack.size()),
+            [this]() { return m_stage->GetEditTarget(); });
+        // Authoring the variant selections recomposes the prim.
+        cache.prim = m_stage->GetPrimAtPath(primPath);
+    }
+    return cache.editTarget;
 }
 
 Amino::String Stage::lastModifiedVariantSet() const {
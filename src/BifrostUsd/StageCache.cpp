@@ -17,9 +17,105 @@
 #include <BifrostUsd/StageCache.h>
 #include <BifrostUsd/Stage.h>
 
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+
+BIFUSD_WARNING_DISABLE_MSC(4003)
+BIFUSD_WARNING_DISABLE_MSC(4244)
+BIFUSD_WARNING_DISABLE_MSC(4305)
+BIFUSD_WARNING_DISABLE_MSC(4800)
+
+#include <pxr/base/arch/fileSystem.h>
+#include <pxr/base/tf/type.h>
+#include <pxr/usd/sdf/layer.h>
 #include <pxr/usd/usdUtils/stageCache.h>
 
+BIFUSD_WARNING_POP
+
+#include <algorithm>
+#include <cassert>
 #include <limits>
+#include <utility>
+#include <vector>
+
+namespace {
+
+// Rough per-object costs used by the memory estimate.
+constexpr uint64_t kBytesPerSpec  = 256;
+constexpr uint64_t kBytesPerField = sizeof(PXR_NS::VtValue);
+
+PXR_NS::UsdStageCache::Id toCacheId(int64_t id) {
+#if defined(_WIN32)
+    // Note: on the USD side, this is implemented as a long int
+    // Which is platform dependent.  We interface ith a 64 bit int.
+    // So we cast.
+    assert(id <= std::numeric_limits<int>::max());
+    return PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<int>(id));
+#else
+    return PXR_NS::UsdStageCache::Id::FromLongInt(id);
+#endif
+}
+
+uint64_t estimateValueMemory(const PXR_NS::VtValue& value) {
+    uint64_t bytes = sizeof(PXR_NS::VtValue);
+    if (value.IsArrayValued()) {
+        auto elementType = PXR_NS::TfType::Find(value.GetElementTypeid());
+        bytes += value.GetArraySize() *
+                 std::max<size_t>(elementType.GetSizeof(), 1);
+    }
+    return bytes;
+}
+
+/// The values of anonymous layers are already in memory, so they are
+/// measured. File-backed layers may read their values from the file on
+/// demand, so only their specs and fields are counted and the size of the
+/// file stands for their values, instead of loading every value.
+uint64_t estimateLayerMemory(const PXR_NS::SdfLayerHandle& layer) {
+    const bool measureValues = layer->IsAnonymous();
+    uint64_t   bytes         = 0;
+    layer->Traverse(
+        PXR_NS::SdfPath::AbsoluteRootPath(),
+        [&layer, &bytes, measureValues](const PXR_NS::SdfPath& path) {
+            bytes += kBytesPerSpec;
+            for (const auto& field : layer->ListFields(path)) {
+                bytes += measureValues
+                             ? estimateValueMemory(layer->GetField(path, field))
+                             : kBytesPerField;
+            }
+            if (!measureValues) {
+                bytes += layer->GetNumTimeSamplesForPath(path) *
+                         (sizeof(double) + kBytesPerField);
+                return;
+            }
+            for (double time : layer->ListTimeSamplesForPath(path)) {
+                PXR_NS::VtValue sample;
+                if (layer->QueryTimeSample(path, time, &sample)) {
+                    bytes += sizeof(double) + estimateValueMemory(sample);
+                }
+            }
+        });
+    if (!measureValues) {
+        const auto fileSize = PXR_NS::ArchGetFileLength(
+            layer->GetRealPath().c_str());
+        if (fileSize > 0) {
+            bytes += static_cast<uint64_t>(fileSize);
+        }
+    }
+    return bytes;
+}
+
+uint64_t estimateUsdStageMemory(const PXR_NS::UsdStageRefPtr& stage) {
+    uint64_t bytes = 0;
+    for (const auto& layer : stage->GetUsedLayers()) {
+        if (layer) {
+            bytes += estimateLayerMemory(layer);
+        }
+    }
+    return bytes;
+}
+
+} // namespace
 
 namespace BifrostUsd {
 
@@ -49,17 +145,76 @@ bool StageCache::addStageToCache(const Amino::Ptr<BifrostUsd::Stage>& stage,
 }
 
 bool StageCache::removeStageFromCache(int64_t id) {
-#if defined(_WIN32)
-        // Note: on the USD side, this is implemented as a long int
-        // Which is platform dependent.  We interface ith a 64 bit int.
-        // So we cast.
-        assert(id <= std::numeric_limits<int>::max());
-        return PXR_NS::UsdUtilsStageCache::Get().Erase(
-            PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<int>(id)));
-#else
-        return PXR_NS::UsdUtilsStageCache::Get().Erase(
-            PXR_NS::UsdStageCache::Id::FromLongInt(id));
-#endif
+    return PXR_NS::UsdUtilsStageCache::Get().Erase(toCacheId(id));
+}
+
+uint64_t StageCache::estimateStageMemory(int64_t id) {
+    auto stage = PXR_NS::UsdUtilsStageCache::Get().Find(toCacheId(id));
+    if (!stage) {
+        return 0;
+    }
+    return estimateUsdStageMemory(stage);
+}
+
+Amino::Array<StageCacheEntry> StageCache::getCacheEntries() {
+    Amino::Array<StageCacheEntry> entries;
+    auto&                         cache  = PXR_NS::UsdUtilsStageCache::Get();
+    auto                          stages = cache.GetAllStages();
+    entries.reserve(stages.size());
+    for (const auto& stage : stages) {
+        auto id = cache.GetId(stage);
+        if (!id.IsValid()) {
+            continue;
+        }
+        StageCacheEntry entry;
+        entry.id = id.ToLongInt();
+        if (auto rootLayer = stage->GetRootLayer()) {
+            entry.rootLayer = rootLayer->GetIdentifier().c_str();
+        }
+        entry.estimatedBytes = estimateStageMemory(entry.id);
+        entries.push_back(std::move(entry));
+    }
+    std::sort(entries.begin(), entries.end(),
+              [](const StageCacheEntry& a, const StageCacheEntry& b) {
+                  return a.id < b.id;
+              });
+    return entries;
+}
+
+std::vector<int64_t> StageCache::evictStages(
+    uint64_t maxBytes, const std::vector<int64_t>& candidateIds) {
+    std::vector<int64_t> removedIds;
+
+    // Only the candidates are estimated. The other stages of the cache, like
+    // the ones opened by other plugins, are not ours to account for.
+    std::vector<int64_t> ids(candidateIds);
+    std::sort(ids.begin(), ids.end());
+    ids.erase(std::unique(ids.begin(), ids.end()), ids.end());
+
+    auto& cache = PXR_NS::UsdUtilsStageCache::Get();
+    std::vector<std::pair<int64_t, uint64_t>> entries;
+    entries.reserve(ids.size());
+    uint64_t totalBytes = 0;
+    for (auto id : ids) {
+        if (!cache.Contains(toCacheId(id))) {
+            continue;
+        }
+        auto bytes = estimateStageMemory(id);
+        entries.emplace_back(id, bytes);
+        totalBytes += bytes;
+    }
+
+    // The oldest candidates, with the lowest ids, are removed first
+    for (const auto& entry : entries) {
+        if (totalBytes <= maxBytes) {
+            break;
+        }
+        if (removeStageFromCache(entry.first)) {
+            totalBytes -= entry.second;
+            removedIds.push_back(entry.first);
+        }
+    }
+    return removedIds;
 }
 
 } // namespace BifrostUsd
@@ -0,0 +1,43 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include <BifrostUsd/StageDataCache.h>
+
+namespace BifrostUsd {
+
+StageDataCache::StageDataCache(const PXR_NS::UsdStageRefPtr& stage) {
+    if (stage) {
+        m_noticeKey = PXR_NS::TfNotice::Register(
+            PXR_NS::TfCreateWeakPtr(this), &StageDataCache::onObjectsChanged,
+            PXR_NS::UsdStageWeakPtr(stage));
+    }
+}
+
+StageDataCache::~StageDataCache() { PXR_NS::TfNotice::Revoke(m_noticeKey); }
+
+void StageDataCache::onObjectsChanged(
+    const PXR_NS::UsdNotice::ObjectsChanged& notice) {
+    std::lock_guard<std::mutex> lock(m_mutex);
+    for (auto it = m_slots.begin(); it != m_slots.end();) {
+        if (!it->second.invalidatedBy || it->second.invalidatedBy(notice)) {
+            it = m_slots.erase(it);
+        } else {
+            ++it;
+        }
+    }
+}
+
+} // namespace BifrostUsd
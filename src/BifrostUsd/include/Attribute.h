@@ -68,6 +68,7 @@ public:
     }
 
     PXR_NS::UsdAttribute const* operator->() const { return &pxr_attribute; }
+    PXR_NS::UsdAttribute const& getPxrAttribute() const { return pxr_attribute; }
     Amino::Ptr<Prim> const& getPrim() const { return prim_ptr; }
 
 private:
@@ -188,6 +188,51 @@ enum /*@cond true*/ class AMINO_ANNOTATE(
     ExpandPrimsAndProperties
 };
 
+/// \section SdfSpecifier
+///
+/// An enum that identifies the specifier of a prim.
+enum /*@cond true*/ class AMINO_ANNOTATE(
+    "Amino::Enum") /*@endcond*/ SdfSpecifier : int {
+    Def,
+    Over,
+    Class
+};
+
+/// \section ModelKind
+///
+/// An enum that contains the model kinds of a prim. None means the kind is
+/// not authored.
+enum /*@cond true*/ class AMINO_ANNOTATE(
+    "Amino::Enum") /*@endcond*/ ModelKind : int {
+    None,
+    Assembly,
+    Component,
+    Group,
+    SubComponent
+};
+
+/// \section InstanceablePrim
+///
+/// An enum to specify if a prim is instanceable. None means the instanceable
+/// metadata is not authored.
+enum /*@cond true*/ class AMINO_ANNOTATE(
+    "Amino::Enum") /*@endcond*/ InstanceablePrim : int {
+    None,
+    False,
+    True
+};
+
+/// \section ActivatePrim
+///
+/// An enum to specify if a prim is active. None means the active metadata is
+/// not authored.
+enum /*@cond true*/ class AMINO_ANNOTATE(
+    "Amino::Enum") /*@endcond*/ ActivatePrim : int {
+    None,
+    False,
+    True
+};
+
 } // namespace BifrostUsd
 
 #endif // USD_ENUM_H_
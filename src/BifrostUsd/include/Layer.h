@@ -23,6 +23,7 @@
 #define VALUE_SEMANTIC_USD_LAYER_H
 
 #include <Amino/Core/Array.h>
+#include <Amino/Core/BuiltInTypes.h>
 #include <Amino/Core/String.h>
 #include <Amino/Cpp/Annotate.h>
 #include <Amino/Cpp/ClassDeclare.h>
@@ -164,9 +165,50 @@ public:
         return (!isValid() || m_subLayers.empty()) ? -1 :
             static_cast<int>(m_subLayers.size()) - 1; }
 
-    bool exportToFile(const Amino::String& filePath     = "",
-                      bool                 relativePath = false) const;
+    /// This function saves this layer and its sublayers to disk.
+    ///
+    /// Sublayers are exported concurrently, each one to its own file path.
+    /// A layer is not written again if it was not modified since it was last
+    /// written to the same file by this function, unless the file was
+    /// modified or removed on disk since.
+    ///
+    /// \param [in] filePath The file path of this layer. If empty, the file
+    ///     path set on this layer is used.
+    /// \param [in] relativePath If true, the sublayer paths written in this
+    ///     layer are made relative to its file path.
+    /// \param [out] writtenFilePaths If not null, the file paths of the layers
+    ///     that were actually written are appended to this array.
+    /// \returns true if the layer and its editable sublayers with a file path
+    ///     are up to date on disk; false if it has no file path, if it is
+    ///     not editable or if writing it or one of these sublayers failed.
+    bool exportToFile(const Amino::String&         filePath         = "",
+                      bool                         relativePath     = false,
+                      Amino::Array<Amino::String>* writtenFilePaths = nullptr) const;
     Amino::String exportToString(bool exportSubLayers = true) const;
+    /// Export this layer in the binary usdc format.
+    ///
+    /// \param [in] exportSubLayers If true, the sublayer paths written in the
+    ///     exported layer are the file paths of the sublayers.
+    /// \returns The content of the usdc file, empty if writing it failed.
+    Amino::Array<Amino::uchar_t> exportToBinary(
+        bool exportSubLayers = true) const;
+
+    /// Write the content of the given layer in the binary usdc format.
+    ///
+    /// \param [in] layer The layer to write.
+    /// \returns The content of the usdc file, empty if writing it failed.
+    static Amino::Array<Amino::uchar_t> toBinary(
+        const PXR_NS::SdfLayerHandle& layer);
+
+    /// Read a layer from the content of a file in the binary usdc format.
+    ///
+    /// \param [in] bytes The content of the usdc file, as returned by
+    ///     \ref toBinary.
+    /// \param [in] tag The tag of the new layer.
+    /// \returns A new editable layer with the content of the usdc file;
+    ///     an invalid layer if reading it failed.
+    static Layer fromBinary(const Amino::Array<Amino::uchar_t>& bytes,
+                            const Amino::String&                tag = "");
 
     /// This helper method converts its input string into a valid tag.
     /// A valid tag is a filename with a non-empty stem and a valid USD file
@@ -191,6 +233,9 @@ public:
     ///     "dir/abc.usda"      "abc.usda"          Directory is discarded
     ///     "../dir/abc.usdc"   "abc.usdc"          Directory is discarded
     ///
+    /// The default extension is ".usdc" instead of ".usd" when the
+    /// BIFROST_USD_BINARY_INTERMEDIATE_LAYERS environment variable is set.
+    ///
     /// \param [in] tag The input tag string
     /// \returns A valid tag, with a non-empty stem and a valid extension.
     static Amino::String getTagWithValidUsdFileFormat(const Amino::String& tag = "");
@@ -221,6 +266,10 @@ public:
 private:
     friend Stage;
 
+    /// Copy this layer in a new anonymous layer, replacing the sublayer paths
+    /// with the file paths of the sublayers if exportSubLayers is true.
+    PXR_NS::SdfLayerRefPtr exportToAnonymousLayer(bool exportSubLayers) const;
+
     /// The underlying anonymous sdf layer.
     PXR_NS::SdfLayerRefPtr m_layer;
 
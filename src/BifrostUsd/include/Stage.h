@@ -40,14 +40,19 @@ BIFUSD_WARNING_DISABLE_MSC(4244)
 BIFUSD_WARNING_DISABLE_MSC(4305)
 BIFUSD_WARNING_DISABLE_MSC(4800)
 
+#include <pxr/usd/usd/editTarget.h>
+#include <pxr/usd/usd/prim.h>
 #include <pxr/usd/usd/stage.h>
 #include <pxr/usd/usd/variantSets.h>
 
 BIFUSD_WARNING_POP
 
 #include "Layer.h"
+#include "StageDataCache.h"
 #include "VariantSelection.h"
 
+#include <memory>
+
 #endif // DISABLE_PXR_HEADERS
 
 namespace BifrostUsd {
@@ -206,10 +211,64 @@ public:
     VariantSelection const & variantSelection() const { return m_variantSelection; }
     VariantSelection & variantSelection() { return m_variantSelection; }
 
+    /// Get the EditTarget of the current variant selection.
+    ///
+    /// The variant selections of the stack are authored and the nested
+    /// variant EditTargets are composed only once. The result is cached until
+    /// the variant selection or the stage's EditTarget change, or the prim of
+    /// the variant selection is recomposed.
+    ///
+    ///     \return The EditTarget of the innermost variant of the selection, or
+    ///     an invalid EditTarget if the selection is empty or its prim does
+    ///     not exist.
+    PXR_NS::UsdEditTarget variantEditTarget();
+
     Amino::String lastModifiedVariantSet() const;
     Amino::String lastModifiedVariant() const;
 
-    bool save(const Amino::String& filePath = "") const;
+    /// Save the root layer and its sublayers to disk.
+    ///
+    /// Layers that were not modified since they were last written to the
+    /// same files are not written again (see \ref Layer::exportToFile).
+    ///
+    /// \param [in] filePath The file path of the root layer. If empty, the
+    ///     file path set on the root layer is used.
+    /// \param [out] writtenFilePaths If not null, the file paths of the layers
+    ///     that were actually written are appended to this array.
+    /// \return true if all layers are up to date on disk.
+    bool save(const Amino::String&         filePath         = "",
+              Amino::Array<Amino::String>* writtenFilePaths = nullptr) const;
+
+    /// Write the composed stage, flattened into a single layer, to disk.
+    ///
+    /// The file is not written again if none of the layers used by the stage
+    /// was modified since the stage was last exported to the same file.
+    ///
+    /// \param [in] filePath The file path of the flattened layer.
+    /// \param [out] writtenFilePaths If not null, the file path is appended to
+    ///     this array if the file was actually written.
+    /// \return true if the file is up to date on disk.
+    bool exportToFile(const Amino::String&         filePath,
+                      Amino::Array<Amino::String>* writtenFilePaths = nullptr) const;
+
+    /// Get a fingerprint of the composed content of the stage.
+    ///
+    /// The fingerprint combines the change generations of all the layers used
+    /// by the stage with its population mask and load rules. The same
+    /// fingerprint returned by two calls means that the composed stage was
+    /// not modified in between.
+    ///
+    /// \return The fingerprint, or 0 if the stage is invalid.
+    size_t contentFingerprint() const;
+
+    /// Get the data computed from the UsdStage and kept until it is modified
+    /// (see \ref StageDataCache).
+    ///
+    /// The data is not copied with the Stage, since the copy has its own
+    /// UsdStage, and is dropped with the Stage.
+    ///
+    /// \return The data cache of the UsdStage.
+    StageDataCache& dataCache() const;
 
     Amino::String filePath() const {
         return static_cast<Amino::String>(
@@ -224,6 +283,17 @@ private:
     PXR_NS::UsdStageRefPtr m_stage;
     int                 m_editLayerIndex{-1};
     VariantSelection m_variantSelection;
+
+    struct VariantEditTargetCache {
+        VariantSelection      selection;
+        PXR_NS::UsdPrim       prim;
+        PXR_NS::UsdEditTarget stageEditTarget;
+        PXR_NS::UsdEditTarget editTarget;
+    };
+    VariantEditTargetCache m_variantEditTarget;
+
+    /// Created on first use, see dataCache().
+    mutable std::shared_ptr<StageDataCache> m_dataCache;
 #endif // DISABLE_PXR_HEADERS
 };
 } // namespace BifrostUsd
@@ -24,9 +24,13 @@
 
 #include "BifrostUsdExport.h"
 
+#include <Amino/Core/Array.h>
 #include <Amino/Core/String.h>
 #include <Amino/Core/Ptr.h>
 
+#include <cstdint>
+#include <vector>
+
 // Forward
 namespace BifrostUsd{
 class Stage;
@@ -34,6 +38,17 @@ class Stage;
 
 namespace BifrostUsd {
 
+/// \brief Description of a stage in the USD stage cache.
+struct USD_DECL StageCacheEntry {
+    /// The id of the stage in the cache.
+    int64_t id = -1;
+    /// The identifier of the root layer of the stage.
+    Amino::String rootLayer;
+    /// An estimate of the memory used by the stage, in bytes.
+    /// Layers shared by several stages are counted for each of them.
+    uint64_t estimatedBytes = 0;
+};
+
 /// \brief Wrap the USD stage cache.
 struct USD_DECL StageCache{
     /// \brief Add an empty stage in the cache.
@@ -55,6 +70,36 @@ struct USD_DECL StageCache{
     ///
     /// \return True if removed (erased) from the cache.
     static bool removeStageFromCache(int64_t id);
+
+    /// \brief Estimate the memory used by a stage in the cache.
+    /// \param [in] id Stage id.
+    ///
+    /// The estimate accounts for the specs and fields of the layers used by
+    /// the stage. The values of anonymous layers are measured; the values of
+    /// file-backed layers are not loaded, the size of their file is used
+    /// instead. It is computed on each call, so that it follows the edits
+    /// made to the stage after it was added to the cache.
+    ///
+    /// \return The estimated number of bytes, or 0 if the id is not in the
+    ///     cache.
+    static uint64_t estimateStageMemory(int64_t id);
+
+    /// \brief List the stages in the cache, ordered by id (oldest first).
+    ///
+    /// \return The entries of the cache, with their memory estimates.
+    static Amino::Array<StageCacheEntry> getCacheEntries();
+
+    /// \brief Remove stages from the cache until the estimated memory used
+    /// by the candidate stages fits within the given budget.
+    /// \param [in] maxBytes The memory budget, in bytes.
+    /// \param [in] candidateIds Ids of the stages that may be removed. Other
+    ///     stages in the cache are neither estimated nor removed.
+    ///
+    /// The oldest candidates are removed first.
+    ///
+    /// \return The ids of the stages removed from the cache.
+    static std::vector<int64_t> evictStages(
+        uint64_t maxBytes, const std::vector<int64_t>& candidateIds);
 };
 } // namespace BifrostUsd
 #endif /* VALUE_SEMANTIC_USD_STAGE_CACHE_H */
@@ -0,0 +1,106 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file StageDataCache.h
+///
+/// \brief Data computed from a UsdStage and kept with the Bifrost USD Stage
+/// that owns it.
+///
+
+#ifndef VALUE_SEMANTIC_USD_STAGE_DATA_CACHE_H
+#define VALUE_SEMANTIC_USD_STAGE_DATA_CACHE_H
+
+#include "BifrostUsdExport.h"
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+
+BIFUSD_WARNING_DISABLE_MSC(4003)
+BIFUSD_WARNING_DISABLE_MSC(4244)
+BIFUSD_WARNING_DISABLE_MSC(4305)
+BIFUSD_WARNING_DISABLE_MSC(4800)
+
+#include <pxr/base/tf/notice.h>
+#include <pxr/base/tf/weakBase.h>
+#include <pxr/usd/usd/notice.h>
+#include <pxr/usd/usd/stage.h>
+
+BIFUSD_WARNING_POP
+
+#include <memory>
+#include <mutex>
+#include <typeindex>
+#include <unordered_map>
+
+namespace BifrostUsd {
+
+/// \class StageDataCache StageDataCache.h
+/// \brief Keeps the data computed from a UsdStage (bounding boxes, prims
+/// looked up by path, query results...) until the UsdStage is modified.
+///
+/// A StageDataCache is owned by the \ref BifrostUsd::Stage of the UsdStage, so
+/// the data is dropped with the Stage. It only listens to the
+/// UsdNotice::ObjectsChanged notices sent by its own UsdStage.
+///
+/// Each kind of data is identified by its type, which must be default
+/// constructible and do its own locking. A kind of data is dropped when the
+/// UsdStage sends a notice for which its invalidation function returns true.
+/// Users holding the data while it is dropped keep a valid object, which is
+/// no longer reachable from the cache.
+class USD_DECL StageDataCache : public PXR_NS::TfWeakBase {
+public:
+    /// \brief Returns true if the data must be dropped after the given
+    /// change of the stage.
+    using InvalidatedBy = bool (*)(const PXR_NS::UsdNotice::ObjectsChanged&);
+
+    explicit StageDataCache(const PXR_NS::UsdStageRefPtr& stage);
+    ~StageDataCache();
+
+    StageDataCache(const StageDataCache&)            = delete;
+    StageDataCache& operator=(const StageDataCache&) = delete;
+
+    /// \brief Returns the data of the given type, creating it if the stage
+    /// was modified since it was last created.
+    /// \param [in] invalidatedBy The changes of the stage that drop the data.
+    ///     If null, any change drops it.
+    template <typename T>
+    std::shared_ptr<T> get(InvalidatedBy invalidatedBy = nullptr) {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        auto& slot = m_slots[std::type_index(typeid(T))];
+        if (!slot.data) {
+            slot.data          = std::make_shared<T>();
+            slot.invalidatedBy = invalidatedBy;
+        }
+        return std::static_pointer_cast<T>(slot.data);
+    }
+
+private:
+    void onObjectsChanged(const PXR_NS::UsdNotice::ObjectsChanged& notice);
+
+    struct Slot {
+        std::shared_ptr<void> data;
+        InvalidatedBy         invalidatedBy = nullptr;
+    };
+
+    std::mutex                                m_mutex;
+    std::unordered_map<std::type_index, Slot> m_slots;
+    PXR_NS::TfNotice::Key                     m_noticeKey;
+};
+
+} // namespace BifrostUsd
+
+#endif /* VALUE_SEMANTIC_USD_STAGE_DATA_CACHE_H */
@@ -94,19 +94,17 @@ decltype(auto) SetVariantSelection(PXR_NS::UsdPrim const& prim,
 
 /// Set the current stage variants selection and call a lambda func
 /// that can modify the BifrostUSD::Stage.
+/// The EditTarget of the variant selection is cached by the stage (see
+/// \ref Stage::variantEditTarget), so authoring in nested variants costs the
+/// same as authoring out of any variant.
 template <typename Func>
 decltype(auto) WithVariantContext(BifrostUsd::Stage& stage, Func&& func) {
-    const auto& variantSelection = stage.variantSelection();
-    auto        prim             = PXR_NS::UsdPrim();
-    if (!variantSelection.empty()) {
-        auto variantSetPrimPath =
-            PXR_NS::SdfPath(variantSelection.primPath().c_str());
-        prim = stage->GetPrimAtPath(variantSetPrimPath);
+    auto editTarget = stage.variantEditTarget();
+    if (!editTarget.IsValid()) {
+        return func();
     }
-
-    const auto& stack = variantSelection.stack();
-    return SetVariantSelection(prim, make_span_n(stack.data(), stack.size()),
-                               func);
+    PXR_NS::UsdEditContext ctx(stage.getStagePtr(), editTarget);
+    return func();
 }
 
 } // namespace BifrostUsd
@@ -18,13 +18,19 @@
 #include <BifrostUsd/VariantContext.h>
 
 #include <Amino/Core/String.h>
+#include <pxr/base/work/loops.h>
+#include <pxr/usd/sdf/changeBlock.h>
 #include <pxr/usd/sdf/copyUtils.h>
 #include <pxr/usd/usd/editContext.h>
 #include <pxr/usd/usdGeom/primvarsAPI.h>
 
+#include <algorithm>
+#include <atomic>
 #include <cstdint>
+#include <vector>
 
 #include "return_guard.h"
+#include "usd_sdf_authoring.h"
 #include "usd_type_converter.h"
 #include "usd_utils.h"
 
@@ -189,12 +195,37 @@ bool USD::Attribute::create_primvar(
             auto pxr_prim = get_prim_at_path(prim_path, stage);
             if (!pxr_prim) return false;
 
-            auto primvar_api = PXR_NS::UsdGeomPrimvarsAPI(pxr_prim);
-            PXR_NS::UsdGeomPrimvar primvar = primvar_api.CreatePrimvar(
-                PXR_NS::TfToken(name.c_str()), GetSdfValueTypeName(type_name),
-                GetUsdGeomPrimvarInterpolation(interpolation), element_size);
-
-            if (primvar) success = true;
+            // Like UsdGeomPrimvarsAPI::CreatePrimvar, the name is namespaced
+            // unless it already is.
+            static const std::string primvarsPrefix = "primvars:";
+            std::string primvarName = name.c_str();
+            if (primvarName.compare(0, primvarsPrefix.size(),
+                                    primvarsPrefix) != 0) {
+                primvarName = primvarsPrefix + primvarName;
+            }
+            AttributeDeclaration declaration{pxr_prim.GetPath(),
+                                             PXR_NS::TfToken(primvarName),
+                                             GetSdfValueTypeName(type_name)};
+            if (!PXR_NS::UsdGeomPrimvar::IsValidPrimvarName(declaration.name)) {
+                return false;
+            }
+            auto const pxr_interpolation =
+                GetUsdGeomPrimvarInterpolation(interpolation);
+
+            // The primvar attribute and its metadata are authored at once
+            PXR_NS::SdfChangeBlock changeBlock;
+            auto attr_spec =
+                create_attribute_spec(stage.getStagePtr(), declaration);
+            if (!attr_spec) return false;
+            if (!pxr_interpolation.IsEmpty()) {
+                attr_spec->SetInfo(PXR_NS::UsdGeomTokens->interpolation,
+                                   PXR_NS::VtValue(pxr_interpolation));
+            }
+            if (element_size > 0) {
+                attr_spec->SetInfo(PXR_NS::UsdGeomTokens->elementSize,
+                                   PXR_NS::VtValue(element_size));
+            }
+            success = true;
             return success;
         });
     } catch (std::exception& e) {
@@ -242,46 +273,46 @@ bool USD::Attribute::get_prim_attribute_type(
 
 namespace {
 template <typename DESTTYPE>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         DESTTYPE&                    value) {
     PxrType_t<DESTTYPE> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     value        = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Amino::String&               value) {
     value          = Amino::String(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Asset) {
         PXR_NS::SdfAssetPath result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) value = result.GetAssetPath().c_str();
         return success;
     } else if (type_name == PXR_NS::SdfValueTypeNames->Token) {
         PXR_NS::TfToken result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) value = result.GetText();
         return success;
     }
     PxrType_t<Amino::String> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Amino::Array<Amino::String>& value) {
     value          = Amino::Array<Amino::String>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     // get as asset array, token array or regular string array
     if (type_name == PXR_NS::SdfValueTypeNames->AssetArray) {
         PXR_NS::VtArray<PXR_NS::SdfAssetPath> result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Amino::String>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -292,7 +323,7 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
         return success;
     } else if (type_name == PXR_NS::SdfValueTypeNames->TokenArray) {
         PXR_NS::VtTokenArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Amino::String>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -304,37 +335,37 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Amino::Array<Amino::String>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         float&                       value) {
     value          = float(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Half) {
         PXR_NS::GfHalf result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) value = result;
         return success;
     }
 
     PxrType_t<float> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Amino::Array<float>&         value) {
     value          = Amino::Array<float>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->HalfArray) {
         PXR_NS::VtHalfArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<float>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) out[i] = result[i];
@@ -344,19 +375,19 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Amino::Array<float>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Bifrost::Math::float2&       value) {
     value          = Bifrost::Math::float2(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Half2) {
         PXR_NS::GfVec2h result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             value.x = result[0];
             value.y = result[1];
@@ -365,19 +396,19 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Bifrost::Math::float2> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&          attribute,
                         const float                          frame,
                         Amino::Array<Bifrost::Math::float2>& value) {
     value          = Amino::Array<Bifrost::Math::float2>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Half2Array) {
         PXR_NS::VtVec2hArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::float2>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -391,19 +422,19 @@ bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
     }
 
     PxrType_t<Amino::Array<Bifrost::Math::float2>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Bifrost::Math::float3&       value) {
     value          = Bifrost::Math::float3(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Half3) {
         PXR_NS::GfVec3h result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             value.x = result[0];
             value.y = result[1];
@@ -413,19 +444,19 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Bifrost::Math::float3> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&          attribute,
                         const float                          frame,
                         Amino::Array<Bifrost::Math::float3>& value) {
     value          = Amino::Array<Bifrost::Math::float3>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Half3Array) {
         PXR_NS::VtVec3hArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::float3>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -440,19 +471,19 @@ bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
     }
 
     PxrType_t<Amino::Array<Bifrost::Math::float3>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Bifrost::Math::float4&       value) {
     value          = Bifrost::Math::float4(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Quatf) {
         PXR_NS::GfQuatf result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto const& imaginary = result.GetImaginary();
             value.w               = result.GetReal();
@@ -464,7 +495,7 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
 
     } else if (type_name == PXR_NS::SdfValueTypeNames->Quath) {
         PXR_NS::GfQuath result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto const& imaginary = result.GetImaginary();
             value.w               = result.GetReal();
@@ -475,7 +506,7 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
         return success;
     } else if (type_name == PXR_NS::SdfValueTypeNames->Half4) {
         PXR_NS::GfVec4h result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             value.x = result[0];
             value.y = result[1];
@@ -486,19 +517,19 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Bifrost::Math::float4> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&          attribute,
                         const float                          frame,
                         Amino::Array<Bifrost::Math::float4>& value) {
     value          = Amino::Array<Bifrost::Math::float4>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->QuatfArray) {
         PXR_NS::VtQuatfArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::float4>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -514,7 +545,7 @@ bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
         return success;
     } else if (type_name == PXR_NS::SdfValueTypeNames->QuathArray) {
         PXR_NS::VtQuathArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::float4>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -530,7 +561,7 @@ bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
         return success;
     } else if (type_name == PXR_NS::SdfValueTypeNames->Half4Array) {
         PXR_NS::VtVec4hArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::float4>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -546,19 +577,19 @@ bool get_attribute_data(const BifrostUsd::Attribute&         attribute,
     }
 
     PxrType_t<Amino::Array<Bifrost::Math::float4>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute& attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&  attribute,
                         const float                  frame,
                         Bifrost::Math::double4&      value) {
     value          = Bifrost::Math::double4(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->Quatd) {
         PXR_NS::GfQuatd result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto const& imaginary = result.GetImaginary();
             value.w               = result.GetReal();
@@ -570,19 +601,19 @@ bool get_attribute_data(const BifrostUsd::Attribute& attribute,
     }
 
     PxrType_t<Bifrost::Math::double4> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
 template <>
-bool get_attribute_data(const BifrostUsd::Attribute&          attribute,
+bool get_attribute_data(const PXR_NS::UsdAttribute&           attribute,
                         const float                           frame,
                         Amino::Array<Bifrost::Math::double4>& value) {
     value          = Amino::Array<Bifrost::Math::double4>(); // set default
-    auto type_name = attribute->GetTypeName();
+    auto type_name = attribute.GetTypeName();
     if (type_name == PXR_NS::SdfValueTypeNames->QuatdArray) {
         PXR_NS::VtQuatdArray result;
-        bool success = attribute->Get(&result, static_cast<double>(frame));
+        bool success = attribute.Get(&result, static_cast<double>(frame));
         if (success) {
             auto out = Amino::Array<Bifrost::Math::double4>(result.size());
             for (unsigned i = 0; i < result.size(); ++i) {
@@ -599,7 +630,7 @@ bool get_attribute_data(const BifrostUsd::Attribute&          attribute,
     }
 
     PxrType_t<Amino::Array<Bifrost::Math::double4>> result;
-    bool success = attribute->Get(&result, static_cast<double>(frame));
+    bool success = attribute.Get(&result, static_cast<double>(frame));
     if (success) value = fromPxr(result);
     return success;
 }
@@ -609,12 +640,115 @@ bool get_prim_attribute_data_impl(const BifrostUsd::Attribute& attribute,
                                   DESTTYPE&                    value) {
     if (!attribute) return false;
     try {
-        return get_attribute_data(attribute, frame, value);
+        return get_attribute_data(attribute.getPxrAttribute(), frame, value);
     } catch (std::exception& e) {
         log_exception("get_prim_attribute_data", e);
     }
     return false;
 }
+
+/// Returns the named attribute of each prim, or an invalid attribute if the
+/// prim or the attribute does not exist.
+std::vector<PXR_NS::UsdAttribute> get_prims_attributes(
+    const BifrostUsd::Stage&           stage,
+    const Amino::Array<Amino::String>& prim_paths,
+    const Amino::String&               name) {
+    auto const attributeName = PXR_NS::TfToken(name.c_str());
+    std::vector<PXR_NS::UsdAttribute> attributes(prim_paths.size());
+    for (size_t i = 0; i < prim_paths.size(); ++i) {
+        auto pxr_prim = get_prim_at_path(prim_paths[i], stage);
+        if (pxr_prim) attributes[i] = pxr_prim.GetAttribute(attributeName);
+    }
+    return attributes;
+}
+
+template <typename TYPE>
+bool get_prims_attribute_data_impl(
+    const BifrostUsd::Stage&                        stage,
+    const Amino::Array<Amino::String>&              prim_paths,
+    const Amino::String&                            name,
+    const TYPE&                                     default_value,
+    const float                                     frame,
+    Amino::MutablePtr<Amino::Array<TYPE>>&          values,
+    Amino::MutablePtr<Amino::Array<Amino::bool_t>>& found) {
+    values = Amino::newMutablePtr<Amino::Array<TYPE>>(prim_paths.size(),
+                                                      default_value);
+    found  = Amino::newMutablePtr<Amino::Array<Amino::bool_t>>(
+        prim_paths.size(), false);
+    if (!stage) return false;
+
+    try {
+        auto const attributes = get_prims_attributes(stage, prim_paths, name);
+        // Attribute value resolution only reads the composed stage
+        std::vector<char> read(attributes.size(), 0);
+        PXR_NS::WorkParallelForN(
+            attributes.size(), [&](size_t begin, size_t end) {
+                for (size_t i = begin; i < end; ++i) {
+                    if (!attributes[i]) continue;
+                    TYPE value;
+                    if (get_attribute_data(attributes[i], frame, value)) {
+                        (*values)[i] = std::move(value);
+                        read[i]      = 1;
+                    }
+                }
+            });
+        bool success = true;
+        for (size_t i = 0; i < read.size(); ++i) {
+            (*found)[i] = read[i] != 0;
+            success     = success && (*found)[i];
+        }
+        return success;
+    } catch (std::exception& e) {
+        log_exception("get_prims_attribute_data", e);
+    }
+    return false;
+}
+
+template <typename TYPE>
+bool get_prims_attribute_data_impl(
+    const BifrostUsd::Stage&                         stage,
+    const Amino::Array<Amino::String>&               prim_paths,
+    const Amino::String&                             name,
+    const float                                      frame,
+    Amino::MutablePtr<Amino::Array<TYPE>>&           values,
+    Amino::MutablePtr<Amino::Array<Amino::ulong_t>>& offsets) {
+    values  = Amino::newMutablePtr<Amino::Array<TYPE>>();
+    offsets = Amino::newMutablePtr<Amino::Array<Amino::ulong_t>>(
+        prim_paths.size() + 1, 0);
+    if (!stage) return false;
+
+    try {
+        auto const attributes = get_prims_attributes(stage, prim_paths, name);
+
+        // Read the arrays in parallel, then concatenate them
+        std::vector<Amino::Array<TYPE>> arrays(attributes.size());
+        std::atomic<bool>               success(true);
+        PXR_NS::WorkParallelForN(
+            attributes.size(), [&](size_t begin, size_t end) {
+                for (size_t i = begin; i < end; ++i) {
+                    if (!attributes[i] ||
+                        !get_attribute_data(attributes[i], frame, arrays[i])) {
+                        success = false;
+                    }
+                }
+            });
+
+        for (size_t i = 0; i < arrays.size(); ++i) {
+            (*offsets)[i + 1] = (*offsets)[i] + arrays[i].size();
+        }
+        values->resize((*offsets)[arrays.size()]);
+        PXR_NS::WorkParallelForN(arrays.size(), [&](size_t begin, size_t end) {
+            for (size_t i = begin; i < end; ++i) {
+                std::move(arrays[i].begin(), arrays[i].end(),
+                          values->begin() + (*offsets)[i]);
+            }
+        });
+        return success;
+    } catch (std::exception& e) {
+        log_exception("get_prims_attribute_data", e);
+    }
+    return false;
+}
 } // namespace
 
 #define IMPLEMENT_GET_PRIM_ATTRIBUTE_DATA(TYPE)                          \
@@ -646,30 +780,27 @@ FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(IMPLEMENT_GET_PRIM_ATTRIBUTE_DATA)
 #undef IMPLEMENT_GET_PRIM_ATTRIBUTE_DATA
 
 namespace {
+/// Converts a value to the USD type of an attribute. Returns an empty value
+/// if the value can't be converted to that type.
 template <typename TYPE>
-bool set_attribute(PXR_NS::UsdAttribute& pxr_attribute,
-                   const TYPE&           value,
-                   PXR_NS::UsdTimeCode   time) {
-    return pxr_attribute.Set(toPxr(value), time);
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName&,
+                                   const TYPE& value) {
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute& pxr_attribute,
-                   const Amino::String&  value,
-                   PXR_NS::UsdTimeCode   time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Amino::String&            value) {
     // set as asset, token or regular string
     if (type_name == PXR_NS::SdfValueTypeNames->Asset) {
-        return pxr_attribute.Set(PXR_NS::SdfAssetPath(value.c_str()), time);
+        return PXR_NS::VtValue(PXR_NS::SdfAssetPath(value.c_str()));
     } else if (type_name == PXR_NS::SdfValueTypeNames->Token) {
-        return pxr_attribute.Set(PXR_NS::TfToken(value.c_str()), time);
+        return PXR_NS::VtValue(PXR_NS::TfToken(value.c_str()));
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&              pxr_attribute,
-                   const Amino::Array<Amino::String>& value,
-                   PXR_NS::UsdTimeCode                time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName&    type_name,
+                                   const Amino::Array<Amino::String>& value) {
     // set as asset array, token array or regular string array
     if (type_name == PXR_NS::SdfValueTypeNames->AssetArray) {
         // Create the new attribute
@@ -677,60 +808,53 @@ bool set_attribute(PXR_NS::UsdAttribute&              pxr_attribute,
         for (size_t i = 0; i < value.size(); i++) {
             pxr_array[i] = PXR_NS::SdfAssetPath(value[i].c_str());
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     } else if (type_name == PXR_NS::SdfValueTypeNames->TokenArray) {
         // Create the new attribute
         PXR_NS::VtTokenArray pxr_array(value.size());
         for (size_t i = 0; i < value.size(); i++) {
             pxr_array[i] = PXR_NS::TfToken(value[i].c_str());
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute& pxr_attribute,
-                   const float&          value,
-                   PXR_NS::UsdTimeCode   time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const float&                    value) {
     // Set as half or other float types
     if (type_name == PXR_NS::SdfValueTypeNames->Half) {
         auto pxr_value = PXR_NS::GfHalf(value);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&      pxr_attribute,
-                   const Amino::Array<float>& value,
-                   PXR_NS::UsdTimeCode        time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Amino::Array<float>&      value) {
     // Set as HalfArray or regular floatArray
     if (type_name == PXR_NS::SdfValueTypeNames->HalfArray) {
         PXR_NS::VtHalfArray pxr_array(value.size());
         for (unsigned i = 0; i < value.size(); ++i) {
             pxr_array[i] = PXR_NS::GfHalf(value[i]);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&        pxr_attribute,
-                   const Bifrost::Math::float2& value,
-                   PXR_NS::UsdTimeCode          time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Bifrost::Math::float2&    value) {
     if (type_name == PXR_NS::SdfValueTypeNames->Half2) {
         auto pxr_value = PXR_NS::GfVec2h(value.x, value.y);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
-                   const Amino::Array<Bifrost::Math::float2>& value,
-                   PXR_NS::UsdTimeCode                        time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(
+    const PXR_NS::SdfValueTypeName&            type_name,
+    const Amino::Array<Bifrost::Math::float2>& value) {
     // Set as half2 or other float2 array based types
     if (type_name == PXR_NS::SdfValueTypeNames->Half2Array) {
         PXR_NS::VtVec2hArray pxr_array(value.size());
@@ -738,27 +862,24 @@ bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfVec2h(src.x, src.y);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&        pxr_attribute,
-                   const Bifrost::Math::float3& value,
-                   PXR_NS::UsdTimeCode          time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Bifrost::Math::float3&    value) {
     // Set as half3 or other float3 based types
     if (type_name == PXR_NS::SdfValueTypeNames->Half3) {
         auto pxr_value = PXR_NS::GfVec3h(value.x, value.y, value.z);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
-                   const Amino::Array<Bifrost::Math::float3>& value,
-                   PXR_NS::UsdTimeCode                        time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(
+    const PXR_NS::SdfValueTypeName&            type_name,
+    const Amino::Array<Bifrost::Math::float3>& value) {
     // Set as half3Array or other float3 array based types
     if (type_name == PXR_NS::SdfValueTypeNames->Half3Array) {
         PXR_NS::VtVec3hArray pxr_array(value.size());
@@ -766,33 +887,30 @@ bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfVec3h(src.x, src.y, src.z);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&        pxr_attribute,
-                   const Bifrost::Math::float4& value,
-                   PXR_NS::UsdTimeCode          time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Bifrost::Math::float4&    value) {
     // set as quaternion or regular vec4 array
     if (type_name == PXR_NS::SdfValueTypeNames->Quatf) {
         auto pxr_value = PXR_NS::GfQuatf(value.w, value.x, value.y, value.z);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     } else if (type_name == PXR_NS::SdfValueTypeNames->Quath) {
         auto pxr_value = PXR_NS::GfQuath(value.w, value.x, value.y, value.z);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     } else if (type_name == PXR_NS::SdfValueTypeNames->Half4) {
         auto pxr_value = PXR_NS::GfVec4h(value.x, value.y, value.z, value.w);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
-                   const Amino::Array<Bifrost::Math::float4>& value,
-                   PXR_NS::UsdTimeCode                        time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(
+    const PXR_NS::SdfValueTypeName&            type_name,
+    const Amino::Array<Bifrost::Math::float4>& value) {
     // set as quaternion or regular vec4 array
     if (type_name == PXR_NS::SdfValueTypeNames->QuatfArray) {
         PXR_NS::VtQuatfArray pxr_array(value.size());
@@ -800,43 +918,40 @@ bool set_attribute(PXR_NS::UsdAttribute&                      pxr_attribute,
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfQuatf(src.w, src.x, src.y, src.z);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     } else if (type_name == PXR_NS::SdfValueTypeNames->QuathArray) {
         PXR_NS::VtQuathArray pxr_array(value.size());
         for (unsigned i = 0; i < value.size(); ++i) {
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfQuath(src.w, src.x, src.y, src.z);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     } else if (type_name == PXR_NS::SdfValueTypeNames->Half4Array) {
         PXR_NS::VtVec4hArray pxr_array(value.size());
         for (unsigned i = 0; i < value.size(); ++i) {
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfVec4h(src.x, src.y, src.z, src.w);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     } else if (type_name == PXR_NS::SdfValueTypeNames->Float4Array) {
-        return pxr_attribute.Set(toPxr(value), time);
+        return PXR_NS::VtValue(toPxr(value));
     }
-    return false;
+    return PXR_NS::VtValue();
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&         pxr_attribute,
-                   const Bifrost::Math::double4& value,
-                   PXR_NS::UsdTimeCode           time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(const PXR_NS::SdfValueTypeName& type_name,
+                                   const Bifrost::Math::double4&   value) {
     // set as quaternion or regular vec4 array
     if (type_name == PXR_NS::SdfValueTypeNames->Quatd) {
         auto pxr_value = PXR_NS::GfQuatd(value.w, value.x, value.y, value.z);
-        return pxr_attribute.Set(pxr_value, time);
+        return PXR_NS::VtValue(pxr_value);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
 }
 template <>
-bool set_attribute(PXR_NS::UsdAttribute&                       pxr_attribute,
-                   const Amino::Array<Bifrost::Math::double4>& value,
-                   PXR_NS::UsdTimeCode                         time) {
-    auto type_name = pxr_attribute.GetTypeName();
+PXR_NS::VtValue to_attribute_value(
+    const PXR_NS::SdfValueTypeName&             type_name,
+    const Amino::Array<Bifrost::Math::double4>& value) {
     // set as quaternion or regular vec4 array
     if (type_name == PXR_NS::SdfValueTypeNames->QuatdArray) {
         PXR_NS::VtQuatdArray pxr_array(value.size());
@@ -844,9 +959,17 @@ bool set_attribute(PXR_NS::UsdAttribute&                       pxr_attribute,
             auto const& src = value[i];
             pxr_array[i]    = PXR_NS::GfQuatd(src.w, src.x, src.y, src.z);
         }
-        return pxr_attribute.Set(pxr_array, time);
+        return PXR_NS::VtValue(pxr_array);
     }
-    return pxr_attribute.Set(toPxr(value), time);
+    return PXR_NS::VtValue(toPxr(value));
+}
+template <typename TYPE>
+bool set_attribute(PXR_NS::UsdAttribute& pxr_attribute,
+                   const TYPE&           value,
+                   PXR_NS::UsdTimeCode   time) {
+    auto const pxr_value =
+        to_attribute_value(pxr_attribute.GetTypeName(), value);
+    return !pxr_value.IsEmpty() && pxr_attribute.Set(pxr_value, time);
 }
 template <typename TYPE>
 bool set_prim_attribute_impl(const Amino::String& prim_path,
@@ -873,6 +996,204 @@ bool set_prim_attribute_impl(const Amino::String& prim_path,
     }
     return false;
 }
+
+/// Sets the sample of an attribute spec, converting the value to the USD type
+/// of the attribute.
+template <typename TYPE>
+bool set_attribute_sample(const PXR_NS::UsdEditTarget&          edit_target,
+                          const PXR_NS::SdfAttributeSpecHandle& attr_spec,
+                          const PXR_NS::SdfValueTypeName&       type_name,
+                          const TYPE&                           value,
+                          PXR_NS::UsdTimeCode                   time) {
+    auto const pxr_value = to_attribute_value(type_name, value);
+    return !pxr_value.IsEmpty() &&
+           set_attribute_spec_value(edit_target, attr_spec, pxr_value, time);
+}
+
+/// Whether an array sample can be authored as is, without converting its
+/// elements to another USD type (half, quaternion, token, asset...).
+template <typename TYPE>
+bool is_array_sample_shareable(const PXR_NS::SdfValueTypeName& type_name) {
+    return type_name.GetType() ==
+           PXR_NS::TfType::Find<PxrType_t<Amino::Array<TYPE>>>();
+}
+template <>
+bool is_array_sample_shareable<Bifrost::Math::float4>(
+    const PXR_NS::SdfValueTypeName& type_name) {
+    // Other roles of float4 arrays are rejected by set_attribute
+    return type_name == PXR_NS::SdfValueTypeNames->Float4Array;
+}
+
+template <typename TYPE>
+bool set_attribute_sample(const PXR_NS::UsdEditTarget&          edit_target,
+                          const PXR_NS::SdfAttributeSpecHandle& attr_spec,
+                          const PXR_NS::SdfValueTypeName&       type_name,
+                          const Amino::Ptr<Amino::Array<TYPE>>& value,
+                          PXR_NS::UsdTimeCode                   time) {
+    if (value && is_array_sample_shareable<TYPE>(type_name)) {
+        // The layer keeps a reference to the Amino array instead of a copy
+        return set_attribute_spec_value(edit_target, attr_spec, toPxr(value),
+                                        time);
+    }
+    static const Amino::Array<TYPE> empty;
+    return set_attribute_sample(edit_target, attr_spec, type_name,
+                                value ? *value : empty, time);
+}
+
+template <typename TYPE>
+bool set_prim_attribute_samples_impl(const Amino::String&       prim_path,
+                                     const Amino::String&       name,
+                                     const Amino::Array<TYPE>&  values,
+                                     const Amino::Array<float>& frames,
+                                     BifrostUsd::Stage&         stage) {
+    if (!stage) return false;
+    try {
+        if (values.size() != frames.size()) {
+            throw std::runtime_error(
+                "values size must be equal to frames size");
+        }
+        return BifrostUsd::WithVariantContext(stage, [&]() {
+            auto pxr_prim = get_prim_at_path(prim_path, stage);
+            if (!pxr_prim) return false;
+            auto pxr_attribute =
+                pxr_prim.GetAttribute(PXR_NS::TfToken(name.c_str()));
+            if (!pxr_attribute) return false;
+
+            // The Usd API can't be used in the change block, the attribute
+            // is queried before it is opened.
+            auto const declaration = get_attribute_declaration(pxr_attribute);
+            auto const usdStage    = stage.getStagePtr();
+            auto const editTarget  = usdStage->GetEditTarget();
+
+            // Author all the samples at once: the layer sends a single
+            // change notification and the stage is only updated once.
+            PXR_NS::SdfChangeBlock changeBlock;
+            auto attr_spec = create_attribute_spec(usdStage, declaration);
+            if (!attr_spec) return false;
+            bool success = true;
+            for (size_t i = 0; i < values.size(); ++i) {
+                auto time = PXR_NS::UsdTimeCode(static_cast<double>(frames[i]));
+                success = set_attribute_sample(editTarget, attr_spec,
+                                               declaration.type_name, values[i],
+                                               time) &&
+                          success;
+            }
+            return success;
+        });
+    } catch (std::exception& e) {
+        log_exception("set_prim_attribute_samples", e);
+    }
+    return false;
+}
+
+/// Sets the named attribute of each prim. The value of the i-th prim is
+/// returned by get_value(i).
+template <typename GETVALUE>
+bool set_prims_attribute_impl(const Amino::Array<Amino::String>& prim_paths,
+                              const Amino::String&               name,
+                              GETVALUE&&                         get_value,
+                              const bool                         use_frame,
+                              const float                        frame,
+                              BifrostUsd::Stage&                 stage) {
+    return BifrostUsd::WithVariantContext(stage, [&]() {
+        auto attributes = get_prims_attributes(stage, prim_paths, name);
+        auto time       = use_frame
+                              ? PXR_NS::UsdTimeCode(static_cast<double>(frame))
+                              : PXR_NS::UsdTimeCode::Default();
+
+        // The Usd API can't be used in the change block, the attributes are
+        // queried before it is opened.
+        std::vector<AttributeDeclaration> declarations(attributes.size());
+        for (size_t i = 0; i < attributes.size(); ++i) {
+            if (attributes[i]) {
+                declarations[i] = get_attribute_declaration(attributes[i]);
+            }
+        }
+        auto const usdStage   = stage.getStagePtr();
+        auto const editTarget = usdStage->GetEditTarget();
+
+        // Author all the values at once: the layer sends a single change
+        // notification and the stage is only updated once.
+        PXR_NS::SdfChangeBlock changeBlock;
+        bool                   success = true;
+        for (size_t i = 0; i < attributes.size(); ++i) {
+            if (!attributes[i]) {
+                success = false;
+                continue;
+            }
+            auto const value =
+                to_attribute_value(declarations[i].type_name, get_value(i));
+            success = !value.IsEmpty() &&
+                      set_attribute_spec_value(
+                          editTarget,
+                          create_attribute_spec(usdStage, declarations[i]),
+                          value, time) &&
+                      success;
+        }
+        return success;
+    });
+}
+
+template <typename TYPE>
+bool set_prims_attribute_data_impl(
+    const Amino::Array<Amino::String>& prim_paths,
+    const Amino::String&               name,
+    const Amino::Array<TYPE>&          values,
+    const bool                         use_frame,
+    const float                        frame,
+    BifrostUsd::Stage&                 stage) {
+    if (!stage) return false;
+    try {
+        if (values.size() != 1 && values.size() != prim_paths.size()) {
+            throw std::runtime_error(
+                "values size must be 1 or equal to prim_paths size");
+        }
+        return set_prims_attribute_impl(
+            prim_paths, name,
+            [&values](size_t i) -> const TYPE& {
+                return values.size() == 1 ? values[0] : values[i];
+            },
+            use_frame, frame, stage);
+    } catch (std::exception& e) {
+        log_exception("set_prims_attribute_data", e);
+    }
+    return false;
+}
+
+template <typename TYPE>
+bool set_prims_attribute_arrays_impl(
+    const Amino::Array<Amino::String>&  prim_paths,
+    const Amino::String&                name,
+    const Amino::Array<TYPE>&           values,
+    const Amino::Array<Amino::ulong_t>& offsets,
+    const bool                          use_frame,
+    const float                         frame,
+    BifrostUsd::Stage&                  stage) {
+    if (!stage) return false;
+    try {
+        if (offsets.size() != prim_paths.size() + 1 ||
+            offsets[prim_paths.size()] > values.size() ||
+            !std::is_sorted(offsets.begin(), offsets.end())) {
+            throw std::runtime_error(
+                "offsets must be increasing, end with at most the values size "
+                "and have one more element than prim_paths");
+        }
+        Amino::Array<TYPE> array;
+        return set_prims_attribute_impl(
+            prim_paths, name,
+            [&](size_t i) -> const Amino::Array<TYPE>& {
+                array.resize(offsets[i + 1] - offsets[i]);
+                std::copy(values.begin() + offsets[i],
+                          values.begin() + offsets[i + 1], array.begin());
+                return array;
+            },
+            use_frame, frame, stage);
+    } catch (std::exception& e) {
+        log_exception("set_prims_attribute_arrays", e);
+    }
+    return false;
+}
+
 } // namespace
 
 /// \cond false
@@ -909,6 +1230,101 @@ FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(IMPLEMENT_SET_PRIM_ATTRIBUTE)
     }
 FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(IMPLEMENT_SET_PRIM_ATTRIBUTE)
 #undef IMPLEMENT_SET_PRIM_ATTRIBUTE
+
+#define IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES(TYPE)                         \
+    bool USD::Attribute::set_prim_attribute_samples(                       \
+        BifrostUsd::Stage& stage, const Amino::String& prim_path,          \
+        const Amino::String& name, const Amino::Array<TYPE>& values,       \
+        const Amino::Array<float>& frames) {                               \
+        return set_prim_attribute_samples_impl(prim_path, name, values,    \
+                                               frames, stage);             \
+    }
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES)
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES)
+#undef IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES
+
+#define IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES(TYPE)                      \
+    bool USD::Attribute::set_prim_attribute_samples(                    \
+        BifrostUsd::Stage& stage, const Amino::String& prim_path,       \
+        const Amino::String&                                name,       \
+        const Amino::Array<Amino::Ptr<Amino::Array<TYPE>>>& values,     \
+        const Amino::Array<float>&                          frames) {   \
+        return set_prim_attribute_samples_impl(prim_path, name, values, \
+                                               frames, stage);          \
+    }
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES)
+#undef IMPLEMENT_SET_PRIM_ATTRIBUTE_SAMPLES
+
+#define IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA(TYPE)                              \
+    bool USD::Attribute::get_prims_attribute_data(                            \
+        const BifrostUsd::Stage& stage,                                       \
+        const Amino::Array<Amino::String>& prim_paths,                        \
+        const Amino::String& name, TYPE default_and_type, const float frame,  \
+        Amino::MutablePtr<Amino::Array<TYPE>>&          values,               \
+        Amino::MutablePtr<Amino::Array<Amino::bool_t>>& found) {              \
+        return get_prims_attribute_data_impl(stage, prim_paths, name,         \
+                                             default_and_type, frame, values, \
+                                             found);                          \
+    }
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA)
+#undef IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA
+
+#define IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA(TYPE)                              \
+    bool USD::Attribute::get_prims_attribute_data(                            \
+        const BifrostUsd::Stage& stage,                                       \
+        const Amino::Array<Amino::String>& prim_paths,                        \
+        const Amino::String& name, const TYPE& default_and_type,              \
+        const float                                     frame,                \
+        Amino::MutablePtr<Amino::Array<TYPE>>&          values,               \
+        Amino::MutablePtr<Amino::Array<Amino::bool_t>>& found) {              \
+        return get_prims_attribute_data_impl(stage, prim_paths, name,         \
+                                             default_and_type, frame, values, \
+                                             found);                          \
+    }
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA)
+#undef IMPLEMENT_GET_PRIMS_ATTRIBUTE_DATA
+
+#define IMPLEMENT_GET_PRIMS_ATTRIBUTE_ARRAYS(TYPE)                            \
+    bool USD::Attribute::get_prims_attribute_arrays(                          \
+        const BifrostUsd::Stage& stage,                                       \
+        const Amino::Array<Amino::String>& prim_paths,                        \
+        const Amino::String& name, const Amino::Array<TYPE>&,                 \
+        const float                                      frame,               \
+        Amino::MutablePtr<Amino::Array<TYPE>>&           values,              \
+        Amino::MutablePtr<Amino::Array<Amino::ulong_t>>& offsets) {           \
+        return get_prims_attribute_data_impl(stage, prim_paths, name, frame,  \
+                                             values, offsets);                \
+    }
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(IMPLEMENT_GET_PRIMS_ATTRIBUTE_ARRAYS)
+#undef IMPLEMENT_GET_PRIMS_ATTRIBUTE_ARRAYS
+
+#define IMPLEMENT_SET_PRIMS_ATTRIBUTE_DATA(TYPE)                         \
+    bool USD::Attribute::set_prims_attribute_data(                       \
+        BifrostUsd::Stage&                 stage,                        \
+        const Amino::Array<Amino::String>& prim_paths,                   \
+        const Amino::String& name, const Amino::Array<TYPE>& values,     \
+        const bool use_frame, const float frame) {                       \
+        return set_prims_attribute_data_impl(prim_paths, name, values,   \
+                                             use_frame, frame, stage);   \
+    }
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(IMPLEMENT_SET_PRIMS_ATTRIBUTE_DATA)
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(IMPLEMENT_SET_PRIMS_ATTRIBUTE_DATA)
+#undef IMPLEMENT_SET_PRIMS_ATTRIBUTE_DATA
+
+#define IMPLEMENT_SET_PRIMS_ATTRIBUTE_ARRAYS(TYPE)                          \
+    bool USD::Attribute::set_prims_attribute_arrays(                        \
+        BifrostUsd::Stage&                  stage,                          \
+        const Amino::Array<Amino::String>&  prim_paths,                     \
+        const Amino::String&                name,                           \
+        const Amino::Array<TYPE>&           values,                         \
+        const Amino::Array<Amino::ulong_t>& offsets, const bool use_frame,  \
+        const float frame) {                                                \
+        return set_prims_attribute_arrays_impl(prim_paths, name, values,    \
+                                               offsets, use_frame, frame,   \
+                                               stage);                      \
+    }
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(IMPLEMENT_SET_PRIMS_ATTRIBUTE_ARRAYS)
+#undef IMPLEMENT_SET_PRIMS_ATTRIBUTE_ARRAYS
 /// \endcond
 
 bool USD::Attribute::add_attribute_connection(
@@ -214,6 +214,100 @@ FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(DECLARE_SET_PRIM_ATTRIBUTE_DATA)
 FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(DECLARE_SET_PRIM_ATTRIBUTE_DATA)
 #undef DECLARE_SET_PRIM_ATTRIBUTE_DATA
 
+#define DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES(TYPE)                          \
+    USD_NODEDEF_DECL bool set_prim_attribute_samples(                     \
+        BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),              \
+        const Amino::String& prim_path, const Amino::String& name,        \
+        const Amino::Array<TYPE>& values,                                 \
+        const Amino::Array<float>& frames)                                \
+        USDNODE_DOC_ICON_X("set_prim_attribute_samples",                  \
+                           "USD_Attribute_set_prim_attribute_samples.md", \
+                           "usd_set.svg", "outName=success");
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES)
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES)
+#undef DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES
+
+#define DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES(TYPE)                          \
+    USD_NODEDEF_DECL bool set_prim_attribute_samples(                     \
+        BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),              \
+        const Amino::String& prim_path, const Amino::String& name,        \
+        const Amino::Array<Amino::Ptr<Amino::Array<TYPE>>>& values,       \
+        const Amino::Array<float>&                          frames)       \
+        USDNODE_DOC_ICON_X("set_prim_attribute_samples",                  \
+                           "USD_Attribute_set_prim_attribute_samples.md", \
+                           "usd_set.svg", "outName=success");
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES)
+#undef DECLARE_SET_PRIM_ATTRIBUTE_SAMPLES
+
+#define DECLARE_GET_PRIMS_ATTRIBUTE_DATA(TYPE)                          \
+    USD_NODEDEF_DECL bool get_prims_attribute_data(                     \
+        const BifrostUsd::Stage&           stage,                       \
+        const Amino::Array<Amino::String>& prim_paths,                  \
+        const Amino::String& name, TYPE default_and_type,               \
+        const float frame FRAME_ANNOTATION,                             \
+        Amino::MutablePtr<Amino::Array<TYPE>>&          values,         \
+        Amino::MutablePtr<Amino::Array<Amino::bool_t>>& found)          \
+        USDNODE_DOC_ICON_X("get_prims_attribute_data",                  \
+                           "USD_Attribute_get_prims_attribute_data.md", \
+                           "usd_get.svg", "outName=success");
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(DECLARE_GET_PRIMS_ATTRIBUTE_DATA)
+#undef DECLARE_GET_PRIMS_ATTRIBUTE_DATA
+
+#define DECLARE_GET_PRIMS_ATTRIBUTE_DATA(TYPE)                          \
+    USD_NODEDEF_DECL bool get_prims_attribute_data(                     \
+        const BifrostUsd::Stage&           stage,                       \
+        const Amino::Array<Amino::String>& prim_paths,                  \
+        const Amino::String& name, const TYPE& default_and_type,        \
+        const float frame FRAME_ANNOTATION,                             \
+        Amino::MutablePtr<Amino::Array<TYPE>>&          values,         \
+        Amino::MutablePtr<Amino::Array<Amino::bool_t>>& found)          \
+        USDNODE_DOC_ICON_X("get_prims_attribute_data",                  \
+                           "USD_Attribute_get_prims_attribute_data.md", \
+                           "usd_get.svg", "outName=success");
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(DECLARE_GET_PRIMS_ATTRIBUTE_DATA)
+#undef DECLARE_GET_PRIMS_ATTRIBUTE_DATA
+
+#define DECLARE_GET_PRIMS_ATTRIBUTE_ARRAYS(TYPE)                          \
+    USD_NODEDEF_DECL bool get_prims_attribute_arrays(                     \
+        const BifrostUsd::Stage&           stage,                         \
+        const Amino::Array<Amino::String>& prim_paths,                    \
+        const Amino::String& name, const Amino::Array<TYPE>& type,        \
+        const float frame FRAME_ANNOTATION,                               \
+        Amino::MutablePtr<Amino::Array<TYPE>>&           values,          \
+        Amino::MutablePtr<Amino::Array<Amino::ulong_t>>& offsets)         \
+        USDNODE_DOC_ICON_X("get_prims_attribute_arrays",                  \
+                           "USD_Attribute_get_prims_attribute_arrays.md", \
+                           "usd_get.svg", "outName=success");
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(DECLARE_GET_PRIMS_ATTRIBUTE_ARRAYS)
+#undef DECLARE_GET_PRIMS_ATTRIBUTE_ARRAYS
+
+#define DECLARE_SET_PRIMS_ATTRIBUTE_DATA(TYPE)                          \
+    USD_NODEDEF_DECL bool set_prims_attribute_data(                     \
+        BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),            \
+        const Amino::Array<Amino::String>& prim_paths,                  \
+        const Amino::String& name, const Amino::Array<TYPE>& values,    \
+        const bool use_frame, const float frame FRAME_ANNOTATION)       \
+        USDNODE_DOC_ICON_X("set_prims_attribute_data",                  \
+                           "USD_Attribute_set_prims_attribute_data.md", \
+                           "usd_set.svg", "outName=success");
+FOR_EACH_SUPPORTED_BUILTIN_ATTRIBUTE(DECLARE_SET_PRIMS_ATTRIBUTE_DATA)
+FOR_EACH_SUPPORTED_STRUCT_ATTRIBUTE(DECLARE_SET_PRIMS_ATTRIBUTE_DATA)
+#undef DECLARE_SET_PRIMS_ATTRIBUTE_DATA
+
+#define DECLARE_SET_PRIMS_ATTRIBUTE_ARRAYS(TYPE)                          \
+    USD_NODEDEF_DECL bool set_prims_attribute_arrays(                     \
+        BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),              \
+        const Amino::Array<Amino::String>&  prim_paths,                   \
+        const Amino::String&                name,                         \
+        const Amino::Array<TYPE>&           values,                       \
+        const Amino::Array<Amino::ulong_t>& offsets, const bool use_frame, \
+        const float frame FRAME_ANNOTATION)                               \
+        USDNODE_DOC_ICON_X("set_prims_attribute_arrays",                  \
+                           "USD_Attribute_set_prims_attribute_arrays.md", \
+                           "usd_set.svg", "outName=success");
+FOR_EACH_SUPPORTED_ARRAY_ATTRIBUTE(DECLARE_SET_PRIMS_ATTRIBUTE_ARRAYS)
+#undef DECLARE_SET_PRIMS_ATTRIBUTE_ARRAYS
+
 USD_NODEDEF_DECL bool add_attribute_connection(
     BifrostUsd::Stage& stage          USDPORT_INOUT("out_stage"),
     const Amino::String&                prim_path,
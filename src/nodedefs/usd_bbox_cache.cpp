@@ -0,0 +1,47 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include "usd_bbox_cache.h"
+
+namespace {
+/// Maximum number of caches kept alive per stage. Animated stages get a
+/// cache per frame, so older caches are dropped past this limit.
+constexpr size_t kMaxEntries = 64;
+} // namespace
+
+namespace USDUtils {
+
+void BBoxCaches::withCache(
+    const PXR_NS::UsdTimeCode&                             time,
+    const PXR_NS::TfTokenVector&                           purposes,
+    const std::function<void(PXR_NS::UsdGeomBBoxCache&)>& fn) {
+    std::shared_ptr<Entry> entry;
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        auto& slot = m_entries[Key{time, purposes}];
+        if (!slot) {
+            slot = std::make_shared<Entry>(time, purposes);
+        }
+        entry = slot;
+        if (m_entries.size() > kMaxEntries) {
+            m_entries.clear();
+        }
+    }
+    std::lock_guard<std::mutex> lock(entry->mutex);
+    fn(entry->cache);
+}
+
+} // namespace USDUtils
@@ -0,0 +1,71 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file  usd_bbox_cache.h
+/// \brief Bounding box caches shared by the evaluations of the nodes.
+
+#ifndef ADSK_USD_BBOX_CACHE_H
+#define ADSK_USD_BBOX_CACHE_H
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/usdGeom/bboxCache.h>
+BIFUSD_WARNING_POP
+
+#include <functional>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <utility>
+
+namespace USDUtils {
+
+/// \class BBoxCaches usd_bbox_cache.h
+/// \brief Keeps the UsdGeomBBoxCaches of a stage per time and purposes, so
+/// that the bounds computed by a node evaluation are reused by the next
+/// evaluations on the same stage.
+///
+/// The caches are kept in the BifrostUsd::StageDataCache of the stage, so
+/// they are dropped as soon as the stage is modified or destroyed.
+class BBoxCaches {
+public:
+    /// \brief Calls the given function with the bbox cache of the time and
+    /// purposes. The cache is locked while the function runs.
+    void withCache(
+        const PXR_NS::UsdTimeCode&                             time,
+        const PXR_NS::TfTokenVector&                           purposes,
+        const std::function<void(PXR_NS::UsdGeomBBoxCache&)>& fn);
+
+private:
+    struct Entry {
+        Entry(const PXR_NS::UsdTimeCode&   time,
+              const PXR_NS::TfTokenVector& purposes)
+            : cache(time, purposes, /*useExtentsHint=*/true) {}
+
+        std::mutex               mutex;
+        PXR_NS::UsdGeomBBoxCache cache;
+    };
+    using Key = std::pair<PXR_NS::UsdTimeCode, PXR_NS::TfTokenVector>;
+
+    std::mutex                            m_mutex;
+    std::map<Key, std::shared_ptr<Entry>> m_entries;
+};
+
+} // namespace USDUtils
+
+#endif // ADSK_USD_BBOX_CACHE_H
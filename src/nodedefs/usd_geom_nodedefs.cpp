@@ -18,22 +18,32 @@
 #include <BifrostUsd/VariantContext.h>
 
 #include <Amino/Core/String.h>
+#include <pxr/usd/sdf/changeBlock.h>
 #include <pxr/usd/sdf/copyUtils.h>
 #include <pxr/usd/usd/editContext.h>
 #include <pxr/usd/usd/inherits.h>
 #include <pxr/usd/usd/references.h>
 
+#include <algorithm>
 #include <iostream>
+#include <type_traits>
+#include <vector>
 
 #include "logger.h"
 #include "return_guard.h"
+#include "usd_bbox_cache.h"
+#include "usd_sdf_authoring.h"
+#include "usd_type_converter.h"
 #include "usd_utils.h"
 
 // Note: To silence warnings coming from USD library
 BIFUSD_WARNING_PUSH
 BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/base/tf/stringUtils.h>
+#include <pxr/base/work/loops.h>
 #include <pxr/usd/usd/modelAPI.h>
 #include <pxr/usd/usd/payloads.h>
+#include <pxr/usd/usdGeom/bboxCache.h>
 #include <pxr/usd/usdGeom/boundable.h>
 #include <pxr/usd/usdGeom/imageable.h>
 #include <pxr/usd/usdGeom/pointInstancer.h>
@@ -41,10 +51,275 @@ BIFUSD_WARNING_DISABLE_MSC(4003)
 #include <pxr/usd/usdGeom/xformCommonAPI.h>
 #include <pxr/usd/usdVol/field3DAsset.h>
 #include <pxr/usd/usdVol/openVDBAsset.h>
+#include <pxr/usd/usdVol/tokens.h>
 #include <pxr/usd/usdVol/volume.h>
 BIFUSD_WARNING_POP
 
 using namespace USDUtils;
+using namespace USDTypeConverters;
+
+namespace {
+
+/// Computes the axis aligned bounds of a prim and its descendants, in world
+/// space or in the space of the prim.
+PXR_NS::GfRange3d compute_aligned_range(PXR_NS::UsdGeomBBoxCache& bboxCache,
+                                        const PXR_NS::UsdPrim&    prim,
+                                        const bool                local) {
+    auto bbox = local ? bboxCache.ComputeUntransformedBound(prim)
+                      : bboxCache.ComputeWorldBound(prim);
+    return bbox.ComputeAlignedRange();
+}
+
+/// An xform op of a prim, resolved on the stage before an SdfChangeBlock is
+/// opened, so that it can be authored in the block with the Sdf API.
+struct XformOpEdit {
+    AttributeDeclaration op;
+    /// The xformOpOrder to author. Empty if the op is already in the order.
+    PXR_NS::TfTokenVector op_order;
+};
+
+/// Returns the rank of an op in the UsdGeomXformCommonAPI stack, or -1 if it
+/// is not one of its ops.
+int common_op_rank(const PXR_NS::TfToken& op_name) {
+    using XformOp = PXR_NS::UsdGeomXformOp;
+    static const PXR_NS::TfToken pivot =
+        XformOp::GetOpName(XformOp::TypeTranslate, PXR_NS::TfToken("pivot"));
+    static const PXR_NS::TfToken invertedPivot = XformOp::GetOpName(
+        XformOp::TypeTranslate, PXR_NS::TfToken("pivot"), true);
+
+    if (op_name == XformOp::GetOpName(XformOp::TypeTranslate)) return 0;
+    if (op_name == pivot) return 1;
+    for (auto type : {XformOp::TypeRotateXYZ, XformOp::TypeRotateXZY,
+                      XformOp::TypeRotateYXZ, XformOp::TypeRotateYZX,
+                      XformOp::TypeRotateZXY, XformOp::TypeRotateZYX}) {
+        if (op_name == XformOp::GetOpName(type)) return 2;
+    }
+    if (op_name == XformOp::GetOpName(XformOp::TypeScale)) return 3;
+    if (op_name == invertedPivot) return 4;
+    return -1;
+}
+
+/// Resolves the op of the given type set by the transform nodes. If the prim
+/// is compatible with UsdGeomXformCommonAPI, the op of its stack is used, and
+/// added at its place in the stack if needed. Otherwise, the op is appended
+/// to the xformOpOrder, like UsdGeomXformable::AddXformOp does.
+/// Returns false if the op can't be added.
+bool resolve_xform_op(const PXR_NS::UsdGeomXformable& xformable,
+                      const PXR_NS::UsdGeomXformOp::Type type,
+                      const PXR_NS::SdfValueTypeName&    type_name,
+                      XformOpEdit&                       edit) {
+    auto const prim   = xformable.GetPrim();
+    auto const opName = PXR_NS::UsdGeomXformOp::GetOpName(type);
+
+    PXR_NS::VtTokenArray order;
+    xformable.GetXformOpOrderAttr().Get(&order);
+    edit.op_order.clear();
+
+    if (PXR_NS::UsdGeomXformCommonAPI(prim)) {
+        auto const rank  = common_op_rank(opName);
+        size_t     index = 0;
+        for (size_t i = 0; i < order.size(); ++i) {
+            auto const opRank = common_op_rank(order[i]);
+            if (opRank == rank) {
+                // The stack has a single op of each kind, like a single
+                // rotation order.
+                if (order[i] != opName) return false;
+                index = order.size() + 1;
+                break;
+            }
+            if (opRank < rank) index = i + 1;
+        }
+        if (index <= order.size()) {
+            edit.op_order.assign(order.begin(), order.end());
+            edit.op_order.insert(edit.op_order.begin() + index, opName);
+        }
+    } else {
+        if (std::find(order.begin(), order.end(), opName) != order.end()) {
+            return false;
+        }
+        edit.op_order.assign(order.begin(), order.end());
+        edit.op_order.push_back(opName);
+    }
+
+    auto const attribute = prim.GetAttribute(opName);
+    edit.op = attribute ? get_attribute_declaration(attribute)
+                        : AttributeDeclaration{prim.GetPath(), opName,
+                                               type_name};
+    return true;
+}
+
+/// Authors a resolved xform op with the Sdf API, converting the value to the
+/// precision of the op.
+bool author_xform_op(const PXR_NS::UsdStagePtr&   stage,
+                     const PXR_NS::UsdEditTarget& edit_target,
+                     const XformOpEdit&           edit,
+                     const PXR_NS::GfVec3d&       value,
+                     const PXR_NS::UsdTimeCode    time) {
+    PXR_NS::VtValue opValue;
+    if (edit.op.type_name == PXR_NS::SdfValueTypeNames->Double3) {
+        opValue = value;
+    } else if (edit.op.type_name == PXR_NS::SdfValueTypeNames->Half3) {
+        opValue = PXR_NS::GfVec3h(value);
+    } else {
+        opValue = PXR_NS::GfVec3f(value);
+    }
+    if (!set_attribute_spec_value(edit_target,
+                                  create_attribute_spec(stage, edit.op),
+                                  opValue, time)) {
+        return false;
+    }
+    if (edit.op_order.empty()) return true;
+
+    return set_attribute_spec_value(
+        edit_target,
+        create_attribute_spec(
+            stage, AttributeDeclaration{edit.op.prim_path,
+                                        PXR_NS::UsdGeomTokens->xformOpOrder,
+                                        PXR_NS::SdfValueTypeNames->TokenArray,
+                                        PXR_NS::SdfVariabilityUniform}),
+        PXR_NS::VtTokenArray(edit.op_order.begin(), edit.op_order.end()),
+        PXR_NS::UsdTimeCode::Default());
+}
+
+/// Copies the points of a prim. The points are transformed by the world matrix
+/// if it is not null, and only if the prim is compatible with
+/// UsdGeomXformCommonAPI. Returns false if the prim has no points.
+bool read_prim_points(const PXR_NS::UsdPrim&               prim,
+                      const PXR_NS::UsdTimeCode            time,
+                      const PXR_NS::GfMatrix4d*            world_matrix,
+                      Amino::Array<Bifrost::Math::float3>& points) {
+    auto const points_attribute =
+        prim.GetAttribute(PXR_NS::UsdGeomTokens->points);
+    PXR_NS::VtVec3fArray pxr_points;
+    if (!points_attribute || !points_attribute.Get(&pxr_points, time)) {
+        return false;
+    }
+    bool const transform = world_matrix &&
+                           *world_matrix != PXR_NS::GfMatrix4d(1.0) &&
+                           PXR_NS::UsdGeomXformCommonAPI(prim);
+    transform_points(pxr_points, transform ? world_matrix : nullptr, points);
+    return true;
+}
+
+/// Defines a point instancer and sets its prototypes. Sets success to false
+/// if the prototypes could not be set.
+PXR_NS::UsdGeomPointInstancer define_point_instancer(
+    BifrostUsd::Stage&                 stage,
+    const Amino::String&               prim_path,
+    const Amino::Array<Amino::String>& prototypes,
+    bool&                              success) {
+    auto instancer = PXR_NS::UsdGeomPointInstancer::Define(
+        stage.getStagePtr(), PXR_NS::SdfPath(prim_path.c_str()));
+    success = static_cast<bool>(instancer);
+    if (instancer && !prototypes.empty()) {
+        PXR_NS::SdfPathVector targets = {};
+        for (size_t i = 0; i < prototypes.size(); ++i) {
+            targets.push_back(PXR_NS::SdfPath(prototypes[i].c_str()));
+        }
+        auto prototypes_rel = instancer.CreatePrototypesRel();
+        success = prototypes_rel.SetTargets(targets);
+    }
+    return instancer;
+}
+
+/// Sets the per-instance attributes of a point instancer at the given time,
+/// with the Sdf API. Empty arrays are not authored, except for the
+/// orientations and scales which get default values when the positions are
+/// given.
+bool set_point_instancer_sample(
+    const PXR_NS::UsdEditTarget&                           edit_target,
+    const PXR_NS::SdfPrimSpecHandle&                       instancer_spec,
+    const PXR_NS::UsdTimeCode                              time,
+    const Amino::Ptr<Amino::Array<int>>&                   protoindices,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& positions,
+    const Amino::Array<Bifrost::Math::float4>&             orientations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& scales,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& velocities,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& accelerations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& angular_velocities,
+    const Amino::Ptr<Amino::Array<Amino::long_t>>&         invisible_ids) {
+    if (!instancer_spec) return false;
+
+    auto isEmpty = [](const auto& array) { return !array || array->empty(); };
+    auto const numPositions = isEmpty(positions) ? 0 : positions->size();
+    auto setAttribute = [&](const PXR_NS::TfToken&          name,
+                            const PXR_NS::SdfValueTypeName& type_name,
+                            const auto&                     value) {
+        return set_attribute_spec_value(
+            edit_target, create_attribute_spec(instancer_spec, name, type_name),
+            value, time);
+    };
+    auto const& tokens    = PXR_NS::UsdGeomTokens;
+    auto const& typeNames = PXR_NS::SdfValueTypeNames;
+
+    bool success = true;
+    // Add the protoindices. The arrays sharing the layout of their USD
+    // counterparts are not copied, the layer shares their storage.
+    if (!isEmpty(protoindices)) {
+        success = setAttribute(tokens->protoIndices, typeNames->IntArray,
+                               toPxr(protoindices)) &&
+                  success;
+    }
+    // Add the positions
+    if (!isEmpty(positions)) {
+        success = setAttribute(tokens->positions, typeNames->Point3fArray,
+                               toPxr(positions)) &&
+                  success;
+    }
+    // Add the orientations
+    if (!orientations.empty()) {
+        PXR_NS::VtQuathArray pxr_orientations;
+        copy_array(orientations, pxr_orientations);
+        success = setAttribute(tokens->orientations, typeNames->QuathArray,
+                               pxr_orientations) &&
+                  success;
+    } else if (numPositions) { // Add default orientations
+        PXR_NS::VtQuathArray pxr_orientations(
+            numPositions, PXR_NS::GfQuath(PXR_NS::pxr_half::half(0.f)));
+        success = setAttribute(tokens->orientations, typeNames->QuathArray,
+                               pxr_orientations) &&
+                  success;
+    }
+    // Add the scales
+    if (!isEmpty(scales)) {
+        success = setAttribute(tokens->scales, typeNames->Float3Array,
+                               toPxr(scales)) &&
+                  success;
+    } else if (numPositions) { // Add default scales
+        PXR_NS::VtVec3fArray pxr_scales(numPositions, PXR_NS::GfVec3f(1.0f));
+        success =
+            setAttribute(tokens->scales, typeNames->Float3Array, pxr_scales) &&
+            success;
+    }
+    // Add the velocities
+    if (!isEmpty(velocities)) {
+        success = setAttribute(tokens->velocities, typeNames->Vector3fArray,
+                               toPxr(velocities)) &&
+                  success;
+    }
+    // Add the accelerations
+    if (!isEmpty(accelerations)) {
+        success = setAttribute(tokens->accelerations, typeNames->Vector3fArray,
+                               toPxr(accelerations)) &&
+                  success;
+    }
+    // Add the angular velocities
+    if (!isEmpty(angular_velocities)) {
+        success =
+            setAttribute(tokens->angularVelocities, typeNames->Vector3fArray,
+                         toPxr(angular_velocities)) &&
+            success;
+    }
+    // Add the invisible ids
+    if (!isEmpty(invisible_ids)) {
+        success = setAttribute(tokens->invisibleIds, typeNames->Int64Array,
+                               toPxr(invisible_ids)) &&
+                  success;
+    }
+    return success;
+}
+
+} // namespace
 
 bool USD::Prim::get_usd_geom_xform_vectors(
     const BifrostUsd::Prim&        prim,
@@ -148,128 +423,174 @@ bool USD::Prim::compute_usdgeom_extent(
     return success;
 }
 
-bool USD::Prim::usd_point_instancer(
-    BifrostUsd::Stage&                         stage,
-    const Amino::String&                       prim_path,
-    const Amino::Array<Amino::String>&         prototypes,
-    const Amino::Array<int>&                   protoindices,
-    const Amino::Array<Bifrost::Math::float3>& positions,
-    const Amino::Array<Bifrost::Math::float4>& orientations,
-    const Amino::Array<Bifrost::Math::float3>& scales,
-    const Amino::Array<Bifrost::Math::float3>& velocities,
-    const Amino::Array<Bifrost::Math::float3>& accelerations,
-    const Amino::Array<Bifrost::Math::float3>& angular_velocities,
-    const Amino::Array<Amino::long_t>&         invisible_ids) {
+bool USD::Prim::compute_bounds(
+    const BifrostUsd::Stage&                                stage,
+    const Amino::Array<Amino::String>&                      prim_paths,
+    const float                                             frame,
+    const bool                                              local,
+    const bool                                              include_render,
+    const bool                                              include_proxy,
+    const bool                                              include_guide,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>& bounds_min,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>& bounds_max,
+    Bifrost::Math::float3&                                  total_min,
+    Bifrost::Math::float3&                                  total_max) {
+    auto const numPrims = prim_paths.size();
+    bounds_min =
+        Amino::newMutablePtr<Amino::Array<Bifrost::Math::float3>>(numPrims);
+    bounds_max =
+        Amino::newMutablePtr<Amino::Array<Bifrost::Math::float3>>(numPrims);
+    total_min = Bifrost::Math::float3{0.f, 0.f, 0.f};
+    total_max = Bifrost::Math::float3{0.f, 0.f, 0.f};
     if (!stage) return false;
 
-    bool success = false;
+    bool success = true;
     try {
-        success = BifrostUsd::WithVariantContext(stage, [&]() {
-            auto instancer = PXR_NS::UsdGeomPointInstancer::Define(
-                stage.getStagePtr(), PXR_NS::SdfPath(prim_path.c_str()));
-            if (instancer) {
-                success = true;
-                // Add the prototypes
-                if (!prototypes.empty()) {
-                    PXR_NS::SdfPathVector targets = {};
-                    for (size_t i = 0; i < prototypes.size(); ++i) {
-                        targets.push_back(
-                            PXR_NS::SdfPath(prototypes[i].c_str()));
+        PXR_NS::TfTokenVector purposes{PXR_NS::UsdGeomTokens->default_};
+        if (include_render) purposes.push_back(PXR_NS::UsdGeomTokens->render);
+        if (include_proxy) purposes.push_back(PXR_NS::UsdGeomTokens->proxy);
+        if (include_guide) purposes.push_back(PXR_NS::UsdGeomTokens->guide);
+
+        PXR_NS::GfRange3d total;
+        stage.dataCache().get<BBoxCaches>()->withCache(
+            PXR_NS::UsdTimeCode(static_cast<double>(frame)), purposes,
+            [&](PXR_NS::UsdGeomBBoxCache& bboxCache) {
+                for (size_t i = 0; i < numPrims; ++i) {
+                    auto prim = get_prim_at_path(prim_paths[i], stage);
+                    if (!prim) {
+                        success = false;
+                        continue;
                     }
-                    auto prototypes_rel = instancer.CreatePrototypesRel();
-                    success = success && prototypes_rel.SetTargets(targets);
-                }
-                // Add the protoindices
-                if (!protoindices.empty()) {
-                    PXR_NS::VtIntArray pxr_protoindices;
-                    copy_array<Amino::Array<int>, PXR_NS::VtIntArray>(
-                        protoindices, pxr_protoindices);
-                    auto protoindices_attr = instancer.CreateProtoIndicesAttr();
-                    success =
-                        success && protoindices_attr.Set(pxr_protoindices);
-                }
-                // Add the positions
-                if (!positions.empty()) {
-                    PXR_NS::VtVec3fArray pxr_positions;
-                    copy_array(positions, pxr_positions);
-                    auto positions_attr = instancer.CreatePositionsAttr();
-                    success = success && positions_attr.Set(pxr_positions);
-                }
-                // Add the orientations
-                if (!orientations.empty()) {
-                    PXR_NS::VtQuathArray pxr_orientations;
-                    copy_array(orientations, pxr_orientations);
-                    auto orientations_attr = instancer.CreateOrientationsAttr();
-                    success =
-                        success && orientations_attr.Set(pxr_orientations);
-                } else if (!positions.empty()) { // Add default orientations
-                    PXR_NS::VtQuathArray pxr_orientations;
-                    pxr_orientations.resize(positions.size());
-                    for (size_t i = 0; i < pxr_orientations.size(); ++i) {
-                        pxr_orientations[i].SetReal(
-                            PXR_NS::pxr_half::half(0.f));
-                        pxr_orientations[i].SetImaginary(
-                            PXR_NS::pxr_half::half(0.f),
-                            PXR_NS::pxr_half::half(0.f),
-                            PXR_NS::pxr_half::half(0.f));
-                    }
-                    auto orientations_attr = instancer.CreateOrientationsAttr();
-                    success =
-                        success && orientations_attr.Set(pxr_orientations);
+                    auto range = compute_aligned_range(bboxCache, prim, local);
+                    if (range.IsEmpty()) continue;
+
+                    (*bounds_min)[i] = fromPxr(PXR_NS::GfVec3f(range.GetMin()));
+                    (*bounds_max)[i] = fromPxr(PXR_NS::GfVec3f(range.GetMax()));
+                    total.UnionWith(range);
                 }
-                // Add the scales
-                if (!scales.empty()) {
-                    PXR_NS::VtVec3fArray pxr_scales;
-                    pxr_scales.resize(scales.size());
-                    copy_array(scales, pxr_scales);
-                    auto scales_attr = instancer.CreateScalesAttr();
-                    success          = success && scales_attr.Set(pxr_scales);
-                } else if (!positions.empty()) { // Add default scales
-                    PXR_NS::VtVec3fArray pxr_scales;
-                    pxr_scales.resize(positions.size());
-                    for (size_t i = 0; i < pxr_scales.size(); ++i) {
-                        pxr_scales[i][0] = 1.0f;
-                        pxr_scales[i][1] = 1.0f;
-                        pxr_scales[i][2] = 1.0f;
+            });
+        if (!total.IsEmpty()) {
+            total_min = fromPxr(PXR_NS::GfVec3f(total.GetMin()));
+            total_max = fromPxr(PXR_NS::GfVec3f(total.GetMax()));
+        }
+
+    } catch (std::exception& e) {
+        log_exception("compute_bounds", e);
+        success = false;
+    }
+    return success;
+}
+
+bool USD::Prim::get_usd_geom_batch(
+    const BifrostUsd::Stage&           stage,
+    const Amino::Array<Amino::String>& prim_paths,
+    const bool                         local_space,
+    const float                        frame,
+    Amino::MutablePtr<Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>>&
+                                                               points,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>&    extents,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::double4x4>>& world_matrices) {
+    auto const numPrims = prim_paths.size();
+    points = Amino::newMutablePtr<
+        Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>>(numPrims);
+    extents = Amino::newMutablePtr<Amino::Array<Bifrost::Math::float3>>(
+        2 * numPrims);
+    world_matrices =
+        Amino::newMutablePtr<Amino::Array<Bifrost::Math::double4x4>>(numPrims);
+    if (!stage) return false;
+
+    bool success = true;
+    try {
+        auto time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
+
+        // The transforms and bounds of the prims are computed serially with
+        // a single xform cache and a single bbox cache, so the transforms of
+        // the ancestors shared by the prims are only computed once.
+        std::vector<PXR_NS::UsdPrim>    prims(numPrims);
+        std::vector<PXR_NS::GfMatrix4d> xforms(numPrims);
+        PXR_NS::UsdGeomXformCache       xformCache(time);
+        for (size_t i = 0; i < numPrims; ++i) {
+            prims[i] = get_prim_at_path(prim_paths[i], stage);
+            if (!prims[i]) {
+                success = false;
+                continue;
+            }
+            xforms[i] = xformCache.GetLocalToWorldTransform(prims[i]);
+            (*world_matrices)[i] = fromPxr(xforms[i]);
+        }
+        stage.dataCache().get<BBoxCaches>()->withCache(
+            time,
+            {PXR_NS::UsdGeomTokens->default_, PXR_NS::UsdGeomTokens->render,
+             PXR_NS::UsdGeomTokens->proxy, PXR_NS::UsdGeomTokens->guide},
+            [&](PXR_NS::UsdGeomBBoxCache& bboxCache) {
+                for (size_t i = 0; i < numPrims; ++i) {
+                    if (!prims[i]) continue;
+                    auto range =
+                        compute_aligned_range(bboxCache, prims[i], local_space);
+                    if (!range.IsEmpty()) {
+                        (*extents)[2 * i] =
+                            fromPxr(PXR_NS::GfVec3f(range.GetMin()));
+                        (*extents)[2 * i + 1] =
+                            fromPxr(PXR_NS::GfVec3f(range.GetMax()));
                     }
-                    auto scales_attr = instancer.CreateScalesAttr();
-                    success          = success && scales_attr.Set(pxr_scales);
-                }
-                // Add the velocities
-                if (!velocities.empty()) {
-                    PXR_NS::VtVec3fArray pxr_velocities;
-                    copy_array(velocities, pxr_velocities);
-                    auto velocities_attr = instancer.CreateVelocitiesAttr();
-                    success = success && velocities_attr.Set(pxr_velocities);
-                }
-                // Add the accelerations
-                if (!accelerations.empty()) {
-                    PXR_NS::VtVec3fArray pxr_accelerations;
-                    copy_array(accelerations, pxr_accelerations);
-                    auto accelerations_attr =
-                        instancer.CreateAccelerationsAttr();
-                    success =
-                        success && accelerations_attr.Set(pxr_accelerations);
                 }
-                // Add the angular velocities
-                if (!angular_velocities.empty()) {
-                    PXR_NS::VtVec3fArray pxr_angular_velocities;
-                    copy_array(angular_velocities, pxr_angular_velocities);
-                    auto angular_velocities_attr =
-                        instancer.CreateAngularVelocitiesAttr();
-                    success = success && angular_velocities_attr.Set(
-                                             pxr_angular_velocities);
-                }
-                // Add the invisible ids
-                if (!invisible_ids.empty()) {
-                    PXR_NS::VtInt64Array pxr_invisible_ids;
-                    copy_array<Amino::Array<long long>, PXR_NS::VtInt64Array>(
-                        invisible_ids, pxr_invisible_ids);
-                    auto invisible_ids_attr =
-                        instancer.CreateInvisibleIdsAttr();
-                    success =
-                        success && invisible_ids_attr.Set(pxr_invisible_ids);
+            });
+
+        // The points are read and transformed in parallel. The prims
+        // without points get an empty array.
+        PXR_NS::WorkParallelForN(numPrims, [&](size_t begin, size_t end) {
+            for (size_t i = begin; i < end; ++i) {
+                auto primPoints =
+                    Amino::newMutablePtr<Amino::Array<Bifrost::Math::float3>>();
+                if (prims[i]) {
+                    read_prim_points(prims[i], time,
+                                     local_space ? nullptr : &xforms[i],
+                                     *primPoints);
                 }
+                (*points)[i] = std::move(primPoints);
+            }
+        });
+
+    } catch (std::exception& e) {
+        log_exception("get_usd_geom_batch", e);
+        success = false;
+    }
+    return success;
+}
+
+bool USD::Prim::usd_point_instancer(
+    BifrostUsd::Stage&                                     stage,
+    const Amino::String&                                   prim_path,
+    const Amino::Array<Amino::String>&                     prototypes,
+    const Amino::Ptr<Amino::Array<int>>&                   protoindices,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& positions,
+    const Amino::Array<Bifrost::Math::float4>&             orientations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& scales,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& velocities,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& accelerations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& angular_velocities,
+    const Amino::Ptr<Amino::Array<Amino::long_t>>&         invisible_ids) {
+    if (!stage) return false;
+
+    bool success = false;
+    try {
+        success = BifrostUsd::WithVariantContext(stage, [&]() {
+            auto instancer = define_point_instancer(stage, prim_path,
+                                                    prototypes, success);
+            if (instancer) {
+                auto const usdStage   = stage.getStagePtr();
+                auto const editTarget = usdStage->GetEditTarget();
+                PXR_NS::SdfChangeBlock changeBlock;
+                auto const instancerSpec = create_prim_spec(
+                    usdStage, instancer.GetPath(), PXR_NS::SdfSpecifierOver,
+                    PXR_NS::TfToken());
+                success = set_point_instancer_sample(
+                              editTarget, instancerSpec,
+                              PXR_NS::UsdTimeCode::Default(),
+                              protoindices, positions, orientations, scales,
+                              velocities, accelerations, angular_velocities,
+                              invisible_ids) &&
+                          success;
             }
             return success;
         });
@@ -281,6 +602,88 @@ bool USD::Prim::usd_point_instancer(
     return success;
 }
 
+bool USD::Prim::usd_point_instancer_samples(
+    BifrostUsd::Stage&                 stage,
+    const Amino::String&               prim_path,
+    const Amino::Array<Amino::String>& prototypes,
+    const Amino::Array<float>&         frames,
+    const Amino::Array<Amino::Ptr<Amino::Array<int>>>& protoindices,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        positions,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float4>>>&
+        orientations,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        scales,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        velocities,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        accelerations,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        angular_velocities,
+    const Amino::Array<Amino::Ptr<Amino::Array<Amino::long_t>>>&
+        invisible_ids) {
+    if (!stage) return false;
+
+    bool success = false;
+    try {
+        auto const numFrames = frames.size();
+        auto checkSize = [numFrames](const auto& samples, const char* name) {
+            if (!samples.empty() && samples.size() != numFrames) {
+                throw std::runtime_error(std::string(name) +
+                                         " size must be equal to frames size");
+            }
+        };
+        checkSize(protoindices, "protoindices");
+        checkSize(positions, "positions");
+        checkSize(orientations, "orientations");
+        checkSize(scales, "scales");
+        checkSize(velocities, "velocities");
+        checkSize(accelerations, "accelerations");
+        checkSize(angular_velocities, "angular_velocities");
+        checkSize(invisible_ids, "invisible_ids");
+
+        success = BifrostUsd::WithVariantContext(stage, [&]() {
+            auto instancer = define_point_instancer(stage, prim_path,
+                                                    prototypes, success);
+            if (!instancer) return success;
+
+            // Author all the samples at once: the layer sends a single
+            // change notification and the stage is only updated once.
+            static const Amino::Array<Bifrost::Math::float4> noOrientations;
+            auto const usdStage   = stage.getStagePtr();
+            auto const editTarget = usdStage->GetEditTarget();
+            PXR_NS::SdfChangeBlock changeBlock;
+            auto const instancerSpec =
+                create_prim_spec(usdStage, instancer.GetPath(),
+                                 PXR_NS::SdfSpecifierOver, PXR_NS::TfToken());
+            for (size_t i = 0; i < numFrames; ++i) {
+                auto sample = [i](const auto& samples) {
+                    using SampleType = std::decay_t<decltype(samples[0])>;
+                    return samples.empty() ? SampleType() : samples[i];
+                };
+                auto const frameOrientations = sample(orientations);
+
+                success = set_point_instancer_sample(
+                              editTarget, instancerSpec,
+                              PXR_NS::UsdTimeCode(static_cast<double>(frames[i])),
+                              sample(protoindices), sample(positions),
+                              frameOrientations ? *frameOrientations
+                                                : noOrientations,
+                              sample(scales), sample(velocities),
+                              sample(accelerations), sample(angular_velocities),
+                              sample(invisible_ids)) &&
+                          success;
+            }
+            return success;
+        });
+
+    } catch (std::exception& e) {
+        log_exception("usd_point_instancer_samples", e);
+        success = false;
+    }
+    return success;
+}
+
 bool USD::Prim::usd_volume(
     BifrostUsd::Stage&                  stage,
     const Amino::String&                prim_path,
@@ -306,43 +709,63 @@ bool USD::Prim::usd_volume(
                     "field_names");
             }
 
-            PXR_NS::SdfPath volumePath(PXR_NS::SdfPath(prim_path.c_str()));
-            auto            volume =
-                PXR_NS::UsdVolVolume::Define(stage.getStagePtr(), volumePath);
-            if (volume) {
-                for (size_t i = 0; i < field_names.size(); ++i) {
-                    PXR_NS::TfToken fieldPathName(field_names[i].c_str());
-                    PXR_NS::SdfPath fieldPath =
-                        volumePath.AppendChild(fieldPathName);
-
-                    PXR_NS::TfToken fieldName(field_names[i].c_str());
-                    PXR_NS::TfToken relationshipName(fieldName);
-                    if (!relationship_names.empty()) {
-                        relationshipName =
-                            PXR_NS::TfToken(relationship_names[i].c_str());
-                    }
-
-                    PXR_NS::SdfAssetPath file_path(file_paths[i].c_str());
-
-                    if (file_format == BifrostUsd::VolumeFieldFormat::OpenVDB) {
-                        auto fieldPrim = PXR_NS::UsdVolOpenVDBAsset::Define(
-                            stage.getStagePtr(), fieldPath);
-
-                        set_volume_field_relationship(
-                            fieldPrim, fieldName, relationshipName, file_path,
-                            volume, static_cast<double>(frame));
-                    } else if (file_format ==
-                               BifrostUsd::VolumeFieldFormat::Field3D) {
-                        auto fieldPrim = PXR_NS::UsdVolField3DAsset::Define(
-                            stage.getStagePtr(), fieldPath);
+            PXR_NS::TfToken fieldType;
+            if (file_format == BifrostUsd::VolumeFieldFormat::OpenVDB) {
+                fieldType = PXR_NS::TfToken("OpenVDBAsset");
+            } else if (file_format == BifrostUsd::VolumeFieldFormat::Field3D) {
+                fieldType = PXR_NS::TfToken("Field3DAsset");
+            }
 
-                        set_volume_field_relationship(
-                            fieldPrim, fieldName, relationshipName, file_path,
-                            volume, static_cast<double>(frame));
-                    }
+            // Author the volume and its fields directly in the edit target
+            // layer. The stage is recomposed once, when the change block
+            // closes, instead of after each prim, attribute and relationship.
+            auto const  usdStage   = stage.getStagePtr();
+            auto const& editTarget = usdStage->GetEditTarget();
+            auto const  time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
+
+            PXR_NS::SdfChangeBlock changeBlock;
+            PXR_NS::SdfPath        volumePath(prim_path.c_str());
+            auto volumeSpec = define_prim_spec(usdStage, volumePath,
+                                               PXR_NS::TfToken("Volume"));
+            if (!volumeSpec) return false;
+
+            for (size_t i = 0; i < field_names.size() && !fieldType.IsEmpty();
+                 ++i) {
+                PXR_NS::TfToken fieldName(field_names[i].c_str());
+                PXR_NS::SdfPath fieldPath = volumePath.AppendChild(fieldName);
+
+                std::string relationshipName = fieldName.GetString();
+                if (!relationship_names.empty()) {
+                    relationshipName = relationship_names[i].c_str();
+                }
+                // Same namespace as UsdVolVolume::CreateFieldRelationship,
+                // which keeps the names already in it.
+                if (!PXR_NS::TfStringStartsWith(relationshipName, "field:")) {
+                    relationshipName = "field:" + relationshipName;
                 }
-                success = true;
+
+                auto fieldSpec =
+                    define_prim_spec(usdStage, fieldPath, fieldType);
+                if (!fieldSpec) return false;
+
+                set_attribute_spec_value(
+                    editTarget,
+                    create_attribute_spec(fieldSpec,
+                                          PXR_NS::UsdVolTokens->fieldName,
+                                          PXR_NS::SdfValueTypeNames->Token),
+                    fieldName, time);
+                set_attribute_spec_value(
+                    editTarget,
+                    create_attribute_spec(fieldSpec,
+                                          PXR_NS::UsdVolTokens->filePath,
+                                          PXR_NS::SdfValueTypeNames->Asset),
+                    PXR_NS::SdfAssetPath(file_paths[i].c_str()), time);
+
+                set_relationship_spec_targets(editTarget, volumeSpec,
+                                              PXR_NS::TfToken(relationshipName),
+                                              {fieldPath});
             }
+            success = true;
             return success;
         });
 
@@ -374,27 +797,27 @@ bool USD::Prim::translate_prim(BifrostUsd::Stage&            stage,
                 time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
             }
 
-            auto xform_api = PXR_NS::UsdGeomXformCommonAPI(pxr_prim);
-            if (xform_api) {
-                success = xform_api.SetTranslate(GetVec3d(position), time);
-            } else {
-                auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
-                PXR_NS::UsdGeomXformOp op;
-                if (xformable) {
-                    op = xformable.AddTranslateOp();
-                } else {
-                    throw std::runtime_error("Can't translate prim at path " +
-                                             std::string(prim_path.c_str()) +
-                                             ". Invalid UsdGeomXformable");
-                }
-                if (op) {
-                    success = op.Set(GetVec3d(position), time);
-                } else {
-                    throw std::runtime_error("Can't translate prim at path " +
-                                             std::string(prim_path.c_str()) +
-                                             ". Invalid UsdGeomXformOp");
-                }
+            auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
+            if (!xformable) {
+                throw std::runtime_error("Can't translate prim at path " +
+                                         std::string(prim_path.c_str()) +
+                                         ". Invalid UsdGeomXformable");
+            }
+            XformOpEdit edit;
+            if (!resolve_xform_op(xformable,
+                                  PXR_NS::UsdGeomXformOp::TypeTranslate,
+                                  PXR_NS::SdfValueTypeNames->Double3, edit)) {
+                throw std::runtime_error("Can't translate prim at path " +
+                                         std::string(prim_path.c_str()) +
+                                         ". Invalid UsdGeomXformOp");
             }
+
+            // Adding an xform op authors the op attribute and the op order
+            auto const usdStage = stage.getStagePtr();
+            auto const editTarget = usdStage->GetEditTarget();
+            PXR_NS::SdfChangeBlock changeBlock;
+            success = author_xform_op(usdStage, editTarget, edit,
+                                      GetVec3d(position), time);
             return success;
         });
 
@@ -427,41 +850,24 @@ bool USD::Prim::rotate_prim(BifrostUsd::Stage&                   stage,
                 time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
             }
 
-            PXR_NS::UsdGeomXformCommonAPI xform_api =
-                PXR_NS::UsdGeomXformCommonAPI(pxr_prim);
-            if (xform_api) {
-                success = xform_api.SetRotate(
-                    GetVec3f(rotation), GetUsdRotationOrder(rotation_order),
-                    time);
-            } else {
-                auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
-                PXR_NS::UsdGeomXformOp op;
-                if (xformable) {
-                    switch (rotation_order) {
-                        case Bifrost::Math::rotation_order::XYZ:
-                            op = xformable.AddRotateXYZOp();
-                            break;
-                        case Bifrost::Math::rotation_order::XZY:
-                            op = xformable.AddRotateXZYOp();
-                            break;
-                        case Bifrost::Math::rotation_order::YXZ:
-                            op = xformable.AddRotateYXZOp();
-                            break;
-                        case Bifrost::Math::rotation_order::YZX:
-                            op = xformable.AddRotateYZXOp();
-                            break;
-                        case Bifrost::Math::rotation_order::ZXY:
-                            op = xformable.AddRotateZXYOp();
-                            break;
-                        case Bifrost::Math::rotation_order::ZYX:
-                            op = xformable.AddRotateZYXOp();
-                            break;
-                    }
-                }
-                if (op) {
-                    success = op.Set(GetVec3f(rotation), time);
-                }
+            auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
+            XformOpEdit edit;
+            if (!xformable ||
+                !resolve_xform_op(
+                    xformable,
+                    PXR_NS::UsdGeomXformCommonAPI::ConvertRotationOrderToOpType(
+                        GetUsdRotationOrder(rotation_order)),
+                    PXR_NS::SdfValueTypeNames->Float3, edit)) {
+                return false;
             }
+
+            // Adding an xform op authors the op attribute and the op order
+            auto const usdStage = stage.getStagePtr();
+            auto const editTarget = usdStage->GetEditTarget();
+            PXR_NS::SdfChangeBlock changeBlock;
+            success = author_xform_op(usdStage, editTarget, edit,
+                                      PXR_NS::GfVec3d(GetVec3f(rotation)),
+                                      time);
             return success;
         });
 
@@ -490,18 +896,20 @@ bool USD::Prim::scale_prim(BifrostUsd::Stage&           stage,
                 time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
             }
 
-            PXR_NS::UsdGeomXformCommonAPI xform_api =
-                PXR_NS::UsdGeomXformCommonAPI(pxr_prim);
-            if (xform_api) {
-                success = xform_api.SetScale(GetVec3f(scale), time);
-            } else {
-                auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
-                PXR_NS::UsdGeomXformOp op;
-                if (xformable) op = xformable.AddScaleOp();
-                if (op) {
-                    success = op.Set(GetVec3f(scale), time);
-                }
+            auto xformable = PXR_NS::UsdGeomXformable(pxr_prim);
+            XformOpEdit edit;
+            if (!xformable ||
+                !resolve_xform_op(xformable, PXR_NS::UsdGeomXformOp::TypeScale,
+                                  PXR_NS::SdfValueTypeNames->Float3, edit)) {
+                return false;
             }
+
+            // Adding an xform op authors the op attribute and the op order
+            auto const usdStage = stage.getStagePtr();
+            auto const editTarget = usdStage->GetEditTarget();
+            PXR_NS::SdfChangeBlock changeBlock;
+            success = author_xform_op(usdStage, editTarget, edit,
+                                      PXR_NS::GfVec3d(GetVec3f(scale)), time);
             return success;
         });
 
@@ -548,43 +956,15 @@ bool USD::Prim::get_usd_geom_points(
 
     bool success = false;
     try {
-        auto points_attribute =
-            prim.getPxrPrim().GetAttribute(PXR_NS::UsdGeomTokens->points);
-        if (!points_attribute) {
-            return false;
-        }
-
-        PXR_NS::VtArray<PXR_NS::GfVec3f> pxr_points;
-        success = points_attribute.Get(&pxr_points, static_cast<double>(frame));
-        if (!success) return false;
+        auto const time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
 
+        PXR_NS::GfMatrix4d xform;
         if (!local_space) {
-            auto xform_api = PXR_NS::UsdGeomXformCommonAPI(prim.getPxrPrim());
-            if (xform_api) {
-                PXR_NS::GfMatrix4d xform;
-                auto               xformCache =
-                    PXR_NS::UsdGeomXformCache(static_cast<double>(frame));
-                xform = xformCache.GetLocalToWorldTransform(prim.getPxrPrim());
-
-                for (size_t i = 0; i < pxr_points.size(); ++i) {
-                    PXR_NS::GfVec4f global_point(pxr_points[i][0],
-                                                 pxr_points[i][1],
-                                                 pxr_points[i][2], 1.f);
-                    global_point     = global_point * xform;
-                    pxr_points[i][0] = global_point[0];
-                    pxr_points[i][1] = global_point[1];
-                    pxr_points[i][2] = global_point[2];
-                }
-            }
-        }
-
-        points->resize(pxr_points.size());
-        // copy into our array
-        for (size_t i = 0; i < pxr_points.size(); ++i) {
-            (*points)[i].x = pxr_points[i][0];
-            (*points)[i].y = pxr_points[i][1];
-            (*points)[i].z = pxr_points[i][2];
+            xform = PXR_NS::UsdGeomXformCache(time).GetLocalToWorldTransform(
+                prim.getPxrPrim());
         }
+        success = read_prim_points(prim.getPxrPrim(), time,
+                                   local_space ? nullptr : &xform, *points);
 
     } catch (std::exception& e) {
         log_exception("get_usd_geom_points", e);
@@ -64,24 +64,86 @@ bool compute_usdgeom_extent(
                        "usd_default.svg",
                        "outName=success");
 
+USD_NODEDEF_DECL
+bool compute_bounds(
+    const BifrostUsd::Stage&           stage,
+    const Amino::Array<Amino::String>& prim_paths,
+    const float frame
+        AMINO_ANNOTATE("Amino::Port value=1 metadata=[{quick_create, "
+                      "string, Core::Time::time.frame}] "),
+    const bool local,
+    const bool include_render AMINO_ANNOTATE("Amino::Port value=true"),
+    const bool include_proxy,
+    const bool include_guide,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>& bounds_min,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>& bounds_max,
+    Bifrost::Math::float3&                                  total_min,
+    Bifrost::Math::float3&                                  total_max)
+    USDNODE_DOC_ICON_X("compute_bounds",
+                       "USD_Prim_compute_bounds.md",
+                       "usd_default.svg",
+                       "outName=success");
+
+USD_NODEDEF_DECL
+bool get_usd_geom_batch(
+    const BifrostUsd::Stage&           stage,
+    const Amino::Array<Amino::String>& prim_paths,
+    const bool                         local_space,
+    const float frame
+        AMINO_ANNOTATE("Amino::Port value=1 metadata=[{quick_create, "
+                      "string, Core::Time::time.frame}] "),
+    Amino::MutablePtr<Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>>& points,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>& extents,
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::double4x4>>& world_matrices)
+    USDNODE_DOC_ICON_X("get_usd_geom_batch",
+                       "USD_Prim_get_usd_geom_batch.md",
+                       "usd_default.svg",
+                       "outName=success");
+
 USD_NODEDEF_DECL
 bool usd_point_instancer(
     BifrostUsd::Stage& stage                 USDPORT_INOUT("out_stage"),
     const Amino::String&                       prim_path,
     const Amino::Array<Amino::String>&         prototypes,
-    const Amino::Array<int>&                   protoindices,
-    const Amino::Array<Bifrost::Math::float3>& positions,
-    const Amino::Array<Bifrost::Math::float4>& orientations,
-    const Amino::Array<Bifrost::Math::float3>& scales,
-    const Amino::Array<Bifrost::Math::float3>& velocities,
-    const Amino::Array<Bifrost::Math::float3>& accelerations,
-    const Amino::Array<Bifrost::Math::float3>& angular_velocities,
-    const Amino::Array<Amino::long_t>&             invisible_ids)
+    const Amino::Ptr<Amino::Array<int>>&                   protoindices,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& positions,
+    const Amino::Array<Bifrost::Math::float4>&             orientations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& scales,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& velocities,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& accelerations,
+    const Amino::Ptr<Amino::Array<Bifrost::Math::float3>>& angular_velocities,
+    const Amino::Ptr<Amino::Array<Amino::long_t>>&         invisible_ids)
     USDNODE_DOC_ICON_X("usd_point_instancer",
                        "USD_Prim_usd_point_instancer.md",
                        "point_instancer.svg",
                        "outName=success");
 
+USD_NODEDEF_DECL
+bool usd_point_instancer_samples(
+    BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
+    const Amino::String&               prim_path,
+    const Amino::Array<Amino::String>& prototypes,
+    const Amino::Array<float>&         frames,
+    const Amino::Array<Amino::Ptr<Amino::Array<int>>>& protoindices,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        positions,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float4>>>&
+        orientations,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        scales,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        velocities,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        accelerations,
+    const Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>&
+        angular_velocities,
+    const Amino::Array<Amino::Ptr<Amino::Array<Amino::long_t>>>&
+        invisible_ids)
+    USDNODE_DOC_ICON_X("usd_point_instancer_samples",
+                       "USD_Prim_usd_point_instancer_samples.md",
+                       "point_instancer.svg",
+                       "outName=success");
+
 USD_NODEDEF_DECL
 bool usd_volume(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
                 const Amino::String&       prim_path,
@@ -21,6 +21,7 @@
 #include <pxr/usd/sdf/copyUtils.h>
 #include <cstdio>
 #include <limits>
+#include <utility>
 
 #include "return_guard.h"
 #include "usd_utils.h"
@@ -233,6 +234,40 @@ void USD::Layer::export_layer_to_string(const BifrostUsd::Layer&    layer,
     }
 }
 
+void USD::Layer::export_layer_to_binary(
+    const BifrostUsd::Layer&                         layer,
+    const bool                                       export_sub_layers,
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>>& result) {
+    result = Amino::newMutablePtr<Amino::Array<Amino::uchar_t>>();
+    try {
+        // Export the layer
+        if (layer) {
+            *result = layer.exportToBinary(export_sub_layers);
+        }
+    } catch (std::exception& e) {
+        log_exception("export_layer_to_binary", e);
+    }
+}
+
+void USD::Layer::import_layer_from_binary(
+    const Amino::Array<Amino::uchar_t>&   bytes,
+    const Amino::String&                  tag,
+    Amino::MutablePtr<BifrostUsd::Layer>& layer) {
+    layer = [&bytes, &tag]() {
+        try {
+            auto result = BifrostUsd::Layer::fromBinary(bytes, tag);
+            if (result) {
+                return Amino::newMutablePtr<BifrostUsd::Layer>(
+                    std::move(result));
+            }
+        } catch (std::exception& e) {
+            log_exception("import_layer_from_binary", e);
+        }
+        return createInvalidLayer();
+    }();
+    assert(layer);
+}
+
 bool USD::Layer::export_layer_to_file(const BifrostUsd::Layer&  layer,
                                       const Amino::String&      file,
                                       const bool                relative_path) {
@@ -101,6 +101,23 @@ void export_layer_to_string(const BifrostUsd::Layer& layer,
                      "USD_Layer_export_layer_to_string.md",
                      "export_layer.svg");
 
+USD_NODEDEF_DECL
+void export_layer_to_binary(
+    const BifrostUsd::Layer&                           layer,
+    const bool                                         export_sub_layers,
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>>& result)
+    USDNODE_DOC_ICON("export_layer_to_binary",
+                     "USD_Layer_export_layer_to_binary.md",
+                     "export_layer.svg");
+
+USD_NODEDEF_DECL
+void import_layer_from_binary(const Amino::Array<Amino::uchar_t>&   bytes,
+                              const Amino::String&                  tag,
+                              Amino::MutablePtr<BifrostUsd::Layer>& layer)
+    USDNODE_DOC_ICON("import_layer_from_binary",
+                     "USD_Layer_import_layer_from_binary.md",
+                     "usd_layers.svg");
+
 USD_NODEDEF_DECL
 bool export_layer_to_file(const BifrostUsd::Layer& layer,
                           const Amino::String& file  USDNODE_FILE_BROWSER_SAVE,
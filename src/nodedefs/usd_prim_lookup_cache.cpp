@@ -0,0 +1,57 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include "usd_prim_lookup_cache.h"
+
+#include <mutex>
+
+namespace {
+/// Maximum number of prims kept per stage.
+constexpr size_t kMaxPrims = 4096;
+} // namespace
+
+namespace USDUtils {
+
+PXR_NS::UsdPrim PrimLookupCache::getPrim(const PXR_NS::UsdStageRefPtr& stage,
+                                         std::string_view              path) {
+    if (!stage) return PXR_NS::UsdPrim();
+    {
+        std::shared_lock<std::shared_mutex> lock(m_mutex);
+        auto                                found = m_prims.find(path);
+        if (found != m_prims.end() && found->second) {
+            return found->second;
+        }
+    }
+
+    // Look the prim up without holding the lock. Missing prims are not
+    // cached, defining them later resyncs the stage anyway.
+    auto prim = stage->GetPrimAtPath(PXR_NS::SdfPath(std::string(path)));
+    if (!prim) return prim;
+
+    std::unique_lock<std::shared_mutex> lock(m_mutex);
+    if (m_prims.size() >= kMaxPrims) {
+        m_prims.clear();
+    }
+    m_prims.emplace(path, prim);
+    return prim;
+}
+
+bool PrimLookupCache::isInvalidatedBy(
+    const PXR_NS::UsdNotice::ObjectsChanged& notice) {
+    return !notice.GetResyncedPaths().empty();
+}
+
+} // namespace USDUtils
@@ -0,0 +1,66 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file  usd_prim_lookup_cache.h
+/// \brief Cache of the prims looked up by path by the nodes.
+
+#ifndef ADSK_USD_PRIM_LOOKUP_CACHE_H
+#define ADSK_USD_PRIM_LOOKUP_CACHE_H
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/usd/notice.h>
+#include <pxr/usd/usd/prim.h>
+#include <pxr/usd/usd/stage.h>
+BIFUSD_WARNING_POP
+
+#include <functional>
+#include <map>
+#include <shared_mutex>
+#include <string>
+#include <string_view>
+
+namespace USDUtils {
+
+/// \class PrimLookupCache usd_prim_lookup_cache.h
+/// \brief Keeps the prims of a stage found at the resolved paths given to the
+/// nodes, so that chained operations on the same prim do not parse the path
+/// and look the prim up again.
+///
+/// The prims are kept in the BifrostUsd::StageDataCache of the stage, so they
+/// are dropped with the stage and as soon as it is recomposed (see
+/// \ref PrimLookupCache::isInvalidatedBy).
+class PrimLookupCache {
+public:
+    /// \brief Returns the prim of the stage at the given absolute path, or
+    /// an invalid prim if there is none.
+    PXR_NS::UsdPrim getPrim(const PXR_NS::UsdStageRefPtr& stage,
+                            std::string_view              path);
+
+    /// \brief Returns true if the change of the stage can invalidate the
+    /// prims: info only changes (attribute values, metadata) keep them.
+    static bool isInvalidatedBy(const PXR_NS::UsdNotice::ObjectsChanged& notice);
+
+private:
+    std::shared_mutex                                   m_mutex;
+    std::map<std::string, PXR_NS::UsdPrim, std::less<>> m_prims;
+};
+
+} // namespace USDUtils
+
+#endif // ADSK_USD_PRIM_LOOKUP_CACHE_H
@@ -18,6 +18,8 @@
 #include <BifrostUsd/VariantContext.h>
 
 #include <Amino/Core/String.h>
+#include <pxr/usd/sdf/changeBlock.h>
+#include <pxr/base/work/loops.h>
 #include <pxr/usd/sdf/copyUtils.h>
 #include <pxr/usd/usd/editContext.h>
 #include <pxr/usd/usd/inherits.h>
@@ -25,6 +27,8 @@
 #include <pxr/usd/usd/specializes.h>
 
 #include "return_guard.h"
+#include "usd_prim_query.h"
+#include "usd_sdf_authoring.h"
 #include "usd_type_converter.h"
 #include "usd_utils.h"
 
@@ -35,6 +39,10 @@
 #include <cstddef>
 #include <iostream>
 #include <ostream>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
 BIFUSD_WARNING_PUSH
 BIFUSD_WARNING_DISABLE_MSC(4003)
 #include <pxr/usd/usd/modelAPI.h>
@@ -109,6 +117,25 @@ std::string get_part_after_anchor_path(const std::string& anchor_path,
     return resolved_identifier;
 }
 
+/// Returns the value for the i-th prim of an array that can either be empty,
+/// have a single value shared by all the prims, or one value per prim.
+template <typename T>
+const T* per_prim_value(const Amino::Array<T>& values, const size_t i) {
+    if (values.empty()) return nullptr;
+    return values.size() == 1 ? &values[0] : &values[i];
+}
+
+template <typename T>
+void check_per_prim_size(const Amino::Array<T>& values,
+                         const size_t           num_prims,
+                         const char*            name) {
+    if (values.size() > 1 && values.size() != num_prims) {
+        throw std::invalid_argument(
+            std::string("The size of ") + name +
+            " must be 0, 1 or the number of paths");
+    }
+}
+
 } // namespace
 
 bool USD::Prim::get_prim_at_path(Amino::Ptr<BifrostUsd::Stage>        stage,
@@ -177,6 +204,130 @@ void USD::Prim::get_prim_children(
     }
 }
 
+void USD::Prim::get_prim_children_paths(
+    const BifrostUsd::Stage&                        stage,
+    const Amino::String&                            prim_path,
+    const bool                                      descendants,
+    const bool                                      active_only,
+    const bool                                      defined_only,
+    const bool                                      models_only,
+    const bool                                      instance_proxies,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& paths,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& types,
+    Amino::MutablePtr<Amino::Array<Amino::long_t>>& parent_indices) {
+    paths          = Amino::newMutablePtr<Amino::Array<Amino::String>>();
+    types          = Amino::newMutablePtr<Amino::Array<Amino::String>>();
+    parent_indices = Amino::newMutablePtr<Amino::Array<Amino::long_t>>();
+    if (!stage) return;
+
+    try {
+        auto pxr_prim = USDUtils::get_prim_at_path(prim_path, stage);
+        if (!pxr_prim) return;
+
+        PXR_NS::Usd_PrimFlagsConjunction flags;
+        if (active_only) flags &= PXR_NS::UsdPrimIsActive;
+        if (defined_only) flags &= PXR_NS::UsdPrimIsDefined;
+        if (models_only) flags &= PXR_NS::UsdPrimIsModel;
+        PXR_NS::Usd_PrimFlagsPredicate predicate = flags;
+        if (instance_proxies) {
+            predicate = PXR_NS::UsdTraverseInstanceProxies(predicate);
+        }
+
+        // Gather the paths, types and parent indices of the prims without
+        // creating a Bifrost prim per child. The prims are visited in depth
+        // first order, so the parent of a prim is on the stack of its
+        // visited ancestors.
+        using Ancestor = std::pair<PXR_NS::SdfPath, Amino::long_t>;
+        PXR_NS::SdfPathVector      primPaths;
+        PXR_NS::TfTokenVector      primTypes;
+        std::vector<Amino::long_t> parents;
+        std::vector<Ancestor>      ancestors{{pxr_prim.GetPath(), -1}};
+        auto addPrim = [&](const PXR_NS::UsdPrim& prim) {
+            const auto& path = prim.GetPath();
+            while (ancestors.back().first != path.GetParentPath()) {
+                ancestors.pop_back();
+            }
+            parents.push_back(ancestors.back().second);
+            ancestors.emplace_back(
+                path, static_cast<Amino::long_t>(primPaths.size()));
+            primPaths.push_back(path);
+            primTypes.push_back(prim.GetTypeName());
+        };
+        if (descendants) {
+            for (const auto& prim :
+                 pxr_prim.GetFilteredDescendants(predicate)) {
+                addPrim(prim);
+            }
+        } else {
+            for (const auto& prim : pxr_prim.GetFilteredChildren(predicate)) {
+                addPrim(prim);
+            }
+        }
+
+        // Fill each column with a single allocation.
+        const size_t count = primPaths.size();
+        paths->resize(count);
+        types->resize(count);
+        parent_indices->resize(count);
+        PXR_NS::WorkParallelForN(count, [&](size_t begin, size_t end) {
+            for (size_t i = begin; i < end; ++i) {
+                (*paths)[i]          = primPaths[i].GetText();
+                (*types)[i]          = primTypes[i].GetText();
+                (*parent_indices)[i] = parents[i];
+            }
+        });
+    } catch (std::exception& e) {
+        log_exception("get_prim_children_paths", e);
+    }
+}
+
+bool USD::Prim::find_prims(
+    const BifrostUsd::Stage&                          stage,
+    const Amino::Array<Amino::String>&                path_patterns,
+    const bool                                        use_regex,
+    const Amino::Array<Amino::String>&                types,
+    const Amino::Array<Amino::String>&                kinds,
+    const Amino::Array<BifrostUsd::ImageablePurpose>& purposes,
+    const Amino::Array<Amino::String>&                applied_schemas,
+    Amino::Ptr<Amino::Array<Amino::String>>&          prim_paths) {
+    prim_paths = Amino::newMutablePtr<Amino::Array<Amino::String>>();
+    if (!stage) return false;
+
+    try {
+        auto toTokens = [](const Amino::Array<Amino::String>& strings) {
+            PXR_NS::TfTokenVector tokens;
+            tokens.reserve(strings.size());
+            for (const auto& string : strings) {
+                if (!string.empty()) tokens.emplace_back(string.c_str());
+            }
+            return tokens;
+        };
+
+        USDUtils::PrimQuery query;
+        for (const auto& pattern : path_patterns) {
+            if (!pattern.empty()) query.patterns.emplace_back(pattern.c_str());
+        }
+        query.useRegex       = use_regex;
+        query.types          = toTokens(types);
+        query.kinds          = toTokens(kinds);
+        query.appliedSchemas = toTokens(applied_schemas);
+        for (const auto& purpose : purposes) {
+            query.purposes.push_back(USDUtils::GetImageablePurpose(purpose));
+        }
+
+        prim_paths =
+            stage.dataCache()
+                .get<USDUtils::PrimQueryResults>(USDUtils::affects_prim_queries)
+                ->findPrims(const_cast<BifrostUsd::Stage&>(stage).getStagePtr(),
+                            query);
+        return true;
+
+    } catch (std::exception& e) {
+        log_exception("find_prims", e);
+    }
+    return false;
+}
+
 void USD::Prim::get_prim_path(const BifrostUsd::Prim& prim,
                               Amino::String&          path) {
     try {
@@ -278,6 +429,49 @@ void USD::Prim::create_prim(BifrostUsd::Stage&   stage,
     }
 }
 
+bool USD::Prim::create_prims(
+    BifrostUsd::Stage&                                stage,
+    const Amino::Array<Amino::String>&                paths,
+    const Amino::Array<Amino::String>&                types,
+    const Amino::Array<Amino::String>&                kinds,
+    const Amino::Array<BifrostUsd::ImageablePurpose>& purposes) {
+    if (!stage) return false;
+    if (paths.empty()) return true;
+
+    try {
+        check_per_prim_size(types, paths.size(), "types");
+        check_per_prim_size(kinds, paths.size(), "kinds");
+        check_per_prim_size(purposes, paths.size(), "purposes");
+
+        std::vector<USDUtils::PrimSpecDefinition> prims(paths.size());
+        for (size_t i = 0; i < paths.size(); ++i) {
+            auto resolvedPath = USDUtils::resolve_prim_path(paths[i], stage);
+            auto& prim        = prims[i];
+            prim.path         = PXR_NS::SdfPath(resolvedPath.c_str());
+            if (auto type = per_prim_value(types, i)) {
+                prim.type_name = PXR_NS::TfToken(type->c_str());
+            }
+            if (auto kind = per_prim_value(kinds, i)) {
+                prim.kind = PXR_NS::TfToken(kind->c_str());
+            }
+            auto purpose = per_prim_value(purposes, i);
+            if (purpose && *purpose != BifrostUsd::ImageablePurpose::Default) {
+                prim.purpose = USDUtils::GetImageablePurpose(*purpose);
+            }
+        }
+
+        bool success = BifrostUsd::WithVariantContext(stage, [&]() {
+            return USDUtils::author_prim_specs(stage.getStagePtr(), prims);
+        });
+        stage.last_modified_prim = prims.back().path.GetText();
+        return success;
+
+    } catch (std::exception& e) {
+        log_exception("create_prims", e);
+    }
+    return false;
+}
+
 void USD::Prim::create_class_prim(BifrostUsd::Stage&   stage,
                                   const Amino::String& path) {
     if (!stage) return;
@@ -606,11 +800,21 @@ bool USD::Prim::create_prim_relationship(
             auto pxr_prim = USDUtils::get_prim_at_path(prim_path, stage);
             if (!pxr_prim) return false;
 
-            auto rel = pxr_prim.CreateRelationship(
-                PXR_NS::TfToken(rel_name.c_str()), custom);
-            if (!rel) return false;
-            success = rel.AddTarget(PXR_NS::SdfPath(target.c_str()),
-                                    GetUsdListPosition(target_position));
+            // Like UsdRelationship::AddTarget, a relative target is anchored
+            // to the prim of the relationship.
+            auto const targetPath = PXR_NS::SdfPath(target.c_str())
+                                        .MakeAbsolutePath(pxr_prim.GetPath());
+            auto const usdStage   = stage.getStagePtr();
+            auto const editTarget = usdStage->GetEditTarget();
+
+            PXR_NS::SdfChangeBlock changeBlock;
+            auto primSpec = USDUtils::create_prim_spec(
+                usdStage, pxr_prim.GetPath(), PXR_NS::SdfSpecifierOver,
+                PXR_NS::TfToken());
+            if (!primSpec) return false;
+            success = USDUtils::add_relationship_spec_target(
+                editTarget, primSpec, PXR_NS::TfToken(rel_name.c_str()),
+                targetPath, GetUsdListPosition(target_position), custom);
 
             if (success) {
                 stage.last_modified_prim = pxr_prim.GetPath().GetText();
@@ -1086,12 +1290,17 @@ void USD::Prim::set_prim_asset_info(BifrostUsd::Stage&   stage,
         BifrostUsd::WithVariantContext(stage, [&]() {
             auto pxr_prim = USDUtils::get_prim_or_throw(prim_path, stage);
 
-            auto modelAPI = PXR_NS::UsdModelAPI(pxr_prim);
+            PXR_NS::SdfChangeBlock changeBlock;
+            auto primSpec = USDUtils::create_prim_spec(
+                stage.getStagePtr(), pxr_prim.GetPath(),
+                PXR_NS::SdfSpecifierOver, PXR_NS::TfToken());
+            if (!primSpec) return;
             // if the string parameter is empty we don't want to
-            // call the modelAPI matching method as it would erase
+            // author the matching asset info key as it would erase
             // any existing value.
             if (!asset_identifier.empty()) {
-                modelAPI.SetAssetIdentifier(
+                primSpec->SetAssetInfo(
+                    PXR_NS::UsdModelAPIAssetInfoKeys->identifier,
                     // We use the SdfAssetPath constructor using one parameter.
                     // The SdfAssetPath constructor using two parameters is
                     // useless in our scenario as
@@ -1107,13 +1316,18 @@ void USD::Prim::set_prim_asset_info(BifrostUsd::Stage&   stage,
                     // >>> model.GetAssetIdentifier()
                     // Sdf.AssetPath('foo.usd')
                     // \endcode
-                    PXR_NS::SdfAssetPath(asset_identifier.c_str()));
+                    PXR_NS::VtValue(
+                        PXR_NS::SdfAssetPath(asset_identifier.c_str())));
             }
             if (!asset_name.empty()) {
-                modelAPI.SetAssetName(asset_name.c_str());
+                primSpec->SetAssetInfo(PXR_NS::UsdModelAPIAssetInfoKeys->name,
+                                       PXR_NS::VtValue(std::string(
+                                           asset_name.c_str())));
             }
             if (!asset_version.empty()) {
-                modelAPI.SetAssetVersion(asset_version.c_str());
+                primSpec->SetAssetInfo(
+                    PXR_NS::UsdModelAPIAssetInfoKeys->version,
+                    PXR_NS::VtValue(std::string(asset_version.c_str())));
             }
         });
     } catch (std::exception& e) {
@@ -55,6 +55,36 @@ void get_prim_children(
     Amino::MutablePtr<Amino::Array<Amino::Ptr<BifrostUsd::Prim>>>& children)
     USDNODE_DOC_ICON("get_prim_children", "USD_Prim_get_prim_children.md", "usd_pill.svg");
 
+USD_NODEDEF_DECL
+void get_prim_children_paths(
+    const BifrostUsd::Stage& stage,
+    const Amino::String&     prim_path,
+    const bool descendants   AMINO_ANNOTATE("Amino::Port value=true"),
+    const bool active_only   AMINO_ANNOTATE("Amino::Port value=true"),
+    const bool defined_only  AMINO_ANNOTATE("Amino::Port value=true"),
+    const bool               models_only,
+    const bool               instance_proxies,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& paths,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& types,
+    Amino::MutablePtr<Amino::Array<Amino::long_t>>& parent_indices)
+    USDNODE_DOC_ICON("get_prim_children_paths",
+                     "USD_Prim_get_prim_children_paths.md",
+                     "usd_pill.svg");
+
+USD_NODEDEF_DECL
+bool find_prims(const BifrostUsd::Stage&                          stage,
+                const Amino::Array<Amino::String>&                path_patterns,
+                const bool                                        use_regex,
+                const Amino::Array<Amino::String>&                types,
+                const Amino::Array<Amino::String>&                kinds,
+                const Amino::Array<BifrostUsd::ImageablePurpose>& purposes,
+                const Amino::Array<Amino::String>&                applied_schemas,
+                Amino::Ptr<Amino::Array<Amino::String>>&          prim_paths)
+    USDNODE_DOC_ICON_X("find_prims",
+                       "USD_Prim_find_prims.md",
+                       "usd_pill.svg",
+                       "outName=success");
+
 USD_NODEDEF_DECL
 void get_prim_path(const BifrostUsd::Prim& prim, Amino::String& path)
     USDNODE_DOC_ICON("get_prim_path", "USD_Prim_get_prim_path.md", "usd_pill.svg");
@@ -92,6 +122,17 @@ void create_prim(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
                  const Amino::String&       type)
     USDNODE_INTERNAL("create_prim", "USD_Prim_create_prim.md");
 
+USD_NODEDEF_DECL
+bool create_prims(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
+                  const Amino::Array<Amino::String>&                paths,
+                  const Amino::Array<Amino::String>&                types,
+                  const Amino::Array<Amino::String>&                kinds,
+                  const Amino::Array<BifrostUsd::ImageablePurpose>& purposes)
+    USDNODE_DOC_ICON_X("create_prims",
+                       "USD_Prim_create_prims.md",
+                       "usd_pill.svg",
+                       "outName=success");
+
 USD_NODEDEF_DECL
 void create_class_prim(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
                        const Amino::String&       path)
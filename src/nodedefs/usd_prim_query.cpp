@@ -0,0 +1,243 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include "usd_prim_query.h"
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/base/tf/patternMatcher.h>
+#include <pxr/usd/kind/registry.h>
+#include <pxr/usd/usd/modelAPI.h>
+#include <pxr/usd/usd/prim.h>
+#include <pxr/usd/usd/primRange.h>
+#include <pxr/usd/usd/schemaRegistry.h>
+#include <pxr/usd/usdGeom/imageable.h>
+#include <pxr/usd/usdGeom/tokens.h>
+BIFUSD_WARNING_POP
+
+#include <algorithm>
+
+namespace {
+/// Maximum number of query results kept alive per stage.
+constexpr size_t kMaxEntries = 64;
+
+/// A type filter of a query, resolved to its schema type if it has one.
+struct TypeFilter {
+    PXR_NS::TfToken name;
+    PXR_NS::TfType  type;
+};
+
+bool matchesType(const PXR_NS::UsdPrim&        prim,
+                 const std::vector<TypeFilter>& types) {
+    if (types.empty()) return true;
+    for (const auto& filter : types) {
+        if (filter.type.IsUnknown() ? prim.GetTypeName() == filter.name
+                                    : prim.IsA(filter.type)) {
+            return true;
+        }
+    }
+    return false;
+}
+
+bool matchesKind(const PXR_NS::UsdPrim&       prim,
+                 const PXR_NS::TfTokenVector& kinds) {
+    if (kinds.empty()) return true;
+    PXR_NS::TfToken kind;
+    if (!PXR_NS::UsdModelAPI(prim).GetKind(&kind) || kind.IsEmpty()) {
+        return false;
+    }
+    for (const auto& filter : kinds) {
+        if (PXR_NS::KindRegistry::IsA(kind, filter)) return true;
+    }
+    return false;
+}
+
+bool matchesPurpose(const PXR_NS::UsdPrim&       prim,
+                    const PXR_NS::TfTokenVector& purposes) {
+    if (purposes.empty()) return true;
+    auto purpose = PXR_NS::UsdGeomImageable(prim).ComputePurpose();
+    return std::find(purposes.begin(), purposes.end(), purpose) !=
+           purposes.end();
+}
+
+bool matchesAppliedSchemas(const PXR_NS::UsdPrim&       prim,
+                           const PXR_NS::TfTokenVector& schemas) {
+    if (schemas.empty()) return true;
+    auto applied = prim.GetAppliedSchemas();
+    for (const auto& schema : schemas) {
+        if (std::find(applied.begin(), applied.end(), schema) ==
+            applied.end()) {
+            return false;
+        }
+    }
+    return true;
+}
+
+} // namespace
+
+namespace USDUtils {
+
+std::string glob_to_regex(const std::string& pattern) {
+    std::string regex = "^";
+    for (char c : pattern) {
+        switch (c) {
+            case '*': regex += "[^/]*"; break;
+            case '?': regex += "[^/]"; break;
+            case '.':
+            case '[':
+            case ']':
+            case '(':
+            case ')':
+            case '{':
+            case '}':
+            case '+':
+            case '^':
+            case '$':
+            case '|':
+            case '\\':
+                regex += '\\';
+                regex += c;
+                break;
+            default: regex += c; break;
+        }
+    }
+    regex += "$";
+    return regex;
+}
+
+PrimQueryResult evaluate_prim_query(const PXR_NS::UsdStageRefPtr& stage,
+                                    const PrimQuery&              query) {
+    auto result = Amino::newMutablePtr<Amino::Array<Amino::String>>();
+    if (!stage) return result;
+
+    // Build the path matchers and the roots of the traversal. A glob pattern
+    // can only match the descendants of its literal prefix, down to its own
+    // depth, so the traversal is restricted to these subtrees.
+    std::vector<PXR_NS::TfPatternMatcher> matchers;
+    PXR_NS::SdfPathVector                 roots;
+    size_t                                maxDepth = 0;
+    if (query.patterns.empty() || query.useRegex) {
+        roots.push_back(PXR_NS::SdfPath::AbsoluteRootPath());
+    }
+    for (const auto& pattern : query.patterns) {
+        if (query.useRegex) {
+            matchers.emplace_back(pattern, true, false);
+            continue;
+        }
+        if (pattern.empty() || pattern[0] != '/') continue;
+        matchers.emplace_back(glob_to_regex(pattern), true, false);
+
+        auto wildcard = pattern.find_first_of("*?");
+        auto prefix   = wildcard == std::string::npos
+                            ? pattern
+                            : pattern.substr(0, pattern.rfind('/', wildcard));
+        PXR_NS::SdfPath root =
+            prefix.empty() ? PXR_NS::SdfPath::AbsoluteRootPath()
+                           : PXR_NS::SdfPath(prefix);
+        if (!root.IsAbsoluteRootOrPrimPath()) continue;
+        roots.push_back(root);
+        maxDepth = std::max(
+            maxDepth,
+            static_cast<size_t>(
+                std::count(pattern.begin(), pattern.end(), '/')));
+    }
+    if (roots.empty()) return result;
+    PXR_NS::SdfPath::RemoveDescendentPaths(&roots);
+
+    std::vector<TypeFilter> types;
+    types.reserve(query.types.size());
+    for (const auto& type : query.types) {
+        types.push_back(
+            {type, PXR_NS::UsdSchemaRegistry::GetTypeFromName(type)});
+    }
+
+    auto matches = [&](const PXR_NS::UsdPrim& prim) {
+        if (!matchesType(prim, types) || !matchesKind(prim, query.kinds) ||
+            !matchesAppliedSchemas(prim, query.appliedSchemas) ||
+            !matchesPurpose(prim, query.purposes)) {
+            return false;
+        }
+        if (matchers.empty()) return true;
+        const auto& path = prim.GetPath().GetString();
+        for (const auto& matcher : matchers) {
+            if (matcher.Match(path)) return true;
+        }
+        return false;
+    };
+
+    for (const auto& root : roots) {
+        auto rootPrim = stage->GetPrimAtPath(root);
+        if (!rootPrim) continue;
+
+        PXR_NS::UsdPrimRange range(rootPrim, PXR_NS::UsdPrimDefaultPredicate);
+        for (auto it = range.begin(); it != range.end(); ++it) {
+            const auto& prim = *it;
+            if (prim.IsPseudoRoot()) continue;
+            if (!PXR_NS::UsdPrimDefaultPredicate(prim)) {
+                it.PruneChildren();
+                continue;
+            }
+            if (matches(prim)) {
+                result->push_back(Amino::String(prim.GetPath().GetText()));
+            }
+            if (maxDepth > 0 &&
+                prim.GetPath().GetPathElementCount() >= maxDepth) {
+                it.PruneChildren();
+            }
+        }
+    }
+    return result;
+}
+
+PrimQueryResult PrimQueryResults::findPrims(
+    const PXR_NS::UsdStageRefPtr& stage, const PrimQuery& query) {
+    Key key{query.patterns, query.useRegex, query.types,
+            query.kinds,    query.purposes, query.appliedSchemas};
+    {
+        std::lock_guard<std::mutex> lock(m_mutex);
+        auto                        it = m_entries.find(key);
+        if (it != m_entries.end()) {
+            return it->second;
+        }
+    }
+
+    // Evaluate the query without holding the lock, so that other queries on
+    // the stage are not blocked by this traversal.
+    auto paths = evaluate_prim_query(stage, query);
+
+    std::lock_guard<std::mutex> lock(m_mutex);
+    if (m_entries.size() >= kMaxEntries) {
+        m_entries.clear();
+    }
+    m_entries[key] = paths;
+    return paths;
+}
+
+bool affects_prim_queries(const PXR_NS::UsdNotice::ObjectsChanged& notice) {
+    if (!notice.GetResyncedPaths().empty()) return true;
+    for (const auto& path : notice.GetChangedInfoOnlyPaths()) {
+        if (path.IsPrimPath()) return true;
+        if (path.IsPropertyPath() &&
+            path.GetNameToken() == PXR_NS::UsdGeomTokens->purpose) {
+            return true;
+        }
+    }
+    return false;
+}
+
+} // namespace USDUtils
@@ -0,0 +1,109 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file  usd_prim_query.h
+/// \brief Prim queries evaluated in a single stage traversal and memoised
+/// per stage.
+
+#ifndef ADSK_USD_PRIM_QUERY_H
+#define ADSK_USD_PRIM_QUERY_H
+
+#include <Amino/Core/Array.h>
+#include <Amino/Core/Ptr.h>
+#include <Amino/Core/String.h>
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/base/tf/token.h>
+#include <pxr/usd/usd/notice.h>
+#include <pxr/usd/usd/stage.h>
+BIFUSD_WARNING_POP
+
+#include <map>
+#include <mutex>
+#include <string>
+#include <tuple>
+#include <vector>
+
+namespace USDUtils {
+
+/// Convert a prim path glob pattern into an anchored regular expression. The
+/// '*' and '?' wildcards do not match the '/' path separator.
+std::string glob_to_regex(const std::string& pattern);
+
+/// \brief The filters of a prim query. A prim matches the query if its path
+/// matches one of the patterns, its type one of the types, its kind one of
+/// the kinds, its computed purpose one of the purposes, and if all the
+/// applied schemas are applied to it. An empty filter matches all prims.
+struct PrimQuery {
+    /// Absolute prim path glob patterns, or regular expressions if
+    /// useRegex is true.
+    std::vector<std::string> patterns;
+    bool                     useRegex = false;
+    PXR_NS::TfTokenVector    types;
+    PXR_NS::TfTokenVector    kinds;
+    PXR_NS::TfTokenVector    purposes;
+    PXR_NS::TfTokenVector    appliedSchemas;
+};
+
+using PrimQueryResult = Amino::Ptr<Amino::Array<Amino::String>>;
+
+/// \brief Evaluates the query in a single traversal of the stage, using the
+/// default prim predicate (active, loaded, defined and non abstract prims).
+/// The traversal starts at the literal prefixes of the glob patterns and does
+/// not go deeper than the deepest pattern.
+PrimQueryResult evaluate_prim_query(const PXR_NS::UsdStageRefPtr& stage,
+                                    const PrimQuery&              query);
+
+/// \class PrimQueryResults usd_prim_query.h
+/// \brief Memoises the results of the prim queries on a stage, so that the
+/// same query on an unchanged stage does not traverse it again.
+///
+/// The results are kept in the BifrostUsd::StageDataCache of the stage, so
+/// they are dropped with the stage and as soon as a change of the stage can
+/// affect them (see \ref affects_prim_queries). Attribute value edits keep
+/// the results.
+class PrimQueryResults {
+public:
+    /// \brief Returns the paths of the prims of the stage matching the query,
+    /// evaluating it only if it has not been evaluated since the last
+    /// relevant change of the stage.
+    PrimQueryResult findPrims(const PXR_NS::UsdStageRefPtr& stage,
+                              const PrimQuery&              query);
+
+private:
+    using Key = std::tuple<std::vector<std::string>,
+                           bool,
+                           PXR_NS::TfTokenVector,
+                           PXR_NS::TfTokenVector,
+                           PXR_NS::TfTokenVector,
+                           PXR_NS::TfTokenVector>;
+
+    std::mutex                     m_mutex;
+    std::map<Key, PrimQueryResult> m_entries;
+};
+
+/// \brief Returns true if the change of the stage can affect the results of
+/// the prim queries: a prim was resynced (added, removed, (de)activated,
+/// retyped or had its applied schemas changed), the metadata of a prim
+/// changed (kind) or a purpose attribute changed.
+bool affects_prim_queries(const PXR_NS::UsdNotice::ObjectsChanged& notice);
+
+} // namespace USDUtils
+
+#endif // ADSK_USD_PRIM_QUERY_H
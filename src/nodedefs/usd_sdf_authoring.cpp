@@ -0,0 +1,272 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+#include "usd_sdf_authoring.h"
+
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/sdf/changeBlock.h>
+#include <pxr/usd/sdf/listOp.h>
+#include <pxr/usd/sdf/relationshipSpec.h>
+#include <pxr/usd/usd/prim.h>
+#include <pxr/usd/usd/tokens.h>
+BIFUSD_WARNING_POP
+
+#include <algorithm>
+
+namespace {
+
+// Same names as UsdGeomTokens, without depending on UsdGeom.
+const PXR_NS::TfToken kInterpolation("interpolation");
+const PXR_NS::TfToken kPurpose("purpose");
+
+/// Prepends the schemas to the applied API schemas of a prim spec, keeping
+/// the ones already authored.
+void prepend_api_schemas(const PXR_NS::SdfPrimSpecHandle& prim_spec,
+                         const PXR_NS::TfTokenVector&     schemas) {
+    PXR_NS::SdfTokenListOp listOp;
+    auto const current = prim_spec->GetInfo(PXR_NS::UsdTokens->apiSchemas);
+    if (current.IsHolding<PXR_NS::SdfTokenListOp>()) {
+        listOp = current.UncheckedGet<PXR_NS::SdfTokenListOp>();
+    }
+    auto items = listOp.IsExplicit() ? listOp.GetExplicitItems()
+                                     : listOp.GetPrependedItems();
+    for (auto const& schema : schemas) {
+        if (std::find(items.begin(), items.end(), schema) == items.end()) {
+            items.push_back(schema);
+        }
+    }
+    if (listOp.IsExplicit()) {
+        listOp.SetExplicitItems(items);
+    } else {
+        listOp.SetPrependedItems(items);
+    }
+    prim_spec->SetInfo(PXR_NS::UsdTokens->apiSchemas, PXR_NS::VtValue(listOp));
+}
+
+/// Inserts an item in a list of a list editor at the given position, moving
+/// it if it is already there. Same as the list editing of the Usd API: the
+/// explicit list is edited if the list editor is explicit.
+template <class PROXY>
+void insert_list_item(PROXY                              proxy,
+                      const typename PROXY::value_type& item,
+                      const PXR_NS::UsdListPosition      position) {
+    bool const atFront =
+        position == PXR_NS::UsdListPositionFrontOfPrependList ||
+        position == PXR_NS::UsdListPositionFrontOfAppendList;
+    auto list = proxy.IsExplicit() ? proxy.GetExplicitItems()
+                : position == PXR_NS::UsdListPositionFrontOfPrependList ||
+                        position == PXR_NS::UsdListPositionBackOfPrependList
+                    ? proxy.GetPrependedItems()
+                    : proxy.GetAppendedItems();
+    auto const found = list.Find(item);
+    if (found != static_cast<size_t>(-1)) {
+        if (found == (atFront ? 0 : list.size() - 1)) return;
+        list.Erase(found);
+    }
+    list.Insert(atFront ? 0 : -1, item);
+}
+
+} // namespace
+
+namespace USDUtils {
+
+PXR_NS::SdfPrimSpecHandle define_prim_spec(const PXR_NS::UsdStagePtr& stage,
+                                           const PXR_NS::SdfPath&     path,
+                                           const PXR_NS::TfToken& type_name) {
+    return create_prim_spec(stage, path, PXR_NS::SdfSpecifierDef, type_name);
+}
+
+PXR_NS::SdfPrimSpecHandle create_prim_spec(const PXR_NS::UsdStagePtr& stage,
+                                           const PXR_NS::SdfPath&     path,
+                                           const PXR_NS::SdfSpecifier specifier,
+                                           const PXR_NS::TfToken& type_name) {
+    if (!stage || !path.IsPrimPath()) return {};
+
+    auto const& editTarget = stage->GetEditTarget();
+    auto const  specPath   = editTarget.MapToSpecPath(path);
+    if (specPath.IsEmpty()) return {};
+
+    auto primSpec =
+        PXR_NS::SdfCreatePrimInLayer(editTarget.GetLayer(), specPath);
+    if (!primSpec) return {};
+
+    // SdfCreatePrimInLayer creates the missing ancestors as "over". Define
+    // the ones that are not defined on the stage yet.
+    for (auto parentPath = path.GetParentPath();
+         specifier == PXR_NS::SdfSpecifierDef && !parentPath.IsEmpty() &&
+         !parentPath.IsAbsoluteRootPath();
+         parentPath = parentPath.GetParentPath()) {
+        auto parent = stage->GetPrimAtPath(parentPath);
+        if (parent && parent.IsDefined()) break;
+        auto parentSpec = editTarget.GetPrimSpecForScenePath(parentPath);
+        if (parentSpec &&
+            parentSpec->GetSpecifier() == PXR_NS::SdfSpecifierOver) {
+            parentSpec->SetSpecifier(PXR_NS::SdfSpecifierDef);
+        }
+    }
+
+    if (primSpec->GetSpecifier() != specifier &&
+        specifier != PXR_NS::SdfSpecifierOver) {
+        primSpec->SetSpecifier(specifier);
+    }
+    if (!type_name.IsEmpty() && primSpec->GetTypeName() != type_name) {
+        primSpec->SetTypeName(type_name);
+    }
+    return primSpec;
+}
+
+PXR_NS::SdfAttributeSpecHandle create_attribute_spec(
+    const PXR_NS::SdfPrimSpecHandle& prim_spec,
+    const PXR_NS::TfToken&           name,
+    const PXR_NS::SdfValueTypeName&  type_name,
+    const PXR_NS::SdfVariability     variability,
+    const bool                       custom) {
+    if (!prim_spec) return {};
+
+    auto attrSpec = prim_spec->GetLayer()->GetAttributeAtPath(
+        prim_spec->GetPath().AppendProperty(name));
+    if (attrSpec) return attrSpec;
+    return PXR_NS::SdfAttributeSpec::New(prim_spec, name, type_name,
+                                         variability, custom);
+}
+
+AttributeDeclaration get_attribute_declaration(
+    const PXR_NS::UsdAttribute& attribute) {
+    return {attribute.GetPrim().GetPath(), attribute.GetName(),
+            attribute.GetTypeName(), attribute.GetVariability(),
+            attribute.IsCustom()};
+}
+
+PXR_NS::SdfAttributeSpecHandle create_attribute_spec(
+    const PXR_NS::UsdStagePtr&  stage,
+    const AttributeDeclaration& declaration) {
+    return create_attribute_spec(
+        create_prim_spec(stage, declaration.prim_path,
+                         PXR_NS::SdfSpecifierOver, PXR_NS::TfToken()),
+        declaration.name, declaration.type_name, declaration.variability,
+        declaration.custom);
+}
+
+bool set_relationship_spec_targets(const PXR_NS::UsdEditTarget&     edit_target,
+                                   const PXR_NS::SdfPrimSpecHandle& prim_spec,
+                                   const PXR_NS::TfToken&           name,
+                                   const PXR_NS::SdfPathVector&     targets,
+                                   const bool                       custom) {
+    if (!prim_spec) return false;
+
+    auto relSpec = prim_spec->GetLayer()->GetRelationshipAtPath(
+        prim_spec->GetPath().AppendProperty(name));
+    if (!relSpec) {
+        relSpec = PXR_NS::SdfRelationshipSpec::New(prim_spec, name, custom);
+        if (!relSpec) return false;
+    }
+
+    PXR_NS::SdfPathVector specTargets;
+    specTargets.reserve(targets.size());
+    for (auto const& target : targets) {
+        auto specTarget = edit_target.MapToSpecPath(target);
+        if (specTarget.IsEmpty()) return false;
+        specTargets.push_back(specTarget.StripAllVariantSelections());
+    }
+    relSpec->GetTargetPathList().ClearEditsAndMakeExplicit();
+    relSpec->GetTargetPathList().SetExplicitItems(specTargets);
+    return true;
+}
+
+bool add_relationship_spec_target(const PXR_NS::UsdEditTarget&     edit_target,
+                                  const PXR_NS::SdfPrimSpecHandle& prim_spec,
+                                  const PXR_NS::TfToken&           name,
+                                  const PXR_NS::SdfPath&           target,
+                                  const PXR_NS::UsdListPosition    position,
+                                  const bool                       custom) {
+    if (!prim_spec) return false;
+
+    auto const specTarget = edit_target.MapToSpecPath(target);
+    if (specTarget.IsEmpty()) return false;
+
+    auto relSpec = prim_spec->GetLayer()->GetRelationshipAtPath(
+        prim_spec->GetPath().AppendProperty(name));
+    if (!relSpec) {
+        relSpec = PXR_NS::SdfRelationshipSpec::New(prim_spec, name, custom);
+        if (!relSpec) return false;
+    }
+    insert_list_item(relSpec->GetTargetPathList(),
+                     specTarget.StripAllVariantSelections(), position);
+    return true;
+}
+
+bool author_prim_specs(const PXR_NS::UsdStagePtr&             stage,
+                       const std::vector<PrimSpecDefinition>& prims) {
+    if (!stage) return false;
+
+    auto const& editTarget = stage->GetEditTarget();
+    bool        success    = true;
+
+    PXR_NS::SdfChangeBlock changeBlock;
+    for (auto const& prim : prims) {
+        auto primSpec =
+            create_prim_spec(stage, prim.path, prim.specifier, prim.type_name);
+        if (!primSpec) {
+            success = false;
+            continue;
+        }
+        if (!prim.kind.IsEmpty()) {
+            primSpec->SetKind(prim.kind);
+        }
+        if (prim.active) {
+            primSpec->SetActive(*prim.active);
+        }
+        if (prim.instanceable) {
+            primSpec->SetInstanceable(*prim.instanceable);
+        }
+        if (!prim.purpose.IsEmpty()) {
+            success = set_attribute_spec_value(
+                          editTarget,
+                          create_attribute_spec(
+                              primSpec, kPurpose,
+                              PXR_NS::SdfValueTypeNames->Token,
+                              PXR_NS::SdfVariabilityUniform),
+                          prim.purpose, PXR_NS::UsdTimeCode::Default()) &&
+                      success;
+        }
+        if (!prim.applied_schemas.empty()) {
+            prepend_api_schemas(primSpec, prim.applied_schemas);
+        }
+        for (auto const& attribute : prim.attributes) {
+            auto attrSpec = create_attribute_spec(
+                primSpec, attribute.name, attribute.type_name,
+                attribute.variability, attribute.custom);
+            if (!attrSpec) {
+                success = false;
+                continue;
+            }
+            if (!attribute.interpolation.IsEmpty()) {
+                attrSpec->SetInfo(kInterpolation,
+                                  PXR_NS::VtValue(attribute.interpolation));
+            }
+            if (!attribute.value.IsEmpty()) {
+                success = set_attribute_spec_value(editTarget, attrSpec,
+                                                   attribute.value,
+                                                   attribute.time) &&
+                          success;
+            }
+        }
+    }
+    return success;
+}
+
+} // namespace USDUtils
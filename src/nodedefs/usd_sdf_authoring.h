@@ -0,0 +1,194 @@
+//-
+// Copyright 2024 Autodesk, Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+//+
+
+/// \file  usd_sdf_authoring.h
+/// \brief Helpers authoring scene description directly in the layer of the
+/// stage edit target.
+///
+/// Going through the Sdf API skips the per-edit UsdStage bookkeeping. Used
+/// inside an SdfChangeBlock, any number of specs can be authored and the
+/// stage is only recomposed once, when the block closes. The authored prims
+/// can't be queried on the stage before that.
+
+#ifndef ADSK_USD_SDF_AUTHORING_H
+#define ADSK_USD_SDF_AUTHORING_H
+
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/sdf/attributeSpec.h>
+#include <pxr/usd/sdf/layer.h>
+#include <pxr/usd/sdf/primSpec.h>
+#include <pxr/usd/sdf/types.h>
+#include <pxr/usd/usd/attribute.h>
+#include <pxr/usd/usd/common.h>
+#include <pxr/usd/usd/editTarget.h>
+#include <pxr/usd/usd/stage.h>
+#include <pxr/usd/usd/timeCode.h>
+BIFUSD_WARNING_POP
+
+#include <optional>
+#include <vector>
+
+namespace USDUtils {
+
+/// \brief Description of an attribute authored by \ref author_prim_specs.
+struct AttributeSpecDefinition {
+    PXR_NS::TfToken          name;
+    PXR_NS::SdfValueTypeName type_name;
+    /// The value to author. No value is authored if empty.
+    PXR_NS::VtValue        value;
+    PXR_NS::UsdTimeCode    time        = PXR_NS::UsdTimeCode::Default();
+    bool                   custom      = true;
+    PXR_NS::SdfVariability variability = PXR_NS::SdfVariabilityVarying;
+    /// The primvar interpolation metadata. Not authored if empty.
+    PXR_NS::TfToken interpolation;
+};
+
+/// \brief Description of a prim authored by \ref author_prim_specs.
+struct PrimSpecDefinition {
+    PXR_NS::SdfPath      path;
+    PXR_NS::TfToken      type_name;
+    PXR_NS::SdfSpecifier specifier = PXR_NS::SdfSpecifierDef;
+    /// The model kind. Not authored if empty.
+    PXR_NS::TfToken kind;
+    /// The imageable purpose. Not authored if empty.
+    PXR_NS::TfToken purpose;
+    /// Whether the prim is active. Not authored if not set.
+    std::optional<bool> active;
+    /// Whether the prim is instanceable. Not authored if not set.
+    std::optional<bool>                  instanceable;
+    PXR_NS::TfTokenVector                applied_schemas;
+    std::vector<AttributeSpecDefinition> attributes;
+};
+
+/// \brief Returns the spec of the prim at the given path in the edit target
+/// layer of the stage, creating it if needed.
+///
+/// Like UsdStage::DefinePrim, the prim gets a "def" specifier and the given
+/// type name (if not empty), and its ancestors not already defined on the
+/// stage get a "def" specifier.
+/// \param [in] stage The stage.
+/// \param [in] path The path of the prim, in the stage namespace.
+/// \param [in] type_name The type name of the prim. Can be empty.
+/// \returns The prim spec, or an invalid handle if the path can't be mapped
+///     to the edit target.
+PXR_NS::SdfPrimSpecHandle define_prim_spec(const PXR_NS::UsdStagePtr& stage,
+                                           const PXR_NS::SdfPath&     path,
+                                           const PXR_NS::TfToken& type_name);
+
+/// \brief Same as \ref define_prim_spec, with the given specifier. The
+/// ancestors are only defined if the specifier is "def".
+///
+/// Like UsdStage::OverridePrim, an "over" specifier does not replace the
+/// specifier of an existing prim spec.
+PXR_NS::SdfPrimSpecHandle create_prim_spec(const PXR_NS::UsdStagePtr& stage,
+                                           const PXR_NS::SdfPath&     path,
+                                           const PXR_NS::SdfSpecifier specifier,
+                                           const PXR_NS::TfToken& type_name);
+
+/// \brief Returns the spec of the named attribute of a prim spec, creating
+/// it if needed.
+PXR_NS::SdfAttributeSpecHandle create_attribute_spec(
+    const PXR_NS::SdfPrimSpecHandle& prim_spec,
+    const PXR_NS::TfToken&           name,
+    const PXR_NS::SdfValueTypeName&  type_name,
+    const PXR_NS::SdfVariability variability = PXR_NS::SdfVariabilityVarying,
+    const bool                   custom      = false);
+
+/// \brief Declaration of an attribute of a stage.
+///
+/// The Usd API must not be used inside an SdfChangeBlock, so the attributes
+/// to author in a block are queried on the stage before it is opened.
+struct AttributeDeclaration {
+    PXR_NS::SdfPath          prim_path;
+    PXR_NS::TfToken          name;
+    PXR_NS::SdfValueTypeName type_name;
+    PXR_NS::SdfVariability   variability = PXR_NS::SdfVariabilityVarying;
+    bool                     custom      = false;
+};
+
+/// \brief Returns the declaration of an attribute of a stage.
+AttributeDeclaration get_attribute_declaration(
+    const PXR_NS::UsdAttribute& attribute);
+
+/// \brief Returns the spec of the declared attribute in the edit target layer
+/// of the stage, creating it and an "over" spec of its prim if needed.
+PXR_NS::SdfAttributeSpecHandle create_attribute_spec(
+    const PXR_NS::UsdStagePtr&  stage,
+    const AttributeDeclaration& declaration);
+
+/// \brief Sets the default value of an attribute spec, or its time sample
+/// if the time is not the default time.
+///
+/// Like UsdAttribute::Set, the time is mapped through the time offset of the
+/// edit target.
+template <typename T>
+bool set_attribute_spec_value(const PXR_NS::UsdEditTarget&          edit_target,
+                              const PXR_NS::SdfAttributeSpecHandle& attr_spec,
+                              const T&                              value,
+                              const PXR_NS::UsdTimeCode             time) {
+    if (!attr_spec) return false;
+    if (time.IsDefault()) {
+        return attr_spec->SetDefaultValue(PXR_NS::VtValue(value));
+    }
+    auto const layerTime =
+        edit_target.GetMapFunction().GetTimeOffset().GetInverse() *
+        time.GetValue();
+    attr_spec->GetLayer()->SetTimeSample(attr_spec->GetPath(), layerTime,
+                                         value);
+    return true;
+}
+
+/// \brief Sets the explicit targets of the named relationship of a prim
+/// spec, creating the relationship spec if needed.
+///
+/// Like UsdRelationship::SetTargets, the targets are given in the stage
+/// namespace and mapped to the edit target.
+bool set_relationship_spec_targets(const PXR_NS::UsdEditTarget&     edit_target,
+                                   const PXR_NS::SdfPrimSpecHandle& prim_spec,
+                                   const PXR_NS::TfToken&           name,
+                                   const PXR_NS::SdfPathVector&     targets,
+                                   const bool custom = false);
+
+/// \brief Adds a target to the named relationship of a prim spec, creating
+/// the relationship spec if needed.
+///
+/// Like UsdRelationship::AddTarget, the target is given as an absolute path
+/// in the stage namespace, mapped to the edit target, and moved to the given
+/// position if it is already in the list.
+bool add_relationship_spec_target(const PXR_NS::UsdEditTarget&     edit_target,
+                                  const PXR_NS::SdfPrimSpecHandle& prim_spec,
+                                  const PXR_NS::TfToken&           name,
+                                  const PXR_NS::SdfPath&           target,
+                                  const PXR_NS::UsdListPosition    position,
+                                  const bool custom = false);
+
+/// \brief Authors the given prims and their attributes in the edit target
+/// layer of the stage, in a single SdfChangeBlock.
+///
+/// The stage is recomposed once, after all the prims are authored.
+/// \param [in] stage The stage.
+/// \param [in] prims The prims to author. Parents don't need to be listed
+///     before their children.
+/// \returns false if any of the prims or attributes could not be authored.
+bool author_prim_specs(const PXR_NS::UsdStagePtr&             stage,
+                       const std::vector<PrimSpecDefinition>& prims);
+
+} // namespace USDUtils
+
+#endif // ADSK_USD_SDF_AUTHORING_H
@@ -18,14 +18,24 @@
 
 #include <Amino/Core/String.h>
 #include <Amino/Core/StringView.h>
+#include <BifrostUsd/StageCache.h>
+#include <BifrostUsd/VariantContext.h>
+#include <pxr/base/tf/patternMatcher.h>
+#include <pxr/base/tf/stringUtils.h>
 #include <pxr/usd/usd/prim.h>
+#include <pxr/usd/usd/primRange.h>
 #include <pxr/usd/usd/stageCacheContext.h>
 #include <pxr/usd/usdGeom/metrics.h>
 #include <pxr/usd/usdUtils/stageCache.h>
 
+#include <optional>
+#include <stdexcept>
 #include <string>
+#include <vector>
 
 #include "return_guard.h"
+#include "usd_prim_query.h"
+#include "usd_sdf_authoring.h"
 #include "usd_type_converter.h"
 #include "usd_utils.h"
 
@@ -74,6 +84,60 @@ Amino::MutablePtr<BifrostUsd::Stage> createStage(Args&&... args) {
 Amino::MutablePtr<BifrostUsd::Stage> createInvalidStage() {
     return createStage(BifrostUsd::Stage::Invalid{});
 }
+PXR_NS::UsdStagePopulationMask makePopulationMask(
+    const Amino::Array<Amino::String>& mask) {
+    PXR_NS::UsdStagePopulationMask populationMask;
+    for (size_t i = 0; i < mask.size(); ++i) {
+        if (mask[i].empty()) {
+            continue;
+        }
+        PXR_NS::SdfPath path(mask[i].c_str());
+        if (path.IsAbsoluteRootOrPrimPath()) {
+            populationMask.Add(path);
+        }
+    }
+    return populationMask;
+}
+
+/// Resolve the given prim paths and glob patterns into the set of matching
+/// prim paths of the stage, including the prims that are not loaded.
+/// If withDescendants is true, the descendants of a matching prim are not
+/// tested since they are loaded or unloaded with it.
+PXR_NS::SdfPathSet resolvePayloadPaths(BifrostUsd::Stage&                 stage,
+                                       const Amino::Array<Amino::String>& paths,
+                                       bool withDescendants) {
+    PXR_NS::SdfPathSet                    result;
+    std::vector<PXR_NS::TfPatternMatcher> matchers;
+    for (size_t i = 0; i < paths.size(); ++i) {
+        std::string path = resolve_prim_path(paths[i], stage).c_str();
+        if (path.find_first_of("*?") != std::string::npos) {
+            matchers.emplace_back(glob_to_regex(path), true, false);
+        } else {
+            PXR_NS::SdfPath sdfPath(path);
+            if (sdfPath.IsAbsoluteRootOrPrimPath()) {
+                result.insert(sdfPath);
+            }
+        }
+    }
+    if (matchers.empty()) {
+        return result;
+    }
+
+    auto range = stage->TraverseAll();
+    for (auto it = range.begin(); it != range.end(); ++it) {
+        const auto& primPath = it->GetPath();
+        for (const auto& matcher : matchers) {
+            if (matcher.Match(primPath.GetString())) {
+                result.insert(primPath);
+                if (withDescendants) {
+                    it.PruneChildren();
+                }
+                break;
+            }
+        }
+    }
+    return result;
+}
 int getRootOrReversedSublayerIndex(
     const BifrostUsd::Stage&    stage,
     const int                   sublayer_index) {
@@ -88,6 +152,207 @@ int getRootOrReversedSublayerIndex(
     }
     return USDUtils::reversedSublayerIndex(sublayer_index, numLayers);
 }
+
+using ObjectArray = Amino::Array<Amino::Ptr<Bifrost::Object>>;
+
+template <typename T>
+bool getProperty(const Bifrost::Object& object, const char* key, T& value) {
+    auto any = object.getProperty(key);
+    if (auto payload = Amino::any_cast<T>(&any)) {
+        value = *payload;
+        return true;
+    }
+    return false;
+}
+
+/// Get an optional property. Throws if the property is set with another type,
+/// rather than ignoring it.
+template <typename T>
+bool getOptionalProperty(const Bifrost::Object& object,
+                         const char*            key,
+                         T&                     value) {
+    if (!object.hasProperty(key)) return false;
+    if (!getProperty(object, key, value)) {
+        throw std::invalid_argument(std::string("Unsupported type for ") + key);
+    }
+    return true;
+}
+
+std::optional<bool> toOptionalBool(const BifrostUsd::ActivatePrim active) {
+    switch (active) {
+        case BifrostUsd::ActivatePrim::None: return std::nullopt;
+        case BifrostUsd::ActivatePrim::False: return false;
+        case BifrostUsd::ActivatePrim::True: return true;
+    }
+    return std::nullopt;
+}
+
+std::optional<bool> toOptionalBool(
+    const BifrostUsd::InstanceablePrim instanceable) {
+    switch (instanceable) {
+        case BifrostUsd::InstanceablePrim::None: return std::nullopt;
+        case BifrostUsd::InstanceablePrim::False: return false;
+        case BifrostUsd::InstanceablePrim::True: return true;
+    }
+    return std::nullopt;
+}
+
+bool hasObjects(const Bifrost::Object& object, const char* key) {
+    Amino::Ptr<ObjectArray> objects;
+    return getProperty(object, key, objects) && objects && !objects->empty();
+}
+
+/// Read an attribute definition created by define_usd_attribute. Throws if
+/// the attribute can't be authored without going through add_to_stage.
+USDUtils::AttributeSpecDefinition readAttributeDefinition(
+    const Bifrost::Object& definition) {
+    Amino::String name;
+    getProperty(definition, "name", name);
+    BifrostUsd::SdfValueTypeName type;
+    if (name.empty() || !getProperty(definition, "type", type)) {
+        throw std::invalid_argument("Attribute definition without name or type");
+    }
+
+    Amino::String targetPrim;
+    if (getProperty(definition, "target_prim", targetPrim) &&
+        !targetPrim.empty()) {
+        throw std::invalid_argument(
+            std::string("Attribute connections are not supported: ") +
+            name.c_str());
+    }
+
+    USDUtils::AttributeSpecDefinition attribute;
+    attribute.type_name = GetSdfValueTypeName(type);
+
+    std::string attributeName = name.c_str();
+    BifrostUsd::UsdGeomPrimvarInterpolation interpolation;
+    if (getProperty(definition, "interpolation", interpolation)) {
+        // Same as UsdGeomPrimvarsAPI::CreatePrimvar
+        attribute.interpolation = GetUsdGeomPrimvarInterpolation(interpolation);
+        attribute.custom        = false;
+        if (!PXR_NS::TfStringStartsWith(attributeName, "primvars:")) {
+            attributeName = "primvars:" + attributeName;
+        }
+    } else {
+        bool custom = false;
+        getProperty(definition, "custom", custom);
+        attribute.custom = custom;
+    }
+    attribute.name = PXR_NS::TfToken(attributeName);
+
+    if (definition.hasProperty("value") &&
+        !AnyToVtValue(definition.getProperty("value"), attribute.type_name,
+                      attribute.value)) {
+        throw std::invalid_argument(
+            "Can't convert the value of attribute " + attributeName + " to " +
+            attribute.type_name.GetAsToken().GetString());
+    }
+
+    bool  useFrame = false;
+    float frame    = 0.f;
+    if (getProperty(definition, "use_frame", useFrame) && useFrame &&
+        getProperty(definition, "frame", frame)) {
+        attribute.time = PXR_NS::UsdTimeCode(static_cast<double>(frame));
+    }
+    return attribute;
+}
+
+/// Read a prim definition created by define_usd_prim, and the definitions of
+/// its children, into prim spec definitions. Throws if the definition can't
+/// be authored without going through add_to_stage.
+void readPrimDefinition(const Bifrost::Object&                     definition,
+                        const std::string&                         parentPath,
+                        std::vector<USDUtils::PrimSpecDefinition>& prims) {
+    Amino::String primPath;
+    getProperty(definition, "prim_path", primPath);
+
+    // Like add_to_stage, the paths of the children already include the path
+    // of their parent definition, and all are relative to the parent path.
+    std::string path = parentPath;
+    while (!path.empty() && path.back() == '/') {
+        path.pop_back();
+    }
+    if (primPath.empty() || primPath.front() != '/') {
+        path += '/';
+    }
+    path += primPath.c_str();
+
+    USDUtils::PrimSpecDefinition prim;
+    prim.path = PXR_NS::SdfPath(path);
+    if (!prim.path.IsAbsolutePath() || !prim.path.IsPrimPath()) {
+        throw std::invalid_argument("Invalid prim path: " + path);
+    }
+    if (hasObjects(definition, "arcs") ||
+        hasObjects(definition, "relationships") ||
+        hasObjects(definition, "variant_sets") ||
+        definition.hasProperty("variant_selection")) {
+        throw std::invalid_argument(
+            "Composition arcs, relationships and variant sets are not "
+            "supported: " +
+            path);
+    }
+
+    // Like add_to_stage, the type is only set on "def" prims, and classes
+    // are created with UsdStage::CreateClassPrim, which only accepts root
+    // prims.
+    auto specifier = BifrostUsd::SdfSpecifier::Def;
+    getOptionalProperty(definition, "specifier", specifier);
+    prim.specifier = GetSdfSpecifier(specifier);
+    if (prim.specifier == PXR_NS::SdfSpecifierDef) {
+        Amino::String type;
+        getProperty(definition, "type", type);
+        prim.type_name = PXR_NS::TfToken(type.c_str());
+    } else if (prim.specifier == PXR_NS::SdfSpecifierClass &&
+               !prim.path.IsRootPrimPath()) {
+        throw std::invalid_argument("Class prims must be root prims: " + path);
+    }
+
+    auto kind = BifrostUsd::ModelKind::None;
+    getOptionalProperty(definition, "kind", kind);
+    prim.kind = GetModelKind(kind);
+
+    auto active = BifrostUsd::ActivatePrim::None;
+    getOptionalProperty(definition, "active", active);
+    prim.active = toOptionalBool(active);
+
+    auto instanceable = BifrostUsd::InstanceablePrim::None;
+    getOptionalProperty(definition, "instanceable", instanceable);
+    prim.instanceable = toOptionalBool(instanceable);
+
+    BifrostUsd::ImageablePurpose purpose = BifrostUsd::ImageablePurpose::Default;
+    if (getProperty(definition, "purpose", purpose) &&
+        purpose != BifrostUsd::ImageablePurpose::Default) {
+        prim.purpose = GetImageablePurpose(purpose);
+    }
+
+    Amino::Ptr<Amino::Array<Amino::String>> schemas;
+    if (getProperty(definition, "applied_schema_names", schemas) && schemas) {
+        for (auto const& schema : *schemas) {
+            if (!schema.empty()) {
+                prim.applied_schemas.emplace_back(schema.c_str());
+            }
+        }
+    }
+
+    Amino::Ptr<ObjectArray> attributes;
+    if (getProperty(definition, "attributes", attributes) && attributes) {
+        for (auto const& attribute : *attributes) {
+            if (attribute) {
+                prim.attributes.push_back(readAttributeDefinition(*attribute));
+            }
+        }
+    }
+    prims.push_back(std::move(prim));
+
+    Amino::Ptr<ObjectArray> children;
+    if (getProperty(definition, "children", children) && children) {
+        for (auto const& child : *children) {
+            if (child) {
+                readPrimDefinition(*child, parentPath, prims);
+            }
+        }
+    }
+}
 } // namespace
 
 void USD::Stage::open_stage_from_layer(
@@ -102,16 +367,10 @@ void USD::Stage::open_stage_from_layer(
                 return createStage(BifrostUsd::Stage());
             }
 
-            // Make the masked paths
-            std::vector<PXR_NS::SdfPath> paths;
-            for (size_t i = 0; i < mask.size(); ++i) {
-                std::string path(mask[i].c_str());
-                paths.push_back(PXR_NS::SdfPath(path));
-            }
-            return paths.empty()
+            auto populationMask = makePopulationMask(mask);
+            return populationMask.IsEmpty()
                        ? createStage(root_layer, load)
-                       : createStage(root_layer,
-                                     PXR_NS::UsdStagePopulationMask(paths), load);
+                       : createStage(root_layer, populationMask, load);
         }();
 
         // Reverse the given index to match the order of sublayers
@@ -134,6 +393,7 @@ void USD::Stage::open_stage_from_layer(
 /// \todo BIFROST-6406 open_from_cache/send_to_cache don't seem safe in a
 /// value semantics world. It should likely be reviewed.
 void USD::Stage::open_stage_from_cache(const Amino::long_t              id,
+                                       const Amino::Array<Amino::String>& mask,
                                        const int                        layer_index,
                                        Amino::Ptr<BifrostUsd::Stage>&   stage) {
     auto stage_returns = createReturnGuard(stage);
@@ -143,10 +403,13 @@ void USD::Stage::open_stage_from_cache(const Amino::long_t              id,
             PXR_NS::UsdStageCache::Id::FromLongInt(static_cast<long int>(id)));
 
         if (pxr_stage) {
-            auto stage_ =
-                Amino::newMutablePtr<BifrostUsd::Stage>(BifrostUsd::Layer(
-                    pxr_stage->GetRootLayer()->GetIdentifier().c_str(),
-                    pxr_stage->GetRootLayer()->GetDisplayName().c_str()));
+            BifrostUsd::Layer rootLayer(
+                pxr_stage->GetRootLayer()->GetIdentifier().c_str(),
+                pxr_stage->GetRootLayer()->GetDisplayName().c_str());
+            auto populationMask = makePopulationMask(mask);
+            auto stage_ = populationMask.IsEmpty()
+                              ? createStage(rootLayer)
+                              : createStage(rootLayer, populationMask);
 
             // Reverse the given index to match the order of sublayers
             // in the Pixar USD Layer:
@@ -167,6 +430,59 @@ void USD::Stage::open_stage_from_cache(const Amino::long_t              id,
     assert(stage);
 }
 
+void USD::Stage::get_stage_cache_entries(
+    const Amino::long_t                             id,
+    Amino::MutablePtr<Amino::Array<Amino::long_t>>& ids,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& root_layers,
+    Amino::MutablePtr<Amino::Array<Amino::ulong_t>>& estimated_bytes) {
+    ids             = Amino::newMutablePtr<Amino::Array<Amino::long_t>>();
+    root_layers     = Amino::newMutablePtr<Amino::Array<Amino::String>>();
+    estimated_bytes = Amino::newMutablePtr<Amino::Array<Amino::ulong_t>>();
+
+    try {
+        for (const auto& entry : BifrostUsd::StageCache::getCacheEntries()) {
+            if (id >= 0 && entry.id != id) continue;
+            ids->push_back(entry.id);
+            root_layers->push_back(entry.rootLayer);
+            estimated_bytes->push_back(entry.estimatedBytes);
+        }
+    } catch (std::exception& e) {
+        log_exception("get_stage_cache_entries", e);
+    }
+}
+
+void USD::Stage::load_payloads(BifrostUsd::Stage&                 stage,
+                               const Amino::Array<Amino::String>& paths,
+                               const bool load_descendants) {
+    if (!stage) return;
+
+    try {
+        auto loadSet = resolvePayloadPaths(stage, paths, load_descendants);
+        if (!loadSet.empty()) {
+            stage->LoadAndUnload(loadSet, PXR_NS::SdfPathSet(),
+                                 load_descendants
+                                     ? PXR_NS::UsdLoadWithDescendants
+                                     : PXR_NS::UsdLoadWithoutDescendants);
+        }
+    } catch (std::exception& e) {
+        log_exception("load_payloads", e);
+    }
+}
+
+void USD::Stage::unload_payloads(BifrostUsd::Stage&                 stage,
+                                 const Amino::Array<Amino::String>& paths) {
+    if (!stage) return;
+
+    try {
+        auto unloadSet = resolvePayloadPaths(stage, paths, true);
+        if (!unloadSet.empty()) {
+            stage->LoadAndUnload(PXR_NS::SdfPathSet(), unloadSet);
+        }
+    } catch (std::exception& e) {
+        log_exception("unload_payloads", e);
+    }
+}
+
 void USD::Stage::set_edit_layer(BifrostUsd::Stage&   stage,
                                 const int            layer_index,
                                 const Amino::String& layer_display_name) {
@@ -293,6 +609,43 @@ void USD::Stage::set_stage_time_code(BifrostUsd::Stage& stage,
     }
 }
 
+bool USD::Stage::add_to_stage_fast(
+    BifrostUsd::Stage&                               stage,
+    const Amino::Array<Amino::Ptr<Bifrost::Object>>& prim_definitions,
+    const Amino::String&                             parent_path) {
+    if (!stage) return false;
+
+    try {
+        std::vector<USDUtils::PrimSpecDefinition> prims;
+        for (auto const& definition : prim_definitions) {
+            if (definition) {
+                readPrimDefinition(*definition, parent_path.c_str(), prims);
+            }
+        }
+        if (prims.empty()) return true;
+
+        return BifrostUsd::WithVariantContext(stage, [&]() {
+            // Like UsdStage::CreateClassPrim, a defined prim can't become a
+            // class
+            for (auto const& prim : prims) {
+                if (prim.specifier != PXR_NS::SdfSpecifierClass) continue;
+                auto existing = stage->GetPrimAtPath(prim.path);
+                if (existing && existing.IsDefined() &&
+                    !existing.IsAbstract()) {
+                    throw std::invalid_argument(
+                        "A prim is already defined at " +
+                        prim.path.GetString());
+                }
+            }
+            return USDUtils::author_prim_specs(stage.getStagePtr(), prims);
+        });
+
+    } catch (std::exception& e) {
+        log_exception("add_to_stage_fast", e);
+    }
+    return false;
+}
+
 bool USD::Stage::set_stage_metadata(BifrostUsd::Stage& stage,
                                     const Amino::String& key,
                                     const Amino::String& value) {
@@ -415,10 +768,13 @@ bool USD::Stage::get_stage_metadata(
     return false;
 }
 
-bool USD::Stage::save_stage(const BifrostUsd::Stage& stage,
-                            const Amino::String&       file) {
+bool USD::Stage::save_stage(
+    const BifrostUsd::Stage&                        stage,
+    const Amino::String&                            file,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& written_files) {
+    written_files = Amino::newMutablePtr<Amino::Array<Amino::String>>();
     try {
-        return stage && (file.empty() ? stage.save() : stage.save(file));
+        return stage && stage.save(file, written_files.get());
 
     } catch (std::exception& e) {
         log_exception("save_stage", e);
@@ -462,13 +818,31 @@ void USD::Stage::export_stage_to_string(const BifrostUsd::Stage& stage,
     }
 }
 
-bool USD::Stage::export_stage_to_file(const BifrostUsd::Stage& stage,
-                                      const Amino::String&       file) {
+void USD::Stage::export_stage_to_binary(
+    const BifrostUsd::Stage&                         stage,
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>>& result) {
+    result = Amino::newMutablePtr<Amino::Array<Amino::uchar_t>>();
+    if (!stage) return;
+
+    try {
+        // Export the flattened stage
+        *result = BifrostUsd::Layer::toBinary(stage->Flatten());
+    } catch (std::exception& e) {
+        log_exception("export_stage_to_binary", e);
+    }
+}
+
+bool USD::Stage::export_stage_to_file(
+    const BifrostUsd::Stage&                        stage,
+    const Amino::String&                            file,
+    Amino::MutablePtr<Amino::Array<Amino::String>>& written_files) {
+    written_files = Amino::newMutablePtr<Amino::Array<Amino::String>>();
     if (!stage) return false;
 
     try {
-        // Export the stage
-        return stage->Export(file.c_str());
+        // Export the flattened stage, unless it did not change since it was
+        // last exported to this file
+        return stage.exportToFile(file, written_files.get());
 
     } catch (std::exception& e) {
         log_exception("export_stage_to_file", e);
@@ -49,6 +49,7 @@ void open_stage_from_layer(const BifrostUsd::Layer&                 root_layer,
 
 USD_NODEDEF_DECL
 void open_stage_from_cache(const Amino::long_t              id AMINO_ANNOTATE("Amino::Port metadata=[{UiSoftMin, string, 0}]"),
+                           const Amino::Array<Amino::String>& mask,
                            const int                        layer_index
                                AMINO_ANNOTATE("Amino::Port value=-1"),
                            Amino::Ptr<BifrostUsd::Stage>&   stage)
@@ -56,6 +57,27 @@ void open_stage_from_cache(const Amino::long_t              id AMINO_ANNOTATE("A
                      "USD_Stage_open_stage_from_cache.md",
                      "usd_stage.svg");
 
+USD_NODEDEF_DECL
+void get_stage_cache_entries(const Amino::long_t id AMINO_ANNOTATE("Amino::Port value=-1"),
+                             Amino::MutablePtr<Amino::Array<Amino::long_t>>& ids,
+                             Amino::MutablePtr<Amino::Array<Amino::String>>& root_layers,
+                             Amino::MutablePtr<Amino::Array<Amino::ulong_t>>& estimated_bytes)
+    USDNODE_DOC_ICON("get_stage_cache_entries",
+                     "USD_Stage_get_stage_cache_entries.md",
+                     "usd_stage.svg");
+
+USD_NODEDEF_DECL
+void load_payloads(BifrostUsd::Stage&                  stage USDPORT_INOUT("out_stage"),
+                   const Amino::Array<Amino::String>&  paths,
+                   const bool                          load_descendants
+                       AMINO_ANNOTATE("Amino::Port value=true"))
+    USDNODE_DOC_ICON("load_payloads", "USD_Stage_load_payloads.md", "usd_stage.svg");
+
+USD_NODEDEF_DECL
+void unload_payloads(BifrostUsd::Stage&                 stage USDPORT_INOUT("out_stage"),
+                     const Amino::Array<Amino::String>& paths)
+    USDNODE_DOC_ICON("unload_payloads", "USD_Stage_unload_payloads.md", "usd_stage.svg");
+
 USD_NODEDEF_DECL
 void set_edit_layer(BifrostUsd::Stage&  stage USDPORT_INOUT("out_stage"),
                     const int            layer_index,
@@ -93,6 +115,15 @@ void set_stage_time_code(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
                          const float        end)
     USDNODE_DOC_ICON("set_stage_time_code", "USD_Stage_set_stage_time_code.md", "usd_stage.svg");
 
+USD_NODEDEF_DECL
+bool add_to_stage_fast(BifrostUsd::Stage& stage USDPORT_INOUT("out_stage"),
+                       const Amino::Array<Amino::Ptr<Bifrost::Object>>& prim_definitions,
+                       const Amino::String& parent_path)
+    USDNODE_DOC_ICON_X("add_to_stage_fast",
+                       "USD_Stage_add_to_stage_fast.md",
+                       "usd_add.svg",
+                       "outName=success");
+
 #define SET_STAGE_METADATA(VALUE_TYPE)                                 \
     USD_NODEDEF_DECL                                                   \
     bool set_stage_metadata(                                           \
@@ -132,7 +163,8 @@ GET_STAGE_METADATA(Amino::Ptr<Bifrost::Object>)
 
 USD_NODEDEF_DECL
 bool save_stage(const BifrostUsd::Stage&    stage,
-                const Amino::String&        file  USDNODE_FILE_BROWSER_SAVE)
+                const Amino::String&        file  USDNODE_FILE_BROWSER_SAVE,
+                Amino::MutablePtr<Amino::Array<Amino::String>>& written_files)
     USDNODE_INTERNAL("save_stage", "USD_Stage_save_stage.md");
 
 USD_NODEDEF_DECL
@@ -149,9 +181,18 @@ void export_stage_to_string(const BifrostUsd::Stage&    stage,
                      "USD_Stage_export_stage_to_string.md",
                      "usd_default.svg");
 
+USD_NODEDEF_DECL
+void export_stage_to_binary(
+    const BifrostUsd::Stage&                         stage,
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>>& result)
+    USDNODE_DOC_ICON("export_stage_to_binary",
+                     "USD_Stage_export_stage_to_binary.md",
+                     "usd_default.svg");
+
 USD_NODEDEF_DECL
 bool export_stage_to_file(const BifrostUsd::Stage&  stage,
-                          const Amino::String&      file  USDNODE_FILE_BROWSER_SAVE)
+                          const Amino::String&      file  USDNODE_FILE_BROWSER_SAVE,
+                          Amino::MutablePtr<Amino::Array<Amino::String>>& written_files)
     USDNODE_DOC_ICON_X("export_stage_to_file",
                        "USD_Stage_export_stage_to_file.md",
                        "write_usd_file.svg",
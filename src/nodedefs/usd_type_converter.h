@@ -18,11 +18,22 @@
 #define ADSK_USD_TYPE_CONVERTER_H
 
 #include <Amino/Core/Array.h>
+#include <Amino/Core/Ptr.h>
 #include <Amino/Core/String.h>
 #include <Bifrost/Math/Types.h>
 
 #include "usd_utils.h"
 
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/base/vt/array.h>
+BIFUSD_WARNING_POP
+
+#include <cstring>
+#include <type_traits>
+
 namespace USDTypeConverters {
 
 // Traits to get Pxr types from Bifrost/Amino types.
@@ -83,6 +94,57 @@ template <typename T>
 struct BfType<PXR_NS::VtArray<T>>
     : public type_identity<Amino::Array<BfType_t<T>>> {};
 
+// Traits to identify the Bifrost/Amino types having the same memory layout as
+// their Pxr counterparts. Arrays of such types can be converted with a single
+// memory copy, or shared without copy.
+
+template <typename T>
+struct IsLayoutCompatible : public std::false_type {};
+
+#define DEFINE_LAYOUT_COMPATIBLE(BF_TYPE)                                   \
+    template <>                                                             \
+    struct IsLayoutCompatible<BF_TYPE>                                      \
+        : public std::integral_constant<                                    \
+              bool, sizeof(BF_TYPE) == sizeof(PxrType_t<BF_TYPE>) &&        \
+                        alignof(BF_TYPE) == alignof(PxrType_t<BF_TYPE>) &&  \
+                        std::is_trivially_copyable<BF_TYPE>::value &&       \
+                        std::is_trivially_copyable<PxrType_t<BF_TYPE>>::value> {};
+DEFINE_LAYOUT_COMPATIBLE(Amino::bool_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::uchar_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::int_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::uint_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::long_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::ulong_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::float_t)
+DEFINE_LAYOUT_COMPATIBLE(Amino::double_t)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::float2)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::float3)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::float4)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::double2)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::double3)
+DEFINE_LAYOUT_COMPATIBLE(Bifrost::Math::double4)
+#undef DEFINE_LAYOUT_COMPATIBLE
+
+template <typename T>
+constexpr bool IsLayoutCompatible_v = IsLayoutCompatible<T>::value;
+
+/// \brief Foreign data source keeping an Amino array alive for as long as
+/// VtArrays are sharing its storage.
+template <typename T>
+class AminoArrayDataSource : public PXR_NS::Vt_ArrayForeignDataSource {
+public:
+    explicit AminoArrayDataSource(Amino::Ptr<Amino::Array<T>> array)
+        : PXR_NS::Vt_ArrayForeignDataSource(&AminoArrayDataSource::detached),
+          m_array(std::move(array)) {}
+
+private:
+    static void detached(PXR_NS::Vt_ArrayForeignDataSource* self) {
+        delete static_cast<AminoArrayDataSource*>(self);
+    }
+
+    Amino::Ptr<Amino::Array<T>> m_array;
+};
+
 // Type conversions from Pxr types to Bifrost/Amino types, and vice versa.
 
 template <typename T>
@@ -149,8 +211,14 @@ template <typename T>
 inline BfType_t<PXR_NS::VtArray<T>> fromPxr(const PXR_NS::VtArray<T>& src) {
     BfType_t<PXR_NS::VtArray<T>> dest;
     dest.resize(src.size());
-    for (size_t i = 0; i < src.size(); i++) {
-        dest[i] = fromPxr(src[i]);
+    if constexpr (IsLayoutCompatible_v<BfType_t<T>>) {
+        if (!src.empty()) {
+            std::memcpy(&dest[0], src.cdata(), src.size() * sizeof(T));
+        }
+    } else {
+        for (size_t i = 0; i < src.size(); i++) {
+            dest[i] = fromPxr(src[i]);
+        }
     }
     return dest;
 }
@@ -221,13 +289,44 @@ inline PxrType_t<Bifrost::Object> toPxr(const Bifrost::Object& src) {
 template <typename T>
 inline PxrType_t<Amino::Array<T>> toPxr(const Amino::Array<T>& src) {
     PxrType_t<Amino::Array<T>> dest;
-    dest.resize(src.size());
-    for (size_t i = 0; i < src.size(); i++) {
-        dest[i] = toPxr(src[i]);
+    if constexpr (IsLayoutCompatible_v<T>) {
+        if (!src.empty()) {
+            auto const* first = reinterpret_cast<const PxrType_t<T>*>(&src[0]);
+            dest.assign(first, first + src.size());
+        }
+    } else {
+        dest.resize(src.size());
+        for (size_t i = 0; i < src.size(); i++) {
+            dest[i] = toPxr(src[i]);
+        }
     }
     return dest;
 }
 
+/// \brief Converts a shared Amino array to a VtArray.
+///
+/// If the element types have the same memory layout, the returned VtArray
+/// shares the storage of the Amino array, which is kept alive until all the
+/// VtArrays (including the ones stored in USD layers) referring to it are
+/// destroyed. The VtArray copies the data if it is ever modified. Otherwise
+/// the elements are converted one by one.
+template <typename T>
+inline PxrType_t<Amino::Array<T>> toPxr(const Amino::Ptr<Amino::Array<T>>& src) {
+    if (!src || src->empty()) {
+        return {};
+    }
+    if constexpr (IsLayoutCompatible_v<T>) {
+        // The data is never modified through the VtArray: it is detached
+        // (copied) on the first mutable access.
+        auto* data = const_cast<PxrType_t<T>*>(
+            reinterpret_cast<const PxrType_t<T>*>(&(*src)[0]));
+        return PxrType_t<Amino::Array<T>>(new AminoArrayDataSource<T>(src),
+                                          data, src->size());
+    } else {
+        return toPxr(*src);
+    }
+}
+
 } // namespace USDTypeConverters
 
 #endif // ADSK_USD_TYPE_CONVERTER_H
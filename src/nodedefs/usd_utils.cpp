@@ -14,13 +14,18 @@
 //+
 
 #include "usd_utils.h"
+#include "usd_prim_lookup_cache.h"
 #include "usd_type_converter.h"
 
 #include <Amino/Core/String.h>
 #include <Bifrost/Object/Object.h>
 
+#include <pxr/base/work/loops.h>
 #include <pxr/pxr.h>
+#include <pxr/usd/kind/registry.h>
 #include <pxr/usd/usd/tokens.h>
+#include <cstring>
+#include <typeindex>
 #include <unordered_map>
 
 using namespace USDTypeConverters;
@@ -203,23 +208,26 @@ Amino::String ToString(const Bifrost::Math::double3& vec) {
 
 void copy_array(const Amino::Array<Bifrost::Math::float3>& src,
                 PXR_NS::VtVec3fArray&                         dest) {
-    dest.resize(src.size());
-    for (size_t i = 0; i < src.size(); ++i) {
-        dest[i][0] = src[i].x;
-        dest[i][1] = src[i].y;
-        dest[i][2] = src[i].z;
+    static_assert(sizeof(Bifrost::Math::float3) == sizeof(PXR_NS::GfVec3f),
+                  "float3 and GfVec3f must have the same layout");
+    if (src.empty()) {
+        dest.clear();
+        return;
     }
+    auto const* first = reinterpret_cast<const PXR_NS::GfVec3f*>(&src[0]);
+    dest.assign(first, first + src.size());
 }
 
 void copy_array(const Amino::Array<Bifrost::Math::float4>& src,
                 PXR_NS::VtVec4fArray&                         dest) {
-    dest.resize(src.size());
-    for (size_t i = 0; i < src.size(); ++i) {
-        dest[i][0] = src[i].x;
-        dest[i][1] = src[i].y;
-        dest[i][2] = src[i].z;
-        dest[i][3] = src[i].w;
+    static_assert(sizeof(Bifrost::Math::float4) == sizeof(PXR_NS::GfVec4f),
+                  "float4 and GfVec4f must have the same layout");
+    if (src.empty()) {
+        dest.clear();
+        return;
     }
+    auto const* first = reinterpret_cast<const PXR_NS::GfVec4f*>(&src[0]);
+    dest.assign(first, first + src.size());
 }
 
 void copy_array(const Amino::Array<Bifrost::Math::float4>& src,
@@ -233,14 +241,65 @@ void copy_array(const Amino::Array<Bifrost::Math::float4>& src,
     }
 }
 
+void transform_points(const PXR_NS::VtVec3fArray&          src,
+                      const PXR_NS::GfMatrix4d*            xform,
+                      Amino::Array<Bifrost::Math::float3>& dest) {
+    static_assert(sizeof(Bifrost::Math::float3) == sizeof(PXR_NS::GfVec3f),
+                  "float3 and GfVec3f must have the same layout");
+    dest.resize(src.size());
+    if (src.empty()) return;
+
+    auto const* in  = reinterpret_cast<const float*>(src.cdata());
+    auto*       out = &dest[0].x;
+    if (!xform) {
+        std::memcpy(out, in, src.size() * sizeof(PXR_NS::GfVec3f));
+        return;
+    }
+
+    // Points are row vectors: p' = p * M. The translation is in the last
+    // row, and the last column (projection) is ignored.
+    double const* m = xform->GetArray();
+    auto kernel = [in, out, m](size_t begin, size_t end) {
+        double const m00 = m[0], m01 = m[1], m02 = m[2];
+        double const m10 = m[4], m11 = m[5], m12 = m[6];
+        double const m20 = m[8], m21 = m[9], m22 = m[10];
+        double const m30 = m[12], m31 = m[13], m32 = m[14];
+        for (size_t i = begin; i < end; ++i) {
+            double const x = in[3 * i];
+            double const y = in[3 * i + 1];
+            double const z = in[3 * i + 2];
+            out[3 * i] =
+                static_cast<float>(x * m00 + y * m10 + z * m20 + m30);
+            out[3 * i + 1] =
+                static_cast<float>(x * m01 + y * m11 + z * m21 + m31);
+            out[3 * i + 2] =
+                static_cast<float>(x * m02 + y * m12 + z * m22 + m32);
+        }
+    };
+
+    constexpr size_t grainSize = 64 * 1024;
+    if (src.size() <= grainSize) {
+        kernel(0, src.size());
+    } else {
+        PXR_NS::WorkParallelForN(src.size(), kernel, grainSize);
+    }
+}
+
 PXR_NS::UsdPrim get_prim_at_path(const Amino::String&       path,
                               const BifrostUsd::Stage& stage) {
     assert(stage.isValid());
     if (stage.isValid()) {
+        auto stagePtr = const_cast<BifrostUsd::Stage&>(stage).getStagePtr();
+        auto cache    = stage.dataCache().get<PrimLookupCache>(
+            PrimLookupCache::isInvalidatedBy);
+        // Absolute paths are looked up as is, without building a resolved
+        // copy of the path.
+        if (!path.empty() && path.front() == '/') {
+            return cache->getPrim(stagePtr, {path.c_str(), path.size()});
+        }
         Amino::String prim_path = resolve_prim_path(path, stage);
-
-        auto prim = stage->GetPrimAtPath(PXR_NS::SdfPath(prim_path.c_str()));
-        return prim;
+        return cache->getPrim(stagePtr,
+                              {prim_path.c_str(), prim_path.size()});
     }
 
     return PXR_NS::UsdPrim(); // invalid prim
@@ -424,77 +483,210 @@ PXR_NS::TfToken GetSdfFieldKey(const Amino::String& key) {
     return PXR_NS::TfToken(key.c_str());
 }
 
+namespace {
+template <typename T>
+bool anyToPxr(const Amino::Any& any, PXR_NS::VtValue& value) {
+    if (auto payload = Amino::any_cast<T>(&any)) {
+        value = PXR_NS::VtValue(toPxr(*payload));
+        return true;
+    }
+    if (auto arrayPayload = Amino::any_cast<Amino::Ptr<Amino::Array<T>>>(&any)) {
+        value = PXR_NS::VtValue(toPxr(*arrayPayload));
+        return true;
+    }
+    return false;
+}
+
+/// Sets the value of a dictionary entry as a property of a Bifrost object.
+using SetPropertyFn = void (*)(const std::string&     key,
+                               const PXR_NS::VtValue& value,
+                               Bifrost::Object&       object);
+
+template <typename T>
+void setScalarProperty(const std::string&     key,
+                       const PXR_NS::VtValue& value,
+                       Bifrost::Object&       object) {
+    object.setProperty(key, fromPxr(value.UncheckedGet<T>()));
+}
+
+template <typename T>
+void setArrayProperty(const std::string&     key,
+                      const PXR_NS::VtValue& value,
+                      Bifrost::Object&       object) {
+    using Array = BfType_t<PXR_NS::VtArray<T>>;
+    Amino::Ptr<Array> array = Amino::newMutablePtr<Array>(
+        fromPxr(value.UncheckedGet<PXR_NS::VtArray<T>>()));
+    object.setProperty(key, std::move(array));
+}
+
+void setDictionaryProperty(const std::string&     key,
+                           const PXR_NS::VtValue& value,
+                           Bifrost::Object&       object) {
+    object.setProperty(key, USDUtils::VtDictionaryToBifrostObject(
+                                value.UncheckedGet<PXR_NS::VtDictionary>()));
+}
+
+void setTokenProperty(const std::string&     key,
+                      const PXR_NS::VtValue& value,
+                      Bifrost::Object&       object) {
+    object.setProperty(
+        key, Amino::String(value.UncheckedGet<PXR_NS::TfToken>().GetText()));
+}
+
+void setTokenArrayProperty(const std::string&     key,
+                           const PXR_NS::VtValue& value,
+                           Bifrost::Object&       object) {
+    auto const& tokens = value.UncheckedGet<PXR_NS::VtTokenArray>();
+    auto strings = Amino::newMutablePtr<Amino::Array<Amino::String>>(tokens.size());
+    for (size_t i = 0; i < tokens.size(); ++i) {
+        (*strings)[i] = tokens[i].GetText();
+    }
+    object.setProperty(key, Amino::Ptr<Amino::Array<Amino::String>>(
+                                std::move(strings)));
+}
+
+void setAssetPathProperty(const std::string&     key,
+                          const PXR_NS::VtValue& value,
+                          Bifrost::Object&       object) {
+    object.setProperty(
+        key,
+        fromPxr(value.UncheckedGet<PXR_NS::SdfAssetPath>().GetAssetPath()));
+}
+
+/// The conversion of the dictionary values to Bifrost object properties,
+/// keyed on the type held by the values.
+const std::unordered_map<std::type_index, SetPropertyFn>& setPropertyTable() {
+    static const std::unordered_map<std::type_index, SetPropertyFn> table = [] {
+        std::unordered_map<std::type_index, SetPropertyFn> result;
+#define ADD_SET_PROPERTY(BF_TYPE, PXR_TYPE)                        \
+    result.emplace(typeid(PXR_TYPE), &setScalarProperty<PXR_TYPE>); \
+    result.emplace(typeid(PXR_NS::VtArray<PXR_TYPE>),               \
+                   &setArrayProperty<PXR_TYPE>);
+        FOR_EACH_TYPE_PAIR(ADD_SET_PROPERTY)
+#undef ADD_SET_PROPERTY
+        result.emplace(typeid(PXR_NS::VtDictionary), &setDictionaryProperty);
+        result.emplace(typeid(PXR_NS::TfToken), &setTokenProperty);
+        result.emplace(typeid(PXR_NS::VtTokenArray), &setTokenArrayProperty);
+        result.emplace(typeid(PXR_NS::SdfAssetPath), &setAssetPathProperty);
+        return result;
+    }();
+    return table;
+}
+
+template <typename QUAT, typename VEC4>
+PXR_NS::VtValue vec4ToQuat(const PXR_NS::VtValue& value) {
+    // Bifrost quaternions are stored as (x, y, z, w)
+    auto toQuat = [](const VEC4& v) {
+        return QUAT(v[3], v[0], v[1], v[2]);
+    };
+    if (value.IsHolding<VEC4>()) {
+        return PXR_NS::VtValue(toQuat(value.UncheckedGet<VEC4>()));
+    }
+    auto const& src = value.UncheckedGet<PXR_NS::VtArray<VEC4>>();
+    PXR_NS::VtArray<QUAT> dest(src.size());
+    for (size_t i = 0; i < src.size(); ++i) {
+        dest[i] = toQuat(src[i]);
+    }
+    return PXR_NS::VtValue(dest);
+}
+} // namespace
+
 PXR_NS::VtDictionary BifrostObjectToVtDictionary(const Bifrost::Object& object) {
     PXR_NS::VtDictionary result;
     auto keys = object.keys();
     for (const auto& objKey : *keys) {
         auto any = object.getProperty(objKey);
 
+        PXR_NS::VtValue value;
         if (auto dictionaryPayload =
                 Amino::any_cast<Amino::Ptr<Bifrost::Object>>(&any)) {
-            result[objKey.c_str()] =
-                BifrostObjectToVtDictionary(**dictionaryPayload);
-        } else if (auto floatPayload = Amino::any_cast<Amino::float_t>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*floatPayload));
-        } else if (auto doublePayload =
-                       Amino::any_cast<Amino::double_t>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*doublePayload));
-        } else if (auto stringPayload = Amino::any_cast<Amino::String>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*stringPayload));
-        } else if (auto intPayload = Amino::any_cast<Amino::int_t>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*intPayload));
-        } else if (auto longPayload = Amino::any_cast<Amino::long_t>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*longPayload));
-        } else if (auto boolPayload = Amino::any_cast<Amino::bool_t>(&any)) {
-            result[objKey.c_str()] = PXR_NS::VtValue(toPxr(*boolPayload));
+            value = BifrostObjectToVtDictionary(**dictionaryPayload);
+        } else {
+            // Stop at the first type holding the property.
+#define ANY_TO_PXR(BF_TYPE, PXR_TYPE) anyToPxr<BF_TYPE>(any, value) ||
+            bool const converted = FOR_EACH_TYPE_PAIR(ANY_TO_PXR) false;
+#undef ANY_TO_PXR
+            if (!converted) continue;
         }
+        result[objKey.c_str()].Swap(value);
     }
     return result;
 }
 
-template <class T>
-void setObjectProperty(const std::string&  key,
-                       const PXR_NS::VtValue& value,
-                       Bifrost::Object&    object) {
-    if (value.IsHolding<T>()) {
-        object.setProperty(key, fromPxr<T>(value.UncheckedGet<T>()));
+auto VtDictionaryToBifrostObject(const PXR_NS::VtDictionary& dict)
+    -> decltype(Bifrost::createObject()) {
+    auto        result = Bifrost::createObject();
+    auto const& table  = setPropertyTable();
+    for (auto const& item : dict) {
+        auto it = table.find(std::type_index(item.second.GetTypeid()));
+        if (it != table.end()) {
+            it->second(item.first, item.second, *result);
+        }
     }
+    return result;
 }
 
-template <>
-void setObjectProperty<std::string>(const std::string&  key,
-                                    const PXR_NS::VtValue& value,
-                                    Bifrost::Object&    object) {
-    if (value.IsHolding<std::string>()) {
-        object.setProperty(key,
-                           fromPxr(value.UncheckedGet<std::string>()));
-    }
-}
+bool AnyToVtValue(const Amino::Any&               any,
+                  const PXR_NS::SdfValueTypeName& type_name,
+                  PXR_NS::VtValue&                value) {
+#define ANY_TO_PXR(BF_TYPE, PXR_TYPE) anyToPxr<BF_TYPE>(any, value) ||
+    bool const converted = FOR_EACH_TYPE_PAIR(ANY_TO_PXR) false;
+#undef ANY_TO_PXR
+    if (!converted) return false;
 
-template <>
-void setObjectProperty<PXR_NS::VtDictionary>(const std::string&  key,
-                                          const PXR_NS::VtValue& value,
-                                          Bifrost::Object&    object) {
-    if (value.IsHolding<PXR_NS::VtDictionary>()) {
-        object.setProperty(key,
-                           VtDictionaryToBifrostObject(
-                               value.UncheckedGet<PXR_NS::VtDictionary>()));
-    }
-}
+    auto const& type = type_name.GetType();
+    if (value.GetType() == type) return true;
 
-auto VtDictionaryToBifrostObject(const PXR_NS::VtDictionary& dict)
-    -> decltype(Bifrost::createObject()) {
-    auto result = Bifrost::createObject();
-    for (auto const& item : dict) {
-        setObjectProperty<PXR_NS::VtDictionary>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::int_t>>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::long_t>>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::float_t>>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::double_t>>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::bool_t>>(item.first, item.second, *result);
-        setObjectProperty<PxrType_t<Amino::String>>(item.first, item.second, *result);
+    // Conversions not registered as VtValue casts
+    if (value.IsHolding<std::string>()) {
+        auto const& str = value.UncheckedGet<std::string>();
+        if (type_name == PXR_NS::SdfValueTypeNames->Token) {
+            value = PXR_NS::VtValue(PXR_NS::TfToken(str));
+            return true;
+        } else if (type_name == PXR_NS::SdfValueTypeNames->Asset) {
+            value = PXR_NS::VtValue(PXR_NS::SdfAssetPath(str));
+            return true;
+        }
+    } else if (value.IsHolding<PXR_NS::VtStringArray>()) {
+        auto const& strings = value.UncheckedGet<PXR_NS::VtStringArray>();
+        if (type_name == PXR_NS::SdfValueTypeNames->TokenArray) {
+            PXR_NS::VtTokenArray tokens(strings.size());
+            for (size_t i = 0; i < strings.size(); ++i) {
+                tokens[i] = PXR_NS::TfToken(strings[i]);
+            }
+            value = PXR_NS::VtValue(tokens);
+            return true;
+        } else if (type_name == PXR_NS::SdfValueTypeNames->AssetArray) {
+            PXR_NS::VtArray<PXR_NS::SdfAssetPath> assets(strings.size());
+            for (size_t i = 0; i < strings.size(); ++i) {
+                assets[i] = PXR_NS::SdfAssetPath(strings[i]);
+            }
+            value = PXR_NS::VtValue(assets);
+            return true;
+        }
+    } else if (value.IsHolding<PXR_NS::GfVec4f>() ||
+               value.IsHolding<PXR_NS::VtVec4fArray>()) {
+        if (type_name == PXR_NS::SdfValueTypeNames->Quatf ||
+            type_name == PXR_NS::SdfValueTypeNames->QuatfArray) {
+            value = vec4ToQuat<PXR_NS::GfQuatf, PXR_NS::GfVec4f>(value);
+            return true;
+        } else if (type_name == PXR_NS::SdfValueTypeNames->Quath ||
+                   type_name == PXR_NS::SdfValueTypeNames->QuathArray) {
+            value = vec4ToQuat<PXR_NS::GfQuath, PXR_NS::GfVec4f>(value);
+            return true;
+        }
+    } else if (value.IsHolding<PXR_NS::GfVec4d>() ||
+               value.IsHolding<PXR_NS::VtVec4dArray>()) {
+        if (type_name == PXR_NS::SdfValueTypeNames->Quatd ||
+            type_name == PXR_NS::SdfValueTypeNames->QuatdArray) {
+            value = vec4ToQuat<PXR_NS::GfQuatd, PXR_NS::GfVec4d>(value);
+            return true;
+        }
     }
-    return result;
+
+    // Numeric and vector conversions (float to half, int to double...)
+    value = PXR_NS::VtValue::CastToTypeid(value, type.GetTypeid());
+    return !value.IsEmpty();
 }
 
 size_t reversedSublayerIndex(const size_t index, const size_t numLayers) {
@@ -555,4 +747,25 @@ PXR_NS::TfToken GetExpansionRule(const BifrostUsd::ExpansionRule rule) {
     }
     return PXR_NS::TfToken();
 }
+
+PXR_NS::SdfSpecifier GetSdfSpecifier(const BifrostUsd::SdfSpecifier specifier) {
+    switch (specifier) {
+        case BifrostUsd::SdfSpecifier::Def: return PXR_NS::SdfSpecifierDef;
+        case BifrostUsd::SdfSpecifier::Over: return PXR_NS::SdfSpecifierOver;
+        case BifrostUsd::SdfSpecifier::Class: return PXR_NS::SdfSpecifierClass;
+    }
+    return PXR_NS::SdfSpecifierDef;
+}
+
+PXR_NS::TfToken GetModelKind(const BifrostUsd::ModelKind kind) {
+    switch (kind) {
+        case BifrostUsd::ModelKind::None: return PXR_NS::TfToken();
+        case BifrostUsd::ModelKind::Assembly: return PXR_NS::KindTokens->assembly;
+        case BifrostUsd::ModelKind::Component: return PXR_NS::KindTokens->component;
+        case BifrostUsd::ModelKind::Group: return PXR_NS::KindTokens->group;
+        case BifrostUsd::ModelKind::SubComponent:
+            return PXR_NS::KindTokens->subcomponent;
+    }
+    return PXR_NS::TfToken();
+}
 } // namespace USDUtils
@@ -36,7 +36,6 @@ BIFUSD_WARNING_DISABLE_MSC(4003)
 #include <pxr/usd/usdGeom/primvarsAPI.h>
 #include <pxr/usd/usdGeom/xformCommonAPI.h>
 #include <pxr/usd/usdShade/tokens.h>
-#include <pxr/usd/usdVol/volume.h>
 
 BIFUSD_WARNING_POP
 
@@ -75,21 +74,14 @@ void copy_array(const Amino::Array<Bifrost::Math::float4>& src,
 void copy_array(const Amino::Array<Bifrost::Math::float4>& src,
                 PXR_NS::VtQuathArray&                         dest);
 
-template <class VOLUME_FIELD_ASSET_TYPE>
-void set_volume_field_relationship(VOLUME_FIELD_ASSET_TYPE& fieldPrim,
-                                   const PXR_NS::TfToken&      field_name,
-                                   const PXR_NS::TfToken&      relationship_name,
-                                   const PXR_NS::SdfAssetPath& field_path,
-                                   PXR_NS::UsdVolVolume&       volume,
-                                   const double             frame) {
-    auto fieldNameAttr = fieldPrim.CreateFieldNameAttr();
-    fieldNameAttr.Set(field_name, frame);
-
-    auto filePathAttr = fieldPrim.CreateFilePathAttr();
-    filePathAttr.Set(field_path, frame);
-
-    volume.CreateFieldRelationship(relationship_name, fieldPrim.GetPath());
-}
+/// \brief Copies points into a Bifrost array, transforming them by the given
+/// matrix if it is not null.
+///
+/// The transformation and the copy are done in a single pass. Large arrays
+/// are processed in parallel.
+void transform_points(const PXR_NS::VtVec3fArray&          src,
+                      const PXR_NS::GfMatrix4d*            xform,
+                      Amino::Array<Bifrost::Math::float3>& dest);
 
 PXR_NS::UsdPrim get_prim_at_path(const Amino::String&     path,
                                  const BifrostUsd::Stage& stage);
@@ -119,6 +111,17 @@ PXR_NS::VtDictionary BifrostObjectToVtDictionary(const Bifrost::Object& object);
 auto VtDictionaryToBifrostObject(const PXR_NS::VtDictionary& dict)
     -> decltype(Bifrost::createObject());
 
+/// \brief Converts the value held by an Amino::Any to a VtValue of the given
+/// value type.
+///
+/// Supports the Amino scalar, vector and matrix types, and shared arrays of
+/// them. Strings are converted to tokens or asset paths, and float4/double4
+/// to quaternions, as required by the value type.
+/// \returns false if the held type is not supported or can't be converted.
+bool AnyToVtValue(const Amino::Any&               any,
+                  const PXR_NS::SdfValueTypeName& type_name,
+                  PXR_NS::VtValue&                value);
+
 USD_NODEDEF_DECL
 size_t reversedSublayerIndex(const size_t index, const size_t numLayers);
 USD_NODEDEF_DECL
@@ -132,6 +135,11 @@ PXR_NS::TfToken GetMaterialPurpose(const BifrostUsd::MaterialPurpose purpose);
 
 PXR_NS::TfToken GetExpansionRule(const BifrostUsd::ExpansionRule rule);
 
+PXR_NS::SdfSpecifier GetSdfSpecifier(const BifrostUsd::SdfSpecifier specifier);
+
+/// \returns The kind token, empty for BifrostUsd::ModelKind::None.
+PXR_NS::TfToken GetModelKind(const BifrostUsd::ModelKind kind);
+
 } // namespace USDUtils
 
 #endif // ADSK_USD_UTILS_H
@@ -37,9 +37,13 @@ class StringList;
 #include <BifrostUsd/Prim.h>
 #include <BifrostUsd/Stage.h>
 
-#include <map>
+#include <algorithm>
+#include <atomic>
 #include <mutex>
 #include <string>
+#include <unordered_map>
+#include <utility>
+#include <vector>
 
 // Note: To silence warnings coming from USD library
 #include <bifusd/config/CfgWarningMacros.h>
@@ -47,6 +51,8 @@ BIFUSD_WARNING_PUSH
 BIFUSD_WARNING_DISABLE_MSC(4003)
 BIFUSD_WARNING_DISABLE_MSC(4267)
 BIFUSD_WARNING_DISABLE_MSC(4244)
+#include <pxr/base/tf/envSetting.h>
+#include <pxr/base/work/loops.h>
 #include <pxr/usd/usd/attribute.h>
 #include <pxr/usd/usd/prim.h>
 #include <pxr/usd/usd/primRange.h>
@@ -54,6 +60,14 @@ BIFUSD_WARNING_DISABLE_MSC(4244)
 
 BIFUSD_WARNING_POP
 
+PXR_NAMESPACE_OPEN_SCOPE
+TF_DEFINE_ENV_SETTING(BIFROST_USD_WATCHPOINT_STATS_PRIM_BUDGET,
+                      1000000,
+                      "Maximum number of prims visited to compute the stats of "
+                      "a watched USD stage. Past this budget, the stats are "
+                      "approximate. 0 means no limit.");
+PXR_NAMESPACE_CLOSE_SCOPE
+
 using CallBackFunc = BifrostGraph::Executor::Watchpoint::CallBack;
 using Watcher      = BifrostGraph::Executor::Watchpoint::Watcher;
 using Records      = BifrostGraph::Executor::Watchpoint::Records;
@@ -80,7 +94,8 @@ Amino::String const kLayerStackDesc =
     "The layer stack, organized from strongest to weakest";
 Amino::String const kStats = "stats";
 Amino::String const kStatsDesc =
-    "Some stats about te file, like num of prims, meshes etc";
+    "Some stats about the file, like num of prims, meshes etc. On large "
+    "stages, the stats are approximate past a budget of visited prims";
 
 // Attribute watchpoint
 Amino::String const kIsDefined      = "is_defined";
@@ -195,6 +210,71 @@ std::string convertToString(const PXR_NS::VtValue& value) {
     return result;
 }
 
+/// \brief Counts of the prims of a stage, and of their types and applied API
+/// schemas.
+struct StageStats {
+    using TypeCounts =
+        std::unordered_map<PXR_NS::TfToken, size_t, PXR_NS::TfToken::HashFunctor>;
+
+    size_t     primCount   = 0;
+    bool       approximate = false;
+    TypeCounts typeCounts;
+};
+
+/// \brief Computes the stats of all the prims of the stage, traversing the
+/// children of the pseudo root in parallel.
+///
+/// If budget is not 0, the traversal stops after about budget prims and the
+/// stats are flagged as approximate.
+StageStats computeStageStats(PXR_NS::UsdStage const& stage, size_t budget) {
+    // Number of prims visited between two checks of the budget.
+    constexpr size_t kBatchSize = 1024;
+
+    auto const children = stage.GetPseudoRoot().GetAllChildren();
+    std::vector<PXR_NS::UsdPrim> roots(children.begin(), children.end());
+
+    StageStats          stats;
+    std::mutex          mutex;
+    std::atomic<size_t> visited{0};
+    std::atomic<bool>   stopped{false};
+
+    PXR_NS::WorkParallelForN(roots.size(), [&](size_t begin, size_t end) {
+        StageStats local;
+        size_t     batch = 0;
+        for (size_t i = begin; i < end && !stopped; ++i) {
+            for (auto const& prim : PXR_NS::UsdPrimRange::AllPrims(roots[i])) {
+                if (budget > 0 && ++batch == kBatchSize) {
+                    batch = 0;
+                    if (visited.fetch_add(kBatchSize) + kBatchSize >= budget) {
+                        stopped = true;
+                    }
+                }
+                if (stopped) break;
+
+                ++local.primCount;
+                auto const& typeInfo = prim.GetPrimTypeInfo();
+                auto const& typeName = typeInfo.GetTypeName();
+                if (!typeName.IsEmpty()) {
+                    ++local.typeCounts[typeName];
+                }
+                for (auto const& schema : typeInfo.GetAppliedAPISchemas()) {
+                    if (!schema.IsEmpty() && schema != typeName) {
+                        ++local.typeCounts[schema];
+                    }
+                }
+            }
+        }
+
+        std::lock_guard<std::mutex> lock(mutex);
+        stats.primCount += local.primCount;
+        for (auto const& item : local.typeCounts) {
+            stats.typeCounts[item.first] += item.second;
+        }
+    });
+    stats.approximate = stopped;
+    return stats;
+}
+
 ///-------------------------------------------------------------------------
 /// \brief The usd watchpoint client data
 /// \{
@@ -220,7 +300,27 @@ public:
     void record(ArrayOfPrims const& prims);
 
 private:
-    Records& m_recordedValues;
+    /// \brief State of a recorded stage. The records of a stage are not
+    /// computed again while its state does not change.
+    struct StageState {
+        const PXR_NS::UsdStage*      stage       = nullptr;
+        size_t                       fingerprint = 0;
+        Amino::String                lastModifiedPrim;
+        BifrostUsd::VariantSelection variantSelection;
+        Amino::String                filePath;
+        Amino::String                originalFilePath;
+
+        bool operator==(StageState const& other) const {
+            return stage == other.stage && fingerprint == other.fingerprint &&
+                   lastModifiedPrim == other.lastModifiedPrim &&
+                   variantSelection == other.variantSelection &&
+                   filePath == other.filePath &&
+                   originalFilePath == other.originalFilePath;
+        }
+    };
+
+    Records&   m_recordedValues;
+    StageState m_stageState;
 };
 
 void addXmlElement(std::ostringstream& oss,
@@ -319,6 +419,22 @@ void USDWPClientData::record(ArrayOfLayers const& layers) {
 }
 
 void USDWPClientData::record(StagePtr const& stage) {
+    StageState state;
+    if (stage && *stage) {
+        state.stage            = &stage->get();
+        state.fingerprint      = stage->contentFingerprint();
+        state.lastModifiedPrim = stage->last_modified_prim;
+        state.variantSelection = stage->variantSelection();
+        if (auto const& rootLayer = stage->getRootLayer()) {
+            state.filePath         = rootLayer->getFilePath();
+            state.originalFilePath = rootLayer->getOriginalFilePath();
+        }
+    }
+    if (state.stage && state == m_stageState) {
+        // The stage did not change since it was last recorded.
+        return;
+    }
+    m_stageState = std::move(state);
     m_recordedValues.clear();
 
     if (stage && *stage) {
@@ -353,37 +469,24 @@ void USDWPClientData::record(StagePtr const& stage) {
             layerStackString.append("\n");
         }
         m_recordedValues.set(kLayerStack, layerStackString);
-        unsigned int                        prim_count = 0;
-        std::map<std::string, unsigned int> prim_types;
-
-        /// Is TraverseAll() really non const?
-        for (const auto& prim :
-             const_cast<PXR_NS::UsdStage&>(stage->get()).TraverseAll()) {
-            prim_count++;
-            const PXR_NS::UsdPrimTypeInfo& prim_typeinfo = prim.GetPrimTypeInfo();
-            std::string                 type_name = prim_typeinfo.GetTypeName();
-            if (!type_name.empty()) {
-                if (prim_types.find(type_name) == prim_types.end()) {
-                    prim_types[type_name] = 1;
-                } else {
-                    prim_types[type_name] = prim_types[type_name] + 1;
-                }
-            }
-
-            const PXR_NS::TfTokenVector& applied_schemas =
-                prim_typeinfo.GetAppliedAPISchemas();
-            for (std::string const& schema : applied_schemas) {
-                if (!schema.empty() && schema != type_name) {
-                    if (prim_types.find(schema) == prim_types.end()) {
-                        prim_types[schema] = 1;
-                    } else {
-                        prim_types[schema] = prim_types[type_name] + 1;
-                    }
-                }
-            }
+        auto const budget = PXR_NS::TfGetEnvSetting(
+            PXR_NS::BIFROST_USD_WATCHPOINT_STATS_PRIM_BUDGET);
+        auto const stats = computeStageStats(
+            stage->get(), static_cast<size_t>(std::max(budget, 0)));
+
+        std::vector<std::pair<std::string, size_t>> prim_types;
+        prim_types.reserve(stats.typeCounts.size());
+        for (auto const& item : stats.typeCounts) {
+            prim_types.emplace_back(item.first.GetString(), item.second);
         }
+        std::sort(prim_types.begin(), prim_types.end());
+
         std::ostringstream ss;
-        ss << "Total Prims: " << std::to_string(prim_count) << std::endl;
+        ss << "Total Prims: " << std::to_string(stats.primCount);
+        if (stats.approximate) {
+            ss << " (approximate, stopped after the prim budget)";
+        }
+        ss << std::endl;
         for (auto const& prim_type : prim_types) {
             ss << prim_type.first
                << " Count: " << std::to_string(prim_type.second) << std::endl;
@@ -17,6 +17,7 @@
 #include <Amino/Core/String.h>
 #include <Bifrost/FileUtils/FileUtils.h>
 #include <gtest/gtest.h>
+#include <pxr/base/arch/fileSystem.h>
 #include <pxr/base/arch/systemInfo.h>
 #include <pxr/usd/ar/defaultResolver.h>
 #include <utils/test/testUtils.h>
@@ -408,6 +409,49 @@ TEST(BifrostUsdTests, createLayerWithSubLayer) {
         << subFilename.c_str() << "`\n";
 }
 
+TEST(BifrostUsdTests, exportToFileSkipsUnchangedLayers) {
+    const Amino::String rootFilename{"exportToFileSkipsUnchangedLayers_root.usd"};
+    Amino::String       rootFilePath = getThisTestOutputPath(rootFilename);
+    BifrostUsd::Layer   rootLayer{rootFilename};
+    rootLayer.setFilePath(rootFilePath);
+
+    std::vector<Amino::String> subFilePaths;
+    for (int i = 0; i < 4; ++i) {
+        BifrostUsd::Layer sublayer{getResourcePath("helloworld.usd"), ""};
+        subFilePaths.push_back(getThisTestOutputPath(
+            ("exportToFileSkipsUnchangedLayers_sublayer" + std::to_string(i) +
+             ".usd")
+                .c_str()));
+        sublayer.setFilePath(subFilePaths.back());
+        ASSERT_TRUE(rootLayer.insertSubLayer(sublayer));
+    }
+
+    ASSERT_TRUE(rootLayer.exportToFile());
+    ASSERT_TRUE(Bifrost::FileUtils::filePathExists(rootFilePath));
+    std::vector<double> modificationTimes;
+    for (const auto& subFilePath : subFilePaths) {
+        double modificationTime = 0.0;
+        ASSERT_TRUE(PXR_NS::ArchGetModificationTime(subFilePath.c_str(),
+                                                    &modificationTime));
+        modificationTimes.push_back(modificationTime);
+    }
+
+    // Exporting again must not rewrite the unchanged sublayers
+    ASSERT_TRUE(rootLayer.exportToFile());
+    for (size_t i = 0; i < subFilePaths.size(); ++i) {
+        double modificationTime = 0.0;
+        ASSERT_TRUE(PXR_NS::ArchGetModificationTime(subFilePaths[i].c_str(),
+                                                    &modificationTime));
+        EXPECT_EQ(modificationTimes[i], modificationTime);
+    }
+
+    // A sublayer file removed from the disk must be written again
+    ASSERT_TRUE(Bifrost::FileUtils::removeAll(subFilePaths[0]));
+    ASSERT_FALSE(Bifrost::FileUtils::filePathExists(subFilePaths[0]));
+    ASSERT_TRUE(rootLayer.exportToFile());
+    ASSERT_TRUE(Bifrost::FileUtils::filePathExists(subFilePaths[0]));
+}
+
 TEST(BifrostUsdTests, getSubLayer) {
     // Open a root SdfLayer with some sub SdfLayers in it:
     const Amino::String rootName = "helloworld.usd";
@@ -20,6 +20,7 @@
 
 #include <BifrostUsd/Layer.h>
 #include <BifrostUsd/Stage.h>
+#include <BifrostUsd/VariantContext.h>
 #include <utils/test/testUtils.h>
 
 #include <gtest/gtest.h>
@@ -86,6 +87,11 @@ void reasonablyEqual(const BifrostUsd::Stage& lhs,
             EXPECT_TRUE(lhs.get().GetEditTarget() == rhs.get().GetEditTarget());
         }
 
+        // the population mask and load rules are preserved in copies
+        EXPECT_TRUE(lhs.get().GetPopulationMask() ==
+                    rhs.get().GetPopulationMask());
+        EXPECT_TRUE(lhs.get().GetLoadRules() == rhs.get().GetLoadRules());
+
         // all other strings
         EXPECT_STREQ(lhs.last_modified_prim.c_str(),
                      rhs.last_modified_prim.c_str());
@@ -278,3 +284,87 @@ TEST(BifrostUsdTests, Stage_ctors) {
         }
     }
 }
+
+TEST(BifrostUsdTests, Stage_variantEditTarget) {
+    BifrostUsd::Stage stage;
+    EXPECT_FALSE(stage.variantEditTarget().IsValid());
+
+    auto prim = stage->DefinePrim(PXR_NS::SdfPath("/prim"));
+    prim.GetVariantSets().AddVariantSet("a").AddVariant("x");
+    stage.variantSelection().add("/prim", "a", "x");
+
+    auto target = stage.variantEditTarget();
+    ASSERT_TRUE(target.IsValid());
+    EXPECT_EQ(target.MapToSpecPath(PXR_NS::SdfPath("/prim/child")),
+              PXR_NS::SdfPath("/prim{a=x}child"));
+    EXPECT_EQ(prim.GetVariantSet("a").GetVariantSelection(), "x");
+
+    // Nested variants are composed once, and the cached EditTarget is reused
+    // without authoring the selections again.
+    {
+        PXR_NS::UsdEditContext ctx(stage.getStagePtr(), target);
+        prim.GetVariantSets().AddVariantSet("b").AddVariant("y");
+    }
+    stage.variantSelection().add("/prim", "b", "y");
+    target = stage.variantEditTarget();
+    EXPECT_EQ(target.MapToSpecPath(PXR_NS::SdfPath("/prim/child")),
+              PXR_NS::SdfPath("/prim{a=x}{b=y}child"));
+
+    LayersDidChangeCounter counter;
+    EXPECT_EQ(stage.variantEditTarget(), target);
+    EXPECT_EQ(counter.count(), 0u);
+
+    // A copied stage composes its own EditTarget
+    BifrostUsd::Stage copy{stage};
+    auto copyTarget = copy.variantEditTarget();
+    ASSERT_TRUE(copyTarget.IsValid());
+    EXPECT_EQ(copyTarget.GetLayer(), copy->GetRootLayer());
+
+    stage.variantSelection().clear();
+    EXPECT_FALSE(stage.variantEditTarget().IsValid());
+}
+
+TEST(BifrostUsdTests, Stage_contentFingerprint) {
+    BifrostUsd::Stage stage;
+    auto const        fingerprint = stage.contentFingerprint();
+    EXPECT_NE(fingerprint, 0u);
+    EXPECT_EQ(stage.contentFingerprint(), fingerprint);
+
+    stage->DefinePrim(PXR_NS::SdfPath("/a"));
+    auto const modified = stage.contentFingerprint();
+    EXPECT_NE(modified, fingerprint);
+    EXPECT_EQ(stage.contentFingerprint(), modified);
+
+    BifrostUsd::Stage invalid{BifrostUsd::Stage::Invalid{}};
+    EXPECT_EQ(invalid.contentFingerprint(), 0u);
+}
+
+TEST(BifrostUsdTests, Stage_dataCache) {
+    struct Data {
+        int value = 0;
+    };
+    auto resyncOnly = [](const PXR_NS::UsdNotice::ObjectsChanged& notice) {
+        return !notice.GetResyncedPaths().empty();
+    };
+
+    BifrostUsd::Stage stage;
+    stage->DefinePrim(PXR_NS::SdfPath("/a"));
+    stage.dataCache().get<Data>()->value = 1;
+    *stage.dataCache().get<int>(resyncOnly) = 2;
+    EXPECT_EQ(stage.dataCache().get<Data>()->value, 1);
+
+    // The copy has its own UsdStage, so it does not share the data
+    BifrostUsd::Stage copy{stage};
+    EXPECT_EQ(copy.dataCache().get<Data>()->value, 0);
+    EXPECT_EQ(*copy.dataCache().get<int>(resyncOnly), 0);
+
+    // An info only change drops the data invalidated by any change
+    stage->GetPrimAtPath(PXR_NS::SdfPath("/a")).SetDocumentation("doc");
+    EXPECT_EQ(stage.dataCache().get<Data>()->value, 0);
+    EXPECT_EQ(*stage.dataCache().get<int>(resyncOnly), 2);
+
+    // A resync drops all the data
+    stage->DefinePrim(PXR_NS::SdfPath("/b"));
+    EXPECT_EQ(*stage.dataCache().get<int>(resyncOnly), 0);
+    EXPECT_EQ(copy.dataCache().get<Data>()->value, 0);
+}
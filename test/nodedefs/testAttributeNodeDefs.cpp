@@ -994,6 +994,146 @@ TEST(PrimNodeDefs, attribute_metadata) {
     }
 }
 
+TEST(AttributeNodeDefs, set_prim_attribute_samples) {
+    auto stage_mut = Amino::newMutablePtr<BifrostUsd::Stage>();
+    auto primPath  = PXR_NS::SdfPath("/a");
+    auto prim      = stage_mut->get().DefinePrim(primPath);
+
+    auto floatAttr = prim.CreateAttribute(PXR_NS::TfToken("my_float"),
+                                          PXR_NS::SdfValueTypeNames->Float);
+    auto pointsAttr = prim.CreateAttribute(
+        PXR_NS::TfToken("my_float3Array"),
+        PXR_NS::SdfValueTypeNames->Float3Array);
+
+    const auto frames = Amino::Array<float>{1.f, 2.f, 3.f};
+
+    // Single values
+    ASSERT_TRUE(USD::Attribute::set_prim_attribute_samples(
+        *stage_mut, primPath.GetText(), "my_float",
+        Amino::Array<float>{10.f, 20.f, 30.f}, frames));
+
+    std::vector<double> times;
+    ASSERT_TRUE(floatAttr.GetTimeSamples(&times));
+    ASSERT_EQ(times, (std::vector<double>{1.0, 2.0, 3.0}));
+    float floatValue = 0.f;
+    ASSERT_TRUE(floatAttr.Get(&floatValue, PXR_NS::UsdTimeCode(2.0)));
+    EXPECT_FLOAT_EQ(floatValue, 20.f);
+
+    // Array values
+    Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>> points(3);
+    for (size_t i = 0; i < points.size(); ++i) {
+        auto const v = static_cast<float>(i);
+        points[i] = Amino::newClassPtr<Amino::Array<Bifrost::Math::float3>>(
+            Amino::Array<Bifrost::Math::float3>{{v, v, v}, {v, 0.f, v}});
+    }
+    ASSERT_TRUE(USD::Attribute::set_prim_attribute_samples(
+        *stage_mut, primPath.GetText(), "my_float3Array", points, frames));
+
+    times.clear();
+    ASSERT_TRUE(pointsAttr.GetTimeSamples(&times));
+    ASSERT_EQ(times.size(), frames.size());
+    PXR_NS::VtVec3fArray pointsValue;
+    ASSERT_TRUE(pointsAttr.Get(&pointsValue, PXR_NS::UsdTimeCode(3.0)));
+    ASSERT_EQ(pointsValue.size(), 2u);
+    EXPECT_EQ(pointsValue[0], PXR_NS::GfVec3f(2.f));
+    EXPECT_EQ(pointsValue[1], PXR_NS::GfVec3f(2.f, 0.f, 2.f));
+
+    // Array values converted to another USD type
+    auto halfAttr = prim.CreateAttribute(PXR_NS::TfToken("my_halfArray"),
+                                         PXR_NS::SdfValueTypeNames->HalfArray);
+    Amino::Array<Amino::Ptr<Amino::Array<float>>> halves(3);
+    for (size_t i = 0; i < halves.size(); ++i) {
+        halves[i] = Amino::newClassPtr<Amino::Array<float>>(
+            Amino::Array<float>{static_cast<float>(i), 0.5f});
+    }
+    ASSERT_TRUE(USD::Attribute::set_prim_attribute_samples(
+        *stage_mut, primPath.GetText(), "my_halfArray", halves, frames));
+
+    PXR_NS::VtHalfArray halfValue;
+    ASSERT_TRUE(halfAttr.Get(&halfValue, PXR_NS::UsdTimeCode(2.0)));
+    ASSERT_EQ(halfValue.size(), 2u);
+    EXPECT_EQ(halfValue[0], PXR_NS::GfHalf(1.f));
+    EXPECT_EQ(halfValue[1], PXR_NS::GfHalf(0.5f));
+
+    // The values and frames sizes must match
+    EXPECT_FALSE(USD::Attribute::set_prim_attribute_samples(
+        *stage_mut, primPath.GetText(), "my_float",
+        Amino::Array<float>{10.f}, frames));
+}
+
+TEST(AttributeNodeDefs, set_and_get_prims_attribute_data) {
+    BifrostUsd::Stage stage;
+
+    Amino::Array<Amino::String> primPaths;
+    for (int i = 0; i < 3; ++i) {
+        auto path = "/prim" + std::to_string(i);
+        auto prim = stage->DefinePrim(PXR_NS::SdfPath(path));
+        prim.CreateAttribute(PXR_NS::TfToken("my_float"),
+                             PXR_NS::SdfValueTypeNames->Float);
+        prim.CreateAttribute(PXR_NS::TfToken("my_color3fArray"),
+                             PXR_NS::SdfValueTypeNames->Color3fArray);
+        primPaths.push_back(path.c_str());
+    }
+    // A prim without the attributes
+    stage->DefinePrim(PXR_NS::SdfPath("/other"));
+
+    // One value per prim
+    LayersDidChangeCounter counter;
+    ASSERT_TRUE(USD::Attribute::set_prims_attribute_data(
+        stage, primPaths, "my_float", Amino::Array<float>{1.f, 2.f, 3.f},
+        false, 0.f));
+    EXPECT_EQ(counter.count(), 1u);
+
+    auto readPaths = primPaths;
+    readPaths.push_back("/other");
+    Amino::MutablePtr<Amino::Array<float>>         floats;
+    Amino::MutablePtr<Amino::Array<Amino::bool_t>> found;
+    EXPECT_FALSE(USD::Attribute::get_prims_attribute_data(
+        stage, readPaths, "my_float", -1.f, 0.f, floats, found));
+    ASSERT_EQ(floats->size(), 4u);
+    ASSERT_EQ(found->size(), 4u);
+    EXPECT_FLOAT_EQ((*floats)[1], 2.f);
+    EXPECT_TRUE((*found)[2]);
+    EXPECT_FLOAT_EQ((*floats)[3], -1.f);
+    EXPECT_FALSE((*found)[3]);
+
+    // A single value for all the prims
+    ASSERT_TRUE(USD::Attribute::set_prims_attribute_data(
+        stage, primPaths, "my_float", Amino::Array<float>{5.f}, true, 2.f));
+    float floatValue = 0.f;
+    ASSERT_TRUE(stage->GetPrimAtPath(PXR_NS::SdfPath("/prim2"))
+                    .GetAttribute(PXR_NS::TfToken("my_float"))
+                    .Get(&floatValue, PXR_NS::UsdTimeCode(2.0)));
+    EXPECT_FLOAT_EQ(floatValue, 5.f);
+
+    // Flat arrays and offsets
+    using float3 = Bifrost::Math::float3;
+    Amino::Array<float3> colors{{1.f, 0.f, 0.f}, {0.f, 1.f, 0.f},
+                                {0.f, 0.f, 1.f}};
+    Amino::Array<Amino::ulong_t> offsets{0, 1, 1, 3};
+    counter.reset();
+    ASSERT_TRUE(USD::Attribute::set_prims_attribute_arrays(
+        stage, primPaths, "my_color3fArray", colors, offsets, false, 0.f));
+    EXPECT_EQ(counter.count(), 1u);
+
+    Amino::MutablePtr<Amino::Array<float3>>         readColors;
+    Amino::MutablePtr<Amino::Array<Amino::ulong_t>> readOffsets;
+    ASSERT_TRUE(USD::Attribute::get_prims_attribute_arrays(
+        stage, primPaths, "my_color3fArray", Amino::Array<float3>{}, 0.f,
+        readColors, readOffsets));
+    ASSERT_EQ(readOffsets->size(), offsets.size());
+    for (size_t i = 0; i < offsets.size(); ++i) {
+        EXPECT_EQ((*readOffsets)[i], offsets[i]);
+    }
+    ASSERT_EQ(readColors->size(), colors.size());
+    EXPECT_EQ((*readColors)[2].z, 1.f);
+
+    // Invalid offsets
+    EXPECT_FALSE(USD::Attribute::set_prims_attribute_arrays(
+        stage, primPaths, "my_color3fArray", colors,
+        Amino::Array<Amino::ulong_t>{0, 1, 4, 3}, false, 0.f));
+}
+
 TEST(AttributeNodeDefs, add_attribute_connection) {
     auto stage          = Amino::newMutablePtr<BifrostUsd::Stage>();
     auto targetPrimPath = PXR_NS::SdfPath("/target");
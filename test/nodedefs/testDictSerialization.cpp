@@ -21,8 +21,16 @@
 #include <BifrostUsd/Stage.h>
 
 #include <Amino/Core/String.h>
+#include <Bifrost/Math/Types.h>
 #include <Bifrost/Object/Object.h>
 
+// Note: To silence warnings coming from USD library
+#include <bifusd/config/CfgWarningMacros.h>
+BIFUSD_WARNING_PUSH
+BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/usd/prim.h>
+BIFUSD_WARNING_POP
+
 TEST(DictionarySerialization, serialize_dictionary_metadata) {
     // This is linked to the following investigation.
     // - Compiling/linking with USD no python
@@ -110,3 +118,71 @@ def Capsule "foo" (
 // clang-format on
     ASSERT_STREQ(result.c_str(), flattenedFileContent);
 }
+
+TEST(DictionarySerialization, metadata_arrays_and_nested_dictionaries) {
+    BifrostUsd::Stage out_stage;
+    Amino::String     path{"/foo"};
+    USD::Prim::create_prim(out_stage, path, "Xform");
+
+    auto ints = Amino::newMutablePtr<Amino::Array<Amino::int_t>>(3);
+    (*ints)[0] = 1;
+    (*ints)[1] = 2;
+    (*ints)[2] = 3;
+    auto names = Amino::newMutablePtr<Amino::Array<Amino::String>>(2);
+    (*names)[0] = "a";
+    (*names)[1] = "b";
+    auto nested = Bifrost::createObject();
+    nested->setProperty("scale", Bifrost::Math::float3{1.f, 2.f, 3.f});
+
+    auto dict = Bifrost::createObject();
+    dict->setProperty("ids",
+                      Amino::Ptr<Amino::Array<Amino::int_t>>(std::move(ints)));
+    dict->setProperty(
+        "names", Amino::Ptr<Amino::Array<Amino::String>>(std::move(names)));
+    dict->setProperty("nested",
+                      Amino::Ptr<Bifrost::Object>(std::move(nested)));
+    ASSERT_TRUE(
+        USD::Prim::set_prim_metadata(out_stage, path, "customData", *dict));
+
+    auto prim       = out_stage->GetPrimAtPath(PXR_NS::SdfPath("/foo"));
+    auto customData = prim.GetCustomData();
+    ASSERT_TRUE(customData["ids"].IsHolding<PXR_NS::VtIntArray>());
+    EXPECT_EQ(customData["ids"].UncheckedGet<PXR_NS::VtIntArray>().size(), 3u);
+    ASSERT_TRUE(customData["names"].IsHolding<PXR_NS::VtStringArray>());
+
+    // Tokens are returned as strings
+    prim.SetCustomDataByKey(PXR_NS::TfToken("token"),
+                            PXR_NS::VtValue(PXR_NS::TfToken("tok")));
+
+    Amino::Ptr<Bifrost::Object> objDefault = Bifrost::createObject();
+    Amino::Ptr<Bifrost::Object> objResult;
+    ASSERT_TRUE(USD::Prim::get_prim_metadata(out_stage, path, "customData",
+                                             objDefault, objResult));
+    ASSERT_TRUE(objResult);
+
+    auto any    = objResult->getProperty("ids");
+    auto resIds = Amino::any_cast<Amino::Ptr<Amino::Array<Amino::int_t>>>(&any);
+    ASSERT_TRUE(resIds);
+    ASSERT_EQ((*resIds)->size(), 3u);
+    EXPECT_EQ((**resIds)[2], 3);
+
+    any           = objResult->getProperty("names");
+    auto resNames =
+        Amino::any_cast<Amino::Ptr<Amino::Array<Amino::String>>>(&any);
+    ASSERT_TRUE(resNames);
+    ASSERT_EQ((*resNames)->size(), 2u);
+    EXPECT_EQ((**resNames)[1], Amino::String("b"));
+
+    any            = objResult->getProperty("nested");
+    auto resNested = Amino::any_cast<Amino::Ptr<Bifrost::Object>>(&any);
+    ASSERT_TRUE(resNested);
+    any           = (*resNested)->getProperty("scale");
+    auto resScale = Amino::any_cast<Bifrost::Math::float3>(&any);
+    ASSERT_TRUE(resScale);
+    EXPECT_EQ(resScale->z, 3.f);
+
+    any           = objResult->getProperty("token");
+    auto resToken = Amino::any_cast<Amino::String>(&any);
+    ASSERT_TRUE(resToken);
+    EXPECT_EQ(*resToken, Amino::String("tok"));
+}
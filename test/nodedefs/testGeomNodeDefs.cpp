@@ -25,8 +25,11 @@
 BIFUSD_WARNING_PUSH
 BIFUSD_WARNING_DISABLE_MSC(4003)
 #include <pxr/usd/usdGeom/boundable.h>
+#include <pxr/usd/usdGeom/cube.h>
 #include <pxr/usd/usdGeom/mesh.h>
+#include <pxr/usd/usdGeom/pointInstancer.h>
 #include <pxr/usd/usdGeom/sphere.h>
+#include <pxr/usd/usdGeom/xform.h>
 #include <pxr/usd/usdGeom/xformCommonAPI.h>
 
 BIFUSD_WARNING_POP
@@ -199,8 +202,365 @@ TEST(GeomNodeDefs, get_usd_point_positions) {
         ASSERT_FLOAT_EQ(v.y, p.y);
         ASSERT_FLOAT_EQ(v.z, p.z);
     }
+
+    // World space
+    PXR_NS::UsdGeomXformCommonAPI(stagePrim->getPxrPrim())
+        .SetTranslate(PXR_NS::GfVec3d(1.0, 2.0, 3.0));
+    USD::Prim::get_usd_geom_points(*stagePrim, false /*local space*/,
+                                   dummyFrame, pointPositions);
+    ASSERT_TRUE(pointPositions != nullptr);
+    ASSERT_EQ(pointPositions->size(), faceVertices.size());
+    for (size_t i = 0; i < faceVertices.size(); ++i) {
+        auto const& v = faceVertices[i];
+        auto const& p = (*pointPositions)[i];
+        ASSERT_FLOAT_EQ(v.x + 1.f, p.x);
+        ASSERT_FLOAT_EQ(v.y + 2.f, p.y);
+        ASSERT_FLOAT_EQ(v.z + 3.f, p.z);
+    }
+
+    // Local space ignores the transform
+    USD::Prim::get_usd_geom_points(*stagePrim, true /*local space*/,
+                                   dummyFrame, pointPositions);
+    ASSERT_EQ(pointPositions->size(), faceVertices.size());
+    ASSERT_FLOAT_EQ((*pointPositions)[0].x, faceVertices[0].x);
 }
 
-TEST(GeomNodeDefs, usd_point_instancer) {}
+TEST(GeomNodeDefs, get_usd_geom_batch) {
+    auto stage    = Amino::newMutablePtr<BifrostUsd::Stage>();
+    auto pxrStage = stage->getStagePtr();
+
+    auto parent =
+        PXR_NS::UsdGeomXform::Define(pxrStage, PXR_NS::SdfPath("/parent"));
+    PXR_NS::UsdGeomXformCommonAPI(parent.GetPrim())
+        .SetTranslate(PXR_NS::GfVec3d(10.0, 0.0, 0.0));
+
+    PXR_NS::VtVec3fArray pxr_points{{0.f, 0.f, 0.f}, {1.f, 2.f, 3.f}};
+    for (auto const* name : {"/parent/a", "/parent/b"}) {
+        auto mesh =
+            PXR_NS::UsdGeomMesh::Define(pxrStage, PXR_NS::SdfPath(name));
+        mesh.CreatePointsAttr().Set(pxr_points);
+        mesh.CreateExtentAttr().Set(
+            PXR_NS::VtVec3fArray{pxr_points[0], pxr_points[1]});
+    }
+    PXR_NS::UsdGeomXformCommonAPI(
+        pxrStage->GetPrimAtPath(PXR_NS::SdfPath("/parent/b")))
+        .SetTranslate(PXR_NS::GfVec3d(0.0, 5.0, 0.0));
+
+    Amino::Array<Amino::String> prim_paths{"/parent/a", "/parent/b", "/parent"};
+    Amino::MutablePtr<Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>>>
+                                                               points;
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>>    extents;
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::double4x4>> world_matrices;
+
+    // "/parent" is not point-based, it just gets no points
+    EXPECT_TRUE(USD::Prim::get_usd_geom_batch(*stage, prim_paths, false, 1.f,
+                                              points, extents, world_matrices));
+    ASSERT_EQ(points->size(), 3u);
+    ASSERT_EQ(extents->size(), 6u);
+    ASSERT_EQ(world_matrices->size(), 3u);
+
+    ASSERT_EQ((*points)[0]->size(), 2u);
+    EXPECT_FLOAT_EQ((*(*points)[0])[1].x, 11.f);
+    EXPECT_FLOAT_EQ((*(*points)[0])[1].y, 2.f);
+    ASSERT_EQ((*points)[1]->size(), 2u);
+    EXPECT_FLOAT_EQ((*(*points)[1])[1].x, 11.f);
+    EXPECT_FLOAT_EQ((*(*points)[1])[1].y, 7.f);
+    EXPECT_TRUE((*points)[2]->empty());
+
+    EXPECT_FLOAT_EQ((*extents)[2].x, 10.f);
+    EXPECT_FLOAT_EQ((*extents)[2].y, 5.f);
+    EXPECT_FLOAT_EQ((*extents)[3].x, 11.f);
+    EXPECT_FLOAT_EQ((*extents)[3].y, 7.f);
+    // The extent of the parent includes its children
+    EXPECT_FLOAT_EQ((*extents)[4].y, 0.f);
+    EXPECT_FLOAT_EQ((*extents)[5].y, 7.f);
+
+    EXPECT_DOUBLE_EQ((*world_matrices)[1].c3.x, 10.0);
+    EXPECT_DOUBLE_EQ((*world_matrices)[1].c3.y, 5.0);
+
+    // Local space
+    prim_paths.pop_back();
+    EXPECT_TRUE(USD::Prim::get_usd_geom_batch(*stage, prim_paths, true, 1.f,
+                                              points, extents, world_matrices));
+    EXPECT_FLOAT_EQ((*(*points)[1])[1].x, 1.f);
+    EXPECT_FLOAT_EQ((*(*points)[1])[1].y, 2.f);
+    EXPECT_FLOAT_EQ((*extents)[3].y, 2.f);
+
+    // The points are the same as the ones of get_usd_geom_points
+    EXPECT_TRUE(USD::Prim::get_usd_geom_batch(*stage, prim_paths, false, 1.f,
+                                              points, extents, world_matrices));
+    auto                                stageConst = stage.toImmutable();
+    Amino::MutablePtr<BifrostUsd::Prim> prim;
+    USD::Prim::get_prim_at_path(stageConst, prim_paths[1], prim);
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>> primPoints;
+    ASSERT_TRUE(USD::Prim::get_usd_geom_points(*prim, false, 1.f, primPoints));
+    ASSERT_EQ(primPoints->size(), (*points)[1]->size());
+    EXPECT_FLOAT_EQ((*primPoints)[1].x, (*(*points)[1])[1].x);
+    EXPECT_FLOAT_EQ((*primPoints)[1].y, (*(*points)[1])[1].y);
+}
 
-TEST(GeomNodeDefs, usd_volume) {}
+TEST(GeomNodeDefs, compute_bounds) {
+    auto stage    = Amino::newMutablePtr<BifrostUsd::Stage>();
+    auto pxrStage = stage->getStagePtr();
+
+    auto parent =
+        PXR_NS::UsdGeomXform::Define(pxrStage, PXR_NS::SdfPath("/parent"));
+    PXR_NS::UsdGeomXformCommonAPI(parent.GetPrim())
+        .SetTranslate(PXR_NS::GfVec3d(10.0, 0.0, 0.0));
+    auto cube =
+        PXR_NS::UsdGeomCube::Define(pxrStage, PXR_NS::SdfPath("/parent/cube"));
+    cube.CreateExtentAttr().Set(PXR_NS::VtVec3fArray{
+        PXR_NS::GfVec3f(-1.f), PXR_NS::GfVec3f(1.f)});
+    auto guide =
+        PXR_NS::UsdGeomCube::Define(pxrStage, PXR_NS::SdfPath("/parent/guide"));
+    guide.CreateSizeAttr().Set(10.0);
+    guide.CreateExtentAttr().Set(PXR_NS::VtVec3fArray{
+        PXR_NS::GfVec3f(-5.f), PXR_NS::GfVec3f(5.f)});
+    guide.CreatePurposeAttr().Set(PXR_NS::UsdGeomTokens->guide);
+
+    Amino::Array<Amino::String> prim_paths{"/parent", "/parent/cube"};
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>> bounds_min;
+    Amino::MutablePtr<Amino::Array<Bifrost::Math::float3>> bounds_max;
+    Bifrost::Math::float3                                  total_min;
+    Bifrost::Math::float3                                  total_max;
+
+    ASSERT_TRUE(USD::Prim::compute_bounds(*stage, prim_paths, 1.f, false, true,
+                                          false, false, bounds_min,
+                                          bounds_max, total_min, total_max));
+    ASSERT_EQ(bounds_min->size(), 2u);
+    ASSERT_EQ(bounds_max->size(), 2u);
+    EXPECT_FLOAT_EQ((*bounds_min)[0].x, 9.f);
+    EXPECT_FLOAT_EQ((*bounds_max)[0].x, 11.f);
+    EXPECT_FLOAT_EQ((*bounds_min)[1].y, -1.f);
+    EXPECT_FLOAT_EQ(total_min.x, 9.f);
+    EXPECT_FLOAT_EQ(total_max.x, 11.f);
+
+    // Local space, with guides
+    ASSERT_TRUE(USD::Prim::compute_bounds(*stage, prim_paths, 1.f, true, true,
+                                          false, true, bounds_min, bounds_max,
+                                          total_min, total_max));
+    EXPECT_FLOAT_EQ((*bounds_min)[0].x, -5.f);
+    EXPECT_FLOAT_EQ((*bounds_max)[0].x, 5.f);
+    EXPECT_FLOAT_EQ((*bounds_max)[1].x, 1.f);
+
+    // The cached bounds are discarded when the stage changes
+    cube.CreateSizeAttr().Set(4.0);
+    cube.CreateExtentAttr().Set(PXR_NS::VtVec3fArray{
+        PXR_NS::GfVec3f(-2.f), PXR_NS::GfVec3f(2.f)});
+    ASSERT_TRUE(USD::Prim::compute_bounds(*stage, prim_paths, 1.f, false, true,
+                                          false, false, bounds_min,
+                                          bounds_max, total_min, total_max));
+    EXPECT_FLOAT_EQ((*bounds_min)[0].x, 8.f);
+    EXPECT_FLOAT_EQ((*bounds_max)[0].x, 12.f);
+
+    // Unknown prim
+    prim_paths.push_back("/unknown");
+    EXPECT_FALSE(USD::Prim::compute_bounds(*stage, prim_paths, 1.f, false,
+                                           true, false, false, bounds_min,
+                                           bounds_max, total_min, total_max));
+    EXPECT_FLOAT_EQ(total_max.x, 12.f);
+}
+
+TEST(GeomNodeDefs, usd_point_instancer) {
+    auto          stage = Amino::newMutablePtr<BifrostUsd::Stage>();
+    Amino::String instancerPath{"/instancer"};
+
+    auto positions = Amino::newClassPtr<Amino::Array<Bifrost::Math::float3>>(
+        Amino::Array<Bifrost::Math::float3>{
+            {0.f, 1.f, 2.f}, {3.f, 4.f, 5.f}, {6.f, 7.f, 8.f}});
+    auto protoindices = Amino::newClassPtr<Amino::Array<int>>(
+        Amino::Array<int>{0, 0, 0});
+    auto invisible_ids = Amino::newClassPtr<Amino::Array<Amino::long_t>>(
+        Amino::Array<Amino::long_t>{1});
+    Amino::Ptr<Amino::Array<Bifrost::Math::float3>> unset;
+
+    ASSERT_TRUE(USD::Prim::usd_point_instancer(
+        *stage, instancerPath, Amino::Array<Amino::String>{"/proto"},
+        protoindices, positions, Amino::Array<Bifrost::Math::float4>{}, unset,
+        unset, unset, unset, invisible_ids));
+
+    auto instancer = PXR_NS::UsdGeomPointInstancer::Get(
+        stage->getStagePtr(), PXR_NS::SdfPath(instancerPath.c_str()));
+    ASSERT_TRUE(instancer);
+
+    PXR_NS::VtVec3fArray pxr_positions;
+    ASSERT_TRUE(instancer.GetPositionsAttr().Get(&pxr_positions));
+    ASSERT_EQ(pxr_positions.size(), positions->size());
+    for (size_t i = 0; i < positions->size(); ++i) {
+        ASSERT_FLOAT_EQ(pxr_positions[i][0], (*positions)[i].x);
+        ASSERT_FLOAT_EQ(pxr_positions[i][1], (*positions)[i].y);
+        ASSERT_FLOAT_EQ(pxr_positions[i][2], (*positions)[i].z);
+    }
+    // The positions were not copied: the layer shares the Bifrost array.
+    EXPECT_EQ(static_cast<const void*>(pxr_positions.cdata()),
+              static_cast<const void*>(&(*positions)[0]));
+
+    // Defaults are authored for the scales and orientations
+    PXR_NS::VtVec3fArray pxr_scales;
+    ASSERT_TRUE(instancer.GetScalesAttr().Get(&pxr_scales));
+    ASSERT_EQ(pxr_scales.size(), positions->size());
+    EXPECT_EQ(pxr_scales[0], PXR_NS::GfVec3f(1.f));
+    PXR_NS::VtQuathArray pxr_orientations;
+    ASSERT_TRUE(instancer.GetOrientationsAttr().Get(&pxr_orientations));
+    ASSERT_EQ(pxr_orientations.size(), positions->size());
+    EXPECT_FALSE(instancer.GetVelocitiesAttr().HasAuthoredValue());
+
+    PXR_NS::VtIntArray pxr_protoindices;
+    ASSERT_TRUE(instancer.GetProtoIndicesAttr().Get(&pxr_protoindices));
+    EXPECT_EQ(pxr_protoindices, PXR_NS::VtIntArray(3, 0));
+    PXR_NS::VtInt64Array pxr_invisible_ids;
+    ASSERT_TRUE(instancer.GetInvisibleIdsAttr().Get(&pxr_invisible_ids));
+    EXPECT_EQ(pxr_invisible_ids, PXR_NS::VtInt64Array(1, 1));
+
+    // The shared positions outlive the Bifrost array and are copied when
+    // modified.
+    auto const* sharedData = pxr_positions.cdata();
+    positions.reset();
+    pxr_positions[0] = PXR_NS::GfVec3f(-1.f);
+    EXPECT_NE(pxr_positions.cdata(), sharedData);
+    PXR_NS::VtVec3fArray pxr_positions_again;
+    ASSERT_TRUE(instancer.GetPositionsAttr().Get(&pxr_positions_again));
+    EXPECT_EQ(pxr_positions_again[0], PXR_NS::GfVec3f(0.f, 1.f, 2.f));
+}
+
+TEST(GeomNodeDefs, usd_point_instancer_samples) {
+    auto          stage = Amino::newMutablePtr<BifrostUsd::Stage>();
+    Amino::String instancerPath{"/instancer"};
+
+    const auto frames = Amino::Array<float>{1.f, 2.f};
+    Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>> positions(
+        frames.size());
+    Amino::Array<Amino::Ptr<Amino::Array<int>>> protoindices(frames.size());
+    for (size_t i = 0; i < frames.size(); ++i) {
+        auto const v = static_cast<float>(i);
+        positions[i] = Amino::newClassPtr<Amino::Array<Bifrost::Math::float3>>(
+            Amino::Array<Bifrost::Math::float3>{{v, 0.f, 0.f}, {v, 1.f, 0.f}});
+        protoindices[i] =
+            Amino::newClassPtr<Amino::Array<int>>(Amino::Array<int>{0, 0});
+    }
+    Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float4>>> noFloat4;
+    Amino::Array<Amino::Ptr<Amino::Array<Bifrost::Math::float3>>> noFloat3;
+    Amino::Array<Amino::Ptr<Amino::Array<Amino::long_t>>>         noIds;
+
+    ASSERT_TRUE(USD::Prim::usd_point_instancer_samples(
+        *stage, instancerPath, Amino::Array<Amino::String>{"/proto"}, frames,
+        protoindices, positions, noFloat4, noFloat3, noFloat3, noFloat3,
+        noFloat3, noIds));
+
+    auto instancer = PXR_NS::UsdGeomPointInstancer::Get(
+        stage->getStagePtr(), PXR_NS::SdfPath(instancerPath.c_str()));
+    ASSERT_TRUE(instancer);
+
+    std::vector<double> times;
+    ASSERT_TRUE(instancer.GetPositionsAttr().GetTimeSamples(&times));
+    ASSERT_EQ(times, (std::vector<double>{1.0, 2.0}));
+    ASSERT_TRUE(instancer.GetScalesAttr().GetTimeSamples(&times));
+    ASSERT_EQ(times.size(), frames.size());
+    EXPECT_FALSE(instancer.GetVelocitiesAttr().HasAuthoredValue());
+
+    PXR_NS::VtVec3fArray pxr_positions;
+    ASSERT_TRUE(instancer.GetPositionsAttr().Get(&pxr_positions,
+                                                 PXR_NS::UsdTimeCode(2.0)));
+    ASSERT_EQ(pxr_positions.size(), 2u);
+    EXPECT_EQ(pxr_positions[1], PXR_NS::GfVec3f(1.f, 1.f, 0.f));
+
+    // The per-frame arrays must be empty or have one entry per frame
+    positions.resize(1);
+    EXPECT_FALSE(USD::Prim::usd_point_instancer_samples(
+        *stage, instancerPath, Amino::Array<Amino::String>{"/proto"}, frames,
+        protoindices, positions, noFloat4, noFloat3, noFloat3, noFloat3,
+        noFloat3, noIds));
+}
+
+TEST(GeomNodeDefs, usd_point_instancer_change_notifications) {
+    auto positions = Amino::newClassPtr<Amino::Array<Bifrost::Math::float3>>(
+        Amino::Array<Bifrost::Math::float3>(1000, {1.f, 2.f, 3.f}));
+    auto protoindices = Amino::newClassPtr<Amino::Array<int>>(
+        Amino::Array<int>(1000, 0));
+    Amino::Ptr<Amino::Array<Bifrost::Math::float3>> unset;
+    Amino::Ptr<Amino::Array<Amino::long_t>>         noIds;
+
+    // Without batching, each authored attribute sends its own notices
+    {
+        auto stage     = Amino::newMutablePtr<BifrostUsd::Stage>();
+        auto instancer = PXR_NS::UsdGeomPointInstancer::Define(
+            stage->getStagePtr(), PXR_NS::SdfPath("/instancer"));
+        LayersDidChangeCounter counter;
+        instancer.CreateProtoIndicesAttr().Set(
+            PXR_NS::VtIntArray(protoindices->size(), 0));
+        instancer.CreatePositionsAttr().Set(
+            PXR_NS::VtVec3fArray(positions->size(), PXR_NS::GfVec3f(1.f)));
+        instancer.CreateScalesAttr().Set(
+            PXR_NS::VtVec3fArray(positions->size(), PXR_NS::GfVec3f(1.f)));
+        EXPECT_GE(counter.count(), 3u);
+    }
+    // The node sends a single notice for all the instance attributes
+    {
+        auto stage = Amino::newMutablePtr<BifrostUsd::Stage>();
+        ASSERT_TRUE(USD::Prim::usd_point_instancer(
+            *stage, "/instancer", Amino::Array<Amino::String>{},
+            protoindices, positions, Amino::Array<Bifrost::Math::float4>{},
+            unset, unset, unset, unset, noIds));
+
+        // Update the same instancer: only the attribute values change.
+        auto newPositions =
+            Amino::newClassPtr<Amino::Array<Bifrost::Math::float3>>(
+                Amino::Array<Bifrost::Math::float3>(2000, {4.f, 5.f, 6.f}));
+        auto newProtoindices = Amino::newClassPtr<Amino::Array<int>>(
+            Amino::Array<int>(2000, 1));
+
+        LayersDidChangeCounter counter;
+        ASSERT_TRUE(USD::Prim::usd_point_instancer(
+            *stage, "/instancer", Amino::Array<Amino::String>{},
+            newProtoindices, newPositions,
+            Amino::Array<Bifrost::Math::float4>{}, unset, unset, unset, unset,
+            noIds));
+        EXPECT_EQ(counter.count(), 1u);
+    }
+}
+
+TEST(GeomNodeDefs, usd_volume) {
+    auto stage = Amino::newMutablePtr<BifrostUsd::Stage>();
+
+    LayersDidChangeCounter counter;
+    ASSERT_TRUE(USD::Prim::usd_volume(
+        *stage, "/world/volume", BifrostUsd::VolumeFieldFormat::OpenVDB,
+        Amino::Array<Amino::String>{"density", "temperature"},
+        Amino::Array<Amino::String>{"smoke.vdb", "smoke.vdb"},
+        Amino::Array<Amino::String>{"density", "field:heat"}, 12.f));
+    // All the prims, attributes and relationships are authored at once
+    EXPECT_EQ(counter.count(), 1u);
+
+    auto const& pxrStage = stage->get();
+    auto        world    = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/world"));
+    ASSERT_TRUE(world);
+    EXPECT_TRUE(world.IsDefined());
+
+    auto volume = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/world/volume"));
+    ASSERT_TRUE(volume);
+    EXPECT_EQ(volume.GetTypeName(), PXR_NS::TfToken("Volume"));
+
+    auto field =
+        pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/world/volume/temperature"));
+    ASSERT_TRUE(field);
+    EXPECT_TRUE(field.IsDefined());
+    EXPECT_EQ(field.GetTypeName(), PXR_NS::TfToken("OpenVDBAsset"));
+
+    PXR_NS::TfToken fieldName;
+    ASSERT_TRUE(field.GetAttribute(PXR_NS::TfToken("fieldName"))
+                    .Get(&fieldName, PXR_NS::UsdTimeCode(12.0)));
+    EXPECT_EQ(fieldName, PXR_NS::TfToken("temperature"));
+    std::vector<double> times;
+    ASSERT_TRUE(field.GetAttribute(PXR_NS::TfToken("filePath"))
+                    .GetTimeSamples(&times));
+    EXPECT_EQ(times, std::vector<double>{12.0});
+
+    PXR_NS::SdfPathVector targets;
+    ASSERT_TRUE(volume.GetRelationship(PXR_NS::TfToken("field:heat"))
+                    .GetTargets(&targets));
+    ASSERT_EQ(targets.size(), 1u);
+    EXPECT_EQ(targets[0], field.GetPath());
+    // The names already in the "field" namespace are kept
+    EXPECT_FALSE(volume.GetRelationship(PXR_NS::TfToken("field:field:heat")));
+    EXPECT_TRUE(volume.GetRelationship(PXR_NS::TfToken("field:density")));
+}
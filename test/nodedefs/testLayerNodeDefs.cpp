@@ -324,6 +324,57 @@ def Xform "hi"
     ASSERT_STREQ(result.c_str(), layerWithSublayerContent);
 }
 
+TEST(LayerNodeDefs, export_layer_to_binary) {
+    auto layer = Amino::newClassPtr<BifrostUsd::Layer>(
+        getResourcePath("helloworld.usd").c_str(), "", "", false);
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>> result;
+    USD::Layer::export_layer_to_binary(*layer, false, result);
+    ASSERT_TRUE(result);
+    // Binary usdc files start with the "PXR-USDC" magic bytes
+    const std::string magic = "PXR-USDC";
+    ASSERT_GT(result->size(), magic.size());
+    EXPECT_EQ(std::string(reinterpret_cast<const char*>(result->data()),
+                          magic.size()),
+              magic);
+
+    // An invalid layer exports no bytes
+    BifrostUsd::Layer invalidLayer{BifrostUsd::Layer::Invalid{}};
+    USD::Layer::export_layer_to_binary(invalidLayer, false, result);
+    ASSERT_TRUE(result);
+    EXPECT_TRUE(result->empty());
+}
+
+TEST(LayerNodeDefs, import_layer_from_binary) {
+    auto layer = Amino::newClassPtr<BifrostUsd::Layer>(
+        getResourcePath("helloworld.usd").c_str(), "", "", false);
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>> bytes;
+    USD::Layer::export_layer_to_binary(*layer, false, bytes);
+    ASSERT_TRUE(bytes);
+
+    // Round trip through the usdc bytes
+    Amino::MutablePtr<BifrostUsd::Layer> importedLayer;
+    USD::Layer::import_layer_from_binary(*bytes, "imported.usda",
+                                         importedLayer);
+    ASSERT_TRUE(importedLayer);
+    ASSERT_TRUE(importedLayer->isValid());
+    EXPECT_TRUE(importedLayer->get().IsAnonymous());
+    EXPECT_EQ(importedLayer->get().GetDisplayName(), "imported.usda");
+    auto spec = importedLayer->get().GetPrimAtPath(
+        PXR_NS::SdfPath("/hello/world"));
+    ASSERT_TRUE(spec);
+    EXPECT_EQ(spec->GetTypeName(), PXR_NS::TfToken("Sphere"));
+    auto attr = importedLayer->get().GetAttributeAtPath(
+        PXR_NS::SdfPath("/hello/world.testAttr"));
+    ASSERT_TRUE(attr);
+    EXPECT_EQ(attr->GetDefaultValue(), PXR_NS::VtValue(123));
+
+    // Bytes that are not a usdc file give an invalid layer
+    const Amino::Array<Amino::uchar_t> notUsdc{'n', 'o', 't'};
+    USD::Layer::import_layer_from_binary(notUsdc, "", importedLayer);
+    ASSERT_TRUE(importedLayer);
+    EXPECT_FALSE(importedLayer->isValid());
+}
+
 TEST(LayerNodeDefs, export_layer_to_file) {
     const char* helloworldContent = R"usda(#usda 1.0
 
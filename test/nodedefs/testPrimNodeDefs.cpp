@@ -23,6 +23,7 @@
 #include <nodedefs/usd_pack/usd_layer_nodedefs.h>
 #include <nodedefs/usd_pack/usd_prim_nodedefs.h>
 #include <nodedefs/usd_pack/usd_stage_nodedefs.h>
+#include <nodedefs/usd_pack/usd_utils.h>
 #include <nodedefs/usd_pack/usd_variantset_nodedefs.h>
 
 #include <pxr/pxr.h>
@@ -38,6 +39,7 @@ BIFUSD_WARNING_DISABLE_MSC(4003)
 #include <pxr/usd/usd/inherits.h>
 #include <pxr/usd/usd/modelAPI.h>
 #include <pxr/usd/usd/variantSets.h>
+#include <pxr/usd/usdGeom/imageable.h>
 #include <pxr/usd/usdGeom/mesh.h>
 #include <pxr/usd/usdGeom/xformCommonAPI.h>
 BIFUSD_WARNING_POP
@@ -76,6 +78,36 @@ TEST(PrimNodeDefs, get_prim_at_path) {
     ASSERT_TRUE((*prim)->IsValid());
 }
 
+TEST(PrimNodeDefs, get_prim_at_path_lookup_cache) {
+    BifrostUsd::Stage stage;
+    stage->DefinePrim(PXR_NS::SdfPath("/a/b"));
+
+    auto prim = USDUtils::get_prim_at_path("/a/b", stage);
+    ASSERT_TRUE(prim);
+    EXPECT_EQ(USDUtils::get_prim_at_path("/a/b", stage), prim);
+
+    // Relative paths are resolved from the last modified prim
+    stage.last_modified_prim = "/a";
+    EXPECT_EQ(USDUtils::get_prim_at_path("b", stage), prim);
+
+    // Attribute edits keep the cached prims valid
+    prim.CreateAttribute(PXR_NS::TfToken("x"), PXR_NS::SdfValueTypeNames->Int)
+        .Set(1);
+    EXPECT_EQ(USDUtils::get_prim_at_path("/a/b", stage), prim);
+
+    // Removed and recreated prims are looked up again
+    ASSERT_TRUE(stage->RemovePrim(PXR_NS::SdfPath("/a/b")));
+    EXPECT_FALSE(USDUtils::get_prim_at_path("/a/b", stage));
+    stage->DefinePrim(PXR_NS::SdfPath("/a/b"), PXR_NS::TfToken("Scope"));
+    auto redefined = USDUtils::get_prim_at_path("/a/b", stage);
+    ASSERT_TRUE(redefined);
+    EXPECT_EQ(redefined.GetTypeName(), PXR_NS::TfToken("Scope"));
+
+    // Prims are not shared between stages
+    BifrostUsd::Stage other;
+    EXPECT_FALSE(USDUtils::get_prim_at_path("/a/b", other));
+}
+
 TEST(PrimNodeDefs, get_prim_children) {
     auto primPathA  = PXR_NS::SdfPath("/a");
     auto primPathB  = PXR_NS::SdfPath("/a/b");
@@ -145,6 +177,45 @@ TEST(PrimNodeDefs, get_prim_children) {
     ASSERT_EQ((*children->at(2))->GetPath().GetString(), "/a/b2");
 }
 
+TEST(PrimNodeDefs, get_prim_children_paths) {
+    BifrostUsd::Stage stage;
+    stage->DefinePrim(PXR_NS::SdfPath("/a"), PXR_NS::TfToken("Xform"));
+    stage->DefinePrim(PXR_NS::SdfPath("/a/b"), PXR_NS::TfToken("Scope"));
+    stage->DefinePrim(PXR_NS::SdfPath("/a/b/c"), PXR_NS::TfToken("Mesh"));
+    stage->DefinePrim(PXR_NS::SdfPath("/a/b2")).SetActive(false);
+    stage->DefinePrim(PXR_NS::SdfPath("/a/d"));
+    stage->OverridePrim(PXR_NS::SdfPath("/a/over"));
+
+    Amino::MutablePtr<Amino::Array<Amino::String>> paths, types;
+    Amino::MutablePtr<Amino::Array<Amino::long_t>> parents;
+
+    USD::Prim::get_prim_children_paths(stage, "/a", true, true, true, false,
+                                       false, paths, types, parents);
+    ASSERT_EQ(paths->size(), 3u);
+    ASSERT_EQ(types->size(), 3u);
+    ASSERT_EQ(parents->size(), 3u);
+    EXPECT_EQ((*paths)[0], Amino::String("/a/b"));
+    EXPECT_EQ((*paths)[1], Amino::String("/a/b/c"));
+    EXPECT_EQ((*paths)[2], Amino::String("/a/d"));
+    EXPECT_EQ((*types)[0], Amino::String("Scope"));
+    EXPECT_EQ((*types)[1], Amino::String("Mesh"));
+    EXPECT_EQ((*types)[2], Amino::String(""));
+    EXPECT_EQ((*parents)[0], -1);
+    EXPECT_EQ((*parents)[1], 0);
+    EXPECT_EQ((*parents)[2], -1);
+
+    // Inactive and undefined prims
+    USD::Prim::get_prim_children_paths(stage, "/a", false, false, false, false,
+                                       false, paths, types, parents);
+    EXPECT_EQ(paths->size(), 4u);
+
+    // Children of the pseudo root
+    USD::Prim::get_prim_children_paths(stage, "", false, true, true, false,
+                                       false, paths, types, parents);
+    ASSERT_EQ(paths->size(), 1u);
+    EXPECT_EQ((*paths)[0], Amino::String("/a"));
+}
+
 TEST(PrimNodeDefs, get_prim_path) {
     auto stage_mut = Amino::newMutablePtr<BifrostUsd::Stage>();
     auto primPath  = PXR_NS::SdfPath("/a");
@@ -212,6 +283,142 @@ TEST(PrimNodeDefs, create_prim) {
     ASSERT_TRUE(stage->GetPrimAtPath(PXR_NS::SdfPath(path.c_str())));
 }
 
+TEST(PrimNodeDefs, create_prims) {
+    BifrostUsd::Stage stage;
+
+    const size_t                numPrims = 100;
+    Amino::Array<Amino::String> paths;
+    for (size_t i = 0; i < numPrims; ++i) {
+        paths.push_back(("/set/xform" + std::to_string(i)).c_str());
+    }
+    Amino::Array<Amino::String>                types{"Xform"};
+    Amino::Array<Amino::String>                kinds;
+    Amino::Array<BifrostUsd::ImageablePurpose> purposes(
+        numPrims, BifrostUsd::ImageablePurpose::Default);
+    purposes[1] = BifrostUsd::ImageablePurpose::Proxy;
+
+    LayersDidChangeCounter counter;
+    ASSERT_TRUE(
+        USD::Prim::create_prims(stage, paths, types, kinds, purposes));
+    // All the prims are authored at once
+    EXPECT_EQ(counter.count(), 1u);
+    EXPECT_EQ(stage.last_modified_prim, paths[numPrims - 1]);
+
+    auto set = stage->GetPrimAtPath(PXR_NS::SdfPath("/set"));
+    ASSERT_TRUE(set);
+    EXPECT_TRUE(set.IsDefined());
+    for (size_t i = 0; i < numPrims; ++i) {
+        auto prim = stage->GetPrimAtPath(PXR_NS::SdfPath(paths[i].c_str()));
+        ASSERT_TRUE(prim);
+        EXPECT_EQ(prim.GetTypeName(), PXR_NS::TfToken("Xform"));
+    }
+
+    PXR_NS::TfToken purpose;
+    auto            proxy = stage->GetPrimAtPath(PXR_NS::SdfPath(paths[1].c_str()));
+    ASSERT_TRUE(proxy.GetAttribute(PXR_NS::TfToken("purpose")).Get(&purpose));
+    EXPECT_EQ(purpose, PXR_NS::TfToken("proxy"));
+    auto first = stage->GetPrimAtPath(PXR_NS::SdfPath(paths[0].c_str()));
+    EXPECT_FALSE(first.GetAttribute(PXR_NS::TfToken("purpose")).HasAuthoredValue());
+
+    // Relative paths and per prim kinds
+    Amino::Array<Amino::String> children{"a", "b"};
+    Amino::Array<Amino::String> childKinds{"component", "subcomponent"};
+    ASSERT_TRUE(USD::Prim::create_prims(stage, children, {}, childKinds, {}));
+    PXR_NS::TfToken kind;
+    auto            b = stage->GetPrimAtPath(
+        PXR_NS::SdfPath(paths[numPrims - 1].c_str()).AppendChild(
+            PXR_NS::TfToken("b")));
+    ASSERT_TRUE(b);
+    ASSERT_TRUE(PXR_NS::UsdModelAPI(b).GetKind(&kind));
+    EXPECT_EQ(kind, PXR_NS::TfToken("subcomponent"));
+
+    // Mismatching array sizes
+    Amino::Array<Amino::String> twoTypes{"Xform", "Scope"};
+    Amino::Array<Amino::String> threePaths{"/x", "/y", "/z"};
+    EXPECT_FALSE(
+        USD::Prim::create_prims(stage, threePaths, twoTypes, kinds, {}));
+    EXPECT_FALSE(stage->GetPrimAtPath(PXR_NS::SdfPath("/x")));
+}
+
+TEST(PrimNodeDefs, find_prims) {
+    BifrostUsd::Stage stage;
+    auto              define = [&stage](const char* path, const char* type) {
+        return stage->DefinePrim(PXR_NS::SdfPath(path), PXR_NS::TfToken(type));
+    };
+    PXR_NS::UsdModelAPI(define("/set", "Xform"))
+        .SetKind(PXR_NS::TfToken("assembly"));
+    PXR_NS::UsdModelAPI(define("/set/a", "Xform"))
+        .SetKind(PXR_NS::TfToken("component"));
+    PXR_NS::UsdModelAPI(define("/set/b", "Xform"))
+        .SetKind(PXR_NS::TfToken("component"));
+    auto geo = define("/set/a/geo", "Mesh");
+    geo.AddAppliedSchema(PXR_NS::TfToken("MaterialBindingAPI"));
+    auto doubleSided = PXR_NS::UsdGeomMesh(geo).CreateDoubleSidedAttr(
+        PXR_NS::VtValue(false));
+    PXR_NS::UsdGeomImageable(define("/set/b/geo", "Mesh"))
+        .CreatePurposeAttr(PXR_NS::VtValue(PXR_NS::TfToken("proxy")));
+    define("/set/b/geo/sub", "Scope");
+    define("/other", "Scope");
+    stage->CreateClassPrim(PXR_NS::SdfPath("/_class"));
+    define("/_class/geo", "Mesh");
+
+    auto find = [&stage](const Amino::Array<Amino::String>& patterns,
+                         bool                               use_regex,
+                         const Amino::Array<Amino::String>& types,
+                         const Amino::Array<Amino::String>& kinds,
+                         const Amino::Array<BifrostUsd::ImageablePurpose>& purposes,
+                         const Amino::Array<Amino::String>& schemas) {
+        Amino::Ptr<Amino::Array<Amino::String>> paths;
+        EXPECT_TRUE(USD::Prim::find_prims(stage, patterns, use_regex, types,
+                                          kinds, purposes, schemas, paths));
+        std::vector<std::string> result;
+        for (const auto& path : *paths) result.emplace_back(path.c_str());
+        return result;
+    };
+    using Paths = std::vector<std::string>;
+
+    EXPECT_EQ(find({"/set/*/geo"}, false, {}, {}, {}, {}),
+              (Paths{"/set/a/geo", "/set/b/geo"}));
+    EXPECT_EQ(find({"/set/?"}, false, {}, {}, {}, {}),
+              (Paths{"/set/a", "/set/b"}));
+    EXPECT_EQ(find({"^/set/a.*"}, true, {}, {}, {}, {}),
+              (Paths{"/set/a", "/set/a/geo"}));
+    // Abstract prims are not considered
+    EXPECT_EQ(find({}, false, {"Gprim"}, {}, {}, {}),
+              (Paths{"/set/a/geo", "/set/b/geo"}));
+    EXPECT_EQ(find({}, false, {}, {"model"}, {}, {}),
+              (Paths{"/set", "/set/a", "/set/b"}));
+    EXPECT_EQ(find({"/set/*"}, false, {}, {"component"}, {}, {}),
+              (Paths{"/set/a", "/set/b"}));
+    // The purpose is inherited
+    EXPECT_EQ(find({}, false, {}, {}, {BifrostUsd::ImageablePurpose::Proxy}, {}),
+              (Paths{"/set/b/geo", "/set/b/geo/sub"}));
+    EXPECT_EQ(find({}, false, {}, {}, {}, {"MaterialBindingAPI"}),
+              (Paths{"/set/a/geo"}));
+
+    // The result of a query is reused until the stage changes
+    Amino::Array<Amino::String> patterns{"/set/*/geo"};
+    auto query = [&](Amino::Ptr<Amino::Array<Amino::String>>& paths) {
+        ASSERT_TRUE(USD::Prim::find_prims(stage, patterns, false, {}, {}, {},
+                                          {}, paths));
+    };
+    Amino::Ptr<Amino::Array<Amino::String>> first, second;
+    query(first);
+    query(second);
+    EXPECT_EQ(first.get(), second.get());
+
+    // Attribute value edits do not affect the result
+    doubleSided.Set(true);
+    query(second);
+    EXPECT_EQ(first.get(), second.get());
+
+    define("/set/c/geo", "Mesh");
+    query(second);
+    EXPECT_NE(first.get(), second.get());
+    ASSERT_EQ(second->size(), 3u);
+    EXPECT_EQ((*second)[2], Amino::String("/set/c/geo"));
+}
+
 TEST(PrimNodeDefs, create_class_prim) {
     BifrostUsd::Stage stage;
     Amino::String     path = "/A";
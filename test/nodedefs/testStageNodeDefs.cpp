@@ -15,6 +15,7 @@
 //+
 #include <Amino/Core/String.h>
 #include <Bifrost/FileUtils/FileUtils.h>
+#include <BifrostUsd/StageCache.h>
 
 #include <bifusd/config/CfgWarningMacros.h>
 #include <gtest/gtest.h>
@@ -26,6 +27,7 @@
 #include <pxr/usd/usdUtils/stageCache.h>
 #include <utils/test/testUtils.h>
 
+#include <algorithm>
 #include <fstream>
 #include <regex>
 #include <string>
@@ -34,6 +36,7 @@
 #include <bifusd/config/CfgWarningMacros.h>
 BIFUSD_WARNING_PUSH
 BIFUSD_WARNING_DISABLE_MSC(4003)
+#include <pxr/usd/kind/registry.h>
 #include <pxr/usd/usd/modelAPI.h>
 BIFUSD_WARNING_POP
 
@@ -336,6 +339,20 @@ TEST(StageNodeDefs, set_default_prim) {
     ASSERT_EQ(primPath, defaultPrim.GetPath().GetText());
 }
 
+TEST(StageNodeDefs, export_stage_to_binary) {
+    BifrostUsd::Stage stage{getResourcePath("helloworld.usd").c_str()};
+    ASSERT_TRUE(stage);
+    Amino::MutablePtr<Amino::Array<Amino::uchar_t>> result;
+    USD::Stage::export_stage_to_binary(stage, result);
+    ASSERT_TRUE(result);
+    // Binary usdc files start with the "PXR-USDC" magic bytes
+    const std::string magic = "PXR-USDC";
+    ASSERT_GT(result->size(), magic.size());
+    EXPECT_EQ(std::string(reinterpret_cast<const char*>(result->data()),
+                          magic.size()),
+              magic);
+}
+
 TEST(StageNodeDefs, get_default_prim) {
     BifrostUsd::Stage stage{getResourcePath("helloworld.usd").c_str()};
     ASSERT_TRUE(stage);
@@ -401,12 +418,60 @@ def Xform "hello"
     ASSERT_TRUE(stage);
     auto filepath = getThisTestOutputPath("testSaveStage.usda");
 
-    bool success = USD::Stage::save_stage(stage, filepath);
+    Amino::MutablePtr<Amino::Array<Amino::String>> writtenFiles;
+    bool success = USD::Stage::save_stage(stage, filepath, writtenFiles);
     ASSERT_TRUE(success);
+    ASSERT_EQ(writtenFiles->size(), 1u);
+    EXPECT_EQ((*writtenFiles)[0], filepath);
     std::ifstream     filestream(filepath.c_str());
     std::stringstream filebuffer;
     filebuffer << filestream.rdbuf();
     ASSERT_STREQ(filebuffer.str().c_str(), helloworldContent);
+
+    // The layer did not change, it must not be written again
+    success = USD::Stage::save_stage(stage, filepath, writtenFiles);
+    ASSERT_TRUE(success);
+    EXPECT_TRUE(writtenFiles->empty());
+
+    // Modify the layer and save it again
+    stage->DefinePrim(PXR_NS::SdfPath("/modified"));
+    success = USD::Stage::save_stage(stage, filepath, writtenFiles);
+    ASSERT_TRUE(success);
+    ASSERT_EQ(writtenFiles->size(), 1u);
+    EXPECT_EQ((*writtenFiles)[0], filepath);
+}
+
+TEST(StageNodeDefs, save_stage_sublayer_failure) {
+    auto root_path = getThisTestOutputPath("save_stage_sublayer_root.usda");
+    auto good_path = getThisTestOutputPath("save_stage_sublayer_good.usda");
+    // The parent of this path is a file, so it can't be written
+    auto bad_path = Bifrost::FileUtils::filePath(
+        getResourcePath("helloworld.usd"), "save_stage_sublayer_bad.usda");
+
+    auto good_layer = BifrostUsd::Layer{good_path};
+    ASSERT_TRUE(good_layer);
+    good_layer.setFilePath(good_path);
+
+    auto bad_layer = BifrostUsd::Layer{bad_path};
+    ASSERT_TRUE(bad_layer);
+    bad_layer.setFilePath(bad_path);
+
+    BifrostUsd::Layer root_layer{root_path};
+    ASSERT_TRUE(root_layer);
+    root_layer.insertSubLayer(bad_layer);
+    root_layer.insertSubLayer(good_layer);
+
+    BifrostUsd::Stage stage{root_layer};
+    ASSERT_TRUE(stage);
+
+    Amino::MutablePtr<Amino::Array<Amino::String>> writtenFiles;
+    EXPECT_FALSE(USD::Stage::save_stage(stage, root_path, writtenFiles));
+    ASSERT_TRUE(writtenFiles);
+    EXPECT_EQ(std::find(writtenFiles->begin(), writtenFiles->end(), bad_path),
+              writtenFiles->end());
+    EXPECT_NE(std::find(writtenFiles->begin(), writtenFiles->end(), good_path),
+              writtenFiles->end());
+    EXPECT_FALSE(Bifrost::FileUtils::filePathExists(bad_path));
 }
 
 TEST(StageNodeDefs, open_stage_from_layer) {
@@ -548,11 +613,33 @@ TEST(StageNodeDefs, open_stage_from_cache) {
                       .ToLongInt();
 
         auto stage = Amino::newClassPtr<BifrostUsd::Stage>();
-        USD::Stage::open_stage_from_cache(id, -1, stage);
+        Amino::Array<Amino::String> mask;
+        USD::Stage::open_stage_from_cache(id, mask, -1, stage);
         ASSERT_TRUE(*stage);
         auto prim = stage->get().GetPrimAtPath(PXR_NS::SdfPath("/hello/world"));
         ASSERT_TRUE(prim.IsValid());
     }
+    {
+        // with population mask
+        auto cachedStage = Amino::newMutablePtr<BifrostUsd::Stage>(
+            getResourcePath("layer_with_sub_layers.usda").c_str());
+        ASSERT_TRUE(*cachedStage);
+        auto id = PXR_NS::UsdUtilsStageCache::Get()
+                      .Insert(cachedStage->getStagePtr())
+                      .ToLongInt();
+
+        Amino::Ptr<BifrostUsd::Stage> stage;
+        Amino::Array<Amino::String>   mask{"/hi", "relative/path"};
+        USD::Stage::open_stage_from_cache(id, mask, -1, stage);
+        ASSERT_TRUE(stage);
+        ASSERT_TRUE(*stage);
+        EXPECT_TRUE(stage->get().GetPrimAtPath(PXR_NS::SdfPath("/hi/world")));
+        EXPECT_FALSE(stage->get().GetPrimAtPath(PXR_NS::SdfPath("/hello")));
+
+        // The mask is preserved when the stage is copied
+        BifrostUsd::Stage stageCopy{*stage};
+        EXPECT_FALSE(stageCopy.get().GetPrimAtPath(PXR_NS::SdfPath("/hello")));
+    }
     {
         // with edit target
         auto root_path =
@@ -599,7 +686,8 @@ TEST(StageNodeDefs, open_stage_from_cache) {
                       .ToLongInt();
 
         Amino::Ptr<BifrostUsd::Stage> stage;
-        USD::Stage::open_stage_from_cache(id, -1, stage);
+        Amino::Array<Amino::String>   mask;
+        USD::Stage::open_stage_from_cache(id, mask, -1, stage);
         ASSERT_TRUE(stage);
         ASSERT_TRUE(*stage);
         ASSERT_TRUE(std::regex_match(
@@ -607,7 +695,7 @@ TEST(StageNodeDefs, open_stage_from_cache) {
             std::regex("anon:.*:open_stage_from_cache_root.usda")));
 
         stage.reset();
-        USD::Stage::open_stage_from_cache(id, 0, stage);
+        USD::Stage::open_stage_from_cache(id, mask, 0, stage);
         ASSERT_TRUE(stage);
         ASSERT_TRUE(*stage);
         ASSERT_TRUE(std::regex_match(
@@ -615,7 +703,7 @@ TEST(StageNodeDefs, open_stage_from_cache) {
             std::regex("anon:.*:open_stage_from_cache_a.usda")));
 
         stage.reset();
-        USD::Stage::open_stage_from_cache(id, 1, stage);
+        USD::Stage::open_stage_from_cache(id, mask, 1, stage);
         ASSERT_TRUE(stage);
         ASSERT_TRUE(*stage);
         ASSERT_TRUE(std::regex_match(
@@ -624,6 +712,91 @@ TEST(StageNodeDefs, open_stage_from_cache) {
     }
 }
 
+TEST(StageNodeDefs, get_stage_cache_entries) {
+    auto cachedStage = Amino::newMutablePtr<BifrostUsd::Stage>(
+        getResourcePath("helloworld.usd").c_str());
+    ASSERT_TRUE(*cachedStage);
+    auto id = PXR_NS::UsdUtilsStageCache::Get()
+                  .Insert(cachedStage->getStagePtr())
+                  .ToLongInt();
+
+    Amino::MutablePtr<Amino::Array<Amino::long_t>>  ids;
+    Amino::MutablePtr<Amino::Array<Amino::String>>  root_layers;
+    Amino::MutablePtr<Amino::Array<Amino::ulong_t>> estimated_bytes;
+    USD::Stage::get_stage_cache_entries(-1, ids, root_layers, estimated_bytes);
+    ASSERT_TRUE(ids && root_layers && estimated_bytes);
+    ASSERT_EQ(ids->size(), root_layers->size());
+    ASSERT_EQ(ids->size(), estimated_bytes->size());
+    EXPECT_NE(std::find(ids->begin(), ids->end(), id), ids->end());
+
+    USD::Stage::get_stage_cache_entries(id, ids, root_layers, estimated_bytes);
+    ASSERT_EQ(ids->size(), 1u);
+    EXPECT_EQ((*ids)[0], id);
+    EXPECT_NE(std::string((*root_layers)[0].c_str()).find("helloworld.usd"),
+              std::string::npos);
+    EXPECT_GT((*estimated_bytes)[0], 0u);
+
+    // A stage with more content is estimated bigger
+    auto emptyStage = Amino::newMutablePtr<BifrostUsd::Stage>();
+    auto emptyId    = PXR_NS::UsdUtilsStageCache::Get()
+                       .Insert(emptyStage->getStagePtr())
+                       .ToLongInt();
+    EXPECT_LT(BifrostUsd::StageCache::estimateStageMemory(emptyId),
+              (*estimated_bytes)[0]);
+
+    // Only the candidates are evicted
+    auto removed = BifrostUsd::StageCache::evictStages(0, {emptyId});
+    ASSERT_EQ(removed.size(), 1u);
+    EXPECT_EQ(removed[0], emptyId);
+    USD::Stage::get_stage_cache_entries(id, ids, root_layers, estimated_bytes);
+    EXPECT_EQ(ids->size(), 1u);
+    EXPECT_TRUE(BifrostUsd::StageCache::removeStageFromCache(id));
+    USD::Stage::get_stage_cache_entries(id, ids, root_layers, estimated_bytes);
+    EXPECT_TRUE(ids->empty());
+}
+
+TEST(StageNodeDefs, load_and_unload_payloads) {
+    BifrostUsd::Stage stage;
+    ASSERT_TRUE(stage);
+    const std::string assetPath = getResourcePath("helloworld.usd").c_str();
+    for (const char* path : {"/set/chair1", "/set/chair2", "/set/table"}) {
+        auto prim = stage->DefinePrim(PXR_NS::SdfPath(path));
+        prim.GetPayloads().AddPayload(
+            PXR_NS::SdfPayload(assetPath, PXR_NS::SdfPath("/hello")));
+    }
+    auto isLoaded = [&stage](const char* path) {
+        return stage->GetPrimAtPath(PXR_NS::SdfPath(path)).IsLoaded();
+    };
+
+    // Unload with a pattern
+    USD::Stage::unload_payloads(stage, {"/set/chair*"});
+    EXPECT_FALSE(isLoaded("/set/chair1"));
+    EXPECT_FALSE(isLoaded("/set/chair2"));
+    EXPECT_TRUE(isLoaded("/set/table"));
+
+    // Unload with a path
+    USD::Stage::unload_payloads(stage, {"/set"});
+    EXPECT_FALSE(isLoaded("/set/table"));
+
+    // Load with a path
+    USD::Stage::load_payloads(stage, {"/set/chair2"}, true);
+    EXPECT_FALSE(isLoaded("/set/chair1"));
+    EXPECT_TRUE(isLoaded("/set/chair2"));
+    EXPECT_TRUE(stage->GetPrimAtPath(PXR_NS::SdfPath("/set/chair2/world")));
+
+    // The load state is preserved when the stage is copied
+    BifrostUsd::Stage stageCopy{stage};
+    EXPECT_FALSE(
+        stageCopy->GetPrimAtPath(PXR_NS::SdfPath("/set/chair1")).IsLoaded());
+    EXPECT_TRUE(
+        stageCopy->GetPrimAtPath(PXR_NS::SdfPath("/set/chair2")).IsLoaded());
+
+    // Load with a pattern
+    USD::Stage::load_payloads(stage, {"/set/*"}, true);
+    EXPECT_TRUE(isLoaded("/set/chair1"));
+    EXPECT_TRUE(isLoaded("/set/table"));
+}
+
 TEST(StageNodeDefs, send_stage_to_cache) {
     auto stage = Amino::newClassPtr<BifrostUsd::Stage>(
         getResourcePath("helloworld.usd").c_str());
@@ -678,8 +851,17 @@ TEST(StageNodeDefs, export_stage_to_file) {
     ASSERT_TRUE(stage);
 
     auto filepath = getThisTestOutputPath("testExportStage.usda");
-    bool success  = USD::Stage::export_stage_to_file(stage, filepath.c_str());
+    Amino::MutablePtr<Amino::Array<Amino::String>> writtenFiles;
+    bool success = USD::Stage::export_stage_to_file(stage, filepath.c_str(),
+                                                    writtenFiles);
+    ASSERT_TRUE(success);
+    ASSERT_EQ(writtenFiles->size(), 1u);
+
+    // The stage did not change, it must not be exported again
+    success = USD::Stage::export_stage_to_file(stage, filepath.c_str(),
+                                               writtenFiles);
     ASSERT_TRUE(success);
+    EXPECT_TRUE(writtenFiles->empty());
 
     const char* flattenedFileContent = R"usda(#usda 1.0
 (
@@ -711,3 +893,174 @@ def Xform "hi"
     filebuffer << filestream.rdbuf();
     ASSERT_STREQ(filebuffer.str().c_str(), flattenedFileContent);
 }
+
+TEST(StageNodeDefs, add_to_stage_fast) {
+    using ObjectArray = Amino::Array<Amino::Ptr<Bifrost::Object>>;
+
+    auto radius = Bifrost::createObject();
+    radius->setProperty("name", Amino::String("radius"));
+    radius->setProperty("type", BifrostUsd::SdfValueTypeName::Double);
+    radius->setProperty("value", Amino::double_t(2.0));
+
+    auto colors = Amino::newMutablePtr<Amino::Array<Bifrost::Math::float3>>();
+    colors->push_back(Bifrost::Math::float3{1.f, 0.f, 0.f});
+    auto displayColor = Bifrost::createObject();
+    displayColor->setProperty("name", Amino::String("displayColor"));
+    displayColor->setProperty("type", BifrostUsd::SdfValueTypeName::Color3fArray);
+    displayColor->setProperty(
+        "interpolation",
+        BifrostUsd::UsdGeomPrimvarInterpolation::PrimVarConstant);
+    displayColor->setProperty(
+        "value", Amino::Ptr<Amino::Array<Bifrost::Math::float3>>(
+                     std::move(colors)));
+
+    auto attributes = Amino::newMutablePtr<ObjectArray>();
+    attributes->push_back(std::move(radius));
+    attributes->push_back(std::move(displayColor));
+
+    auto ball = Bifrost::createObject();
+    ball->setProperty("prim_path", Amino::String("/geo/ball"));
+    ball->setProperty("type", Amino::String("Sphere"));
+    ball->setProperty("purpose", BifrostUsd::ImageablePurpose::Render);
+    ball->setProperty("attributes", Amino::Ptr<ObjectArray>(std::move(attributes)));
+
+    auto children = Amino::newMutablePtr<ObjectArray>();
+    children->push_back(std::move(ball));
+
+    auto geo = Bifrost::createObject();
+    geo->setProperty("prim_path", Amino::String("/geo"));
+    geo->setProperty("type", Amino::String("Xform"));
+    geo->setProperty("children", Amino::Ptr<ObjectArray>(std::move(children)));
+
+    ObjectArray definitions;
+    definitions.push_back(std::move(geo));
+
+    BifrostUsd::Stage      stage;
+    LayersDidChangeCounter counter;
+    ASSERT_TRUE(USD::Stage::add_to_stage_fast(stage, definitions, "/set/"));
+    // All the prims and attributes are authored at once
+    EXPECT_EQ(counter.count(), 1u);
+
+    auto const& pxrStage = stage.get();
+    auto        set      = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/set"));
+    ASSERT_TRUE(set);
+    EXPECT_TRUE(set.IsDefined());
+
+    auto geoPrim = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/set/geo"));
+    ASSERT_TRUE(geoPrim);
+    EXPECT_EQ(geoPrim.GetTypeName(), PXR_NS::TfToken("Xform"));
+
+    auto ballPrim = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/set/geo/ball"));
+    ASSERT_TRUE(ballPrim);
+    EXPECT_EQ(ballPrim.GetTypeName(), PXR_NS::TfToken("Sphere"));
+
+    PXR_NS::TfToken purpose;
+    ASSERT_TRUE(ballPrim.GetAttribute(PXR_NS::UsdGeomTokens->purpose)
+                    .Get(&purpose));
+    EXPECT_EQ(purpose, PXR_NS::UsdGeomTokens->render);
+
+    double radiusValue = 0.0;
+    ASSERT_TRUE(ballPrim.GetAttribute(PXR_NS::TfToken("radius"))
+                    .Get(&radiusValue));
+    EXPECT_EQ(radiusValue, 2.0);
+
+    auto colorAttr =
+        ballPrim.GetAttribute(PXR_NS::TfToken("primvars:displayColor"));
+    ASSERT_TRUE(colorAttr);
+    PXR_NS::TfToken interpolation;
+    ASSERT_TRUE(colorAttr.GetMetadata(PXR_NS::UsdGeomTokens->interpolation,
+                                      &interpolation));
+    EXPECT_EQ(interpolation, PXR_NS::UsdGeomTokens->constant);
+    PXR_NS::VtVec3fArray colorValues;
+    ASSERT_TRUE(colorAttr.Get(&colorValues));
+    ASSERT_EQ(colorValues.size(), 1u);
+    EXPECT_EQ(colorValues[0], PXR_NS::GfVec3f(1.f, 0.f, 0.f));
+
+    // Relationships can only be authored by add_to_stage
+    auto target = Bifrost::createObject();
+    target->setProperty("target", Amino::String("/set/geo"));
+    auto relationships = Amino::newMutablePtr<ObjectArray>();
+    relationships->push_back(std::move(target));
+    auto unsupported = Bifrost::createObject();
+    unsupported->setProperty("prim_path", Amino::String("/rel"));
+    unsupported->setProperty("relationships",
+                             Amino::Ptr<ObjectArray>(std::move(relationships)));
+    ObjectArray unsupportedDefinitions;
+    unsupportedDefinitions.push_back(std::move(unsupported));
+    EXPECT_FALSE(
+        USD::Stage::add_to_stage_fast(stage, unsupportedDefinitions, ""));
+    EXPECT_FALSE(pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/rel")));
+}
+
+TEST(StageNodeDefs, add_to_stage_fast_prim_metadata) {
+    using ObjectArray = Amino::Array<Amino::Ptr<Bifrost::Object>>;
+
+    BifrostUsd::Stage stage;
+    auto const&       pxrStage = stage.get();
+    stage->DefinePrim(PXR_NS::SdfPath("/existing"), PXR_NS::TfToken("Xform"));
+
+    auto existing = Bifrost::createObject();
+    existing->setProperty("prim_path", Amino::String("/existing"));
+    existing->setProperty("type", Amino::String("Sphere"));
+    existing->setProperty("specifier", BifrostUsd::SdfSpecifier::Over);
+    existing->setProperty("kind", BifrostUsd::ModelKind::Component);
+    existing->setProperty("active", BifrostUsd::ActivatePrim::False);
+
+    auto newOver = Bifrost::createObject();
+    newOver->setProperty("prim_path", Amino::String("/over"));
+    newOver->setProperty("specifier", BifrostUsd::SdfSpecifier::Over);
+    newOver->setProperty("instanceable", BifrostUsd::InstanceablePrim::True);
+
+    auto classPrim = Bifrost::createObject();
+    classPrim->setProperty("prim_path", Amino::String("/_class"));
+    classPrim->setProperty("specifier", BifrostUsd::SdfSpecifier::Class);
+    classPrim->setProperty("kind", BifrostUsd::ModelKind::None);
+    classPrim->setProperty("active", BifrostUsd::ActivatePrim::None);
+
+    ObjectArray definitions;
+    definitions.push_back(std::move(existing));
+    definitions.push_back(std::move(newOver));
+    definitions.push_back(std::move(classPrim));
+    ASSERT_TRUE(USD::Stage::add_to_stage_fast(stage, definitions, ""));
+
+    // An over keeps the specifier and type of an existing prim
+    auto existingPrim = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/existing"));
+    ASSERT_TRUE(existingPrim);
+    EXPECT_EQ(existingPrim.GetSpecifier(), PXR_NS::SdfSpecifierDef);
+    EXPECT_EQ(existingPrim.GetTypeName(), PXR_NS::TfToken("Xform"));
+    EXPECT_FALSE(existingPrim.IsActive());
+    PXR_NS::TfToken kind;
+    ASSERT_TRUE(PXR_NS::UsdModelAPI(existingPrim).GetKind(&kind));
+    EXPECT_EQ(kind, PXR_NS::KindTokens->component);
+
+    auto overPrim = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/over"));
+    ASSERT_TRUE(overPrim);
+    EXPECT_EQ(overPrim.GetSpecifier(), PXR_NS::SdfSpecifierOver);
+    EXPECT_TRUE(overPrim.IsInstanceable());
+
+    auto classPrimOnStage = pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/_class"));
+    ASSERT_TRUE(classPrimOnStage);
+    EXPECT_EQ(classPrimOnStage.GetSpecifier(), PXR_NS::SdfSpecifierClass);
+    EXPECT_TRUE(classPrimOnStage.IsActive());
+    EXPECT_FALSE(classPrimOnStage.HasAuthoredMetadata(PXR_NS::SdfFieldKeys->Kind));
+
+    // Classes that add_to_stage can't create are refused
+    auto nestedClass = Bifrost::createObject();
+    nestedClass->setProperty("prim_path", Amino::String("/existing/_class"));
+    nestedClass->setProperty("specifier", BifrostUsd::SdfSpecifier::Class);
+    ObjectArray nestedClassDefinitions;
+    nestedClassDefinitions.push_back(std::move(nestedClass));
+    EXPECT_FALSE(
+        USD::Stage::add_to_stage_fast(stage, nestedClassDefinitions, ""));
+    EXPECT_FALSE(
+        pxrStage.GetPrimAtPath(PXR_NS::SdfPath("/existing/_class")));
+
+    auto definedClass = Bifrost::createObject();
+    definedClass->setProperty("prim_path", Amino::String("/existing"));
+    definedClass->setProperty("specifier", BifrostUsd::SdfSpecifier::Class);
+    ObjectArray definedClassDefinitions;
+    definedClassDefinitions.push_back(std::move(definedClass));
+    EXPECT_FALSE(
+        USD::Stage::add_to_stage_fast(stage, definedClassDefinitions, ""));
+    EXPECT_EQ(existingPrim.GetSpecifier(), PXR_NS::SdfSpecifierDef);
+}
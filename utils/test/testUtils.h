@@ -22,7 +22,10 @@
 #include <BifrostGraph/Executor/Utility.h>
 #include <BifrostUsd/Layer.h>
 
+#include <pxr/base/tf/notice.h>
+#include <pxr/base/tf/weakBase.h>
 #include <pxr/usd/sdf/declareHandles.h>
+#include <pxr/usd/sdf/notice.h>
 
 #include <cstdlib>
 
@@ -116,6 +119,33 @@ Amino::Array<T>& operator+=(Amino::Array<T>&       left,
     return left;
 }
 
+/// Helper counting the SdfNotice::LayersDidChange notices sent while it is
+/// alive. Each notice triggers a recomposition of the stages using the
+/// changed layers, so tests use it to check that edits are batched.
+class LayersDidChangeCounter : public PXR_NS::TfWeakBase {
+public:
+    LayersDidChangeCounter() {
+        m_key = PXR_NS::TfNotice::Register(
+            PXR_NS::TfCreateWeakPtr(this),
+            &LayersDidChangeCounter::onLayersDidChange);
+    }
+    ~LayersDidChangeCounter() { PXR_NS::TfNotice::Revoke(m_key); }
+
+    LayersDidChangeCounter(const LayersDidChangeCounter&)            = delete;
+    LayersDidChangeCounter& operator=(const LayersDidChangeCounter&) = delete;
+
+    size_t count() const { return m_count; }
+    void   reset() { m_count = 0; }
+
+private:
+    void onLayersDidChange(const PXR_NS::SdfNotice::LayersDidChange&) {
+        ++m_count;
+    }
+
+    PXR_NS::TfNotice::Key m_key;
+    size_t                m_count = 0;
+};
+
 } // namespace TestUtils
 
 } // namespace BifrostUsd